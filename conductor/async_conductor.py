@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Asyncio API for ManusCondor.
+
+Usage:
+    from async_conductor import AsyncManusCondor
+
+    async with AsyncManusCondor(".") as conductor:
+        context = await conductor.load_context_files()
+        track = await conductor.get_next_pending_track()
+        await conductor.update_task_status(track['id'], "Write tests", "completed")
+
+    python async_conductor.py --sessions 300     # concurrency check against a scratch project
+
+Every method awaits the ManusCondor method of the same name, run on a
+bounded thread pool, so file I/O never blocks the event loop and hundreds of
+sessions can share one process and one pool. Writes to the same file
+(tracks.md for track changes and new tracks, a track's plan.md for task
+changes, setup_state.json) are serialized with an asyncio.Lock per file:
+queued writers wait on the event loop instead of holding pool threads, and
+writes to different files run in parallel. The synchronous methods still
+take the conductor lock, so other processes and synchronous callers are
+excluded as before. Reads need no lock because every rewrite is atomic.
+
+Pass conductor= to wrap an existing instance (e.g. a SQLiteManusCondor).
+"""
+
+import argparse
+import asyncio
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from manus_conductor import ManusCondor
+
+# Parsing holds the GIL and writes share the conductor lock, so more threads add event loop stalls, not throughput
+DEFAULT_MAX_WORKERS = 4
+
+
+class AsyncManusCondor:
+    """Awaitable ManusCondor: blocking calls run on a bounded executor, same-file writes one at a time."""
+
+    def __init__(self, project_root: str = ".", max_workers: int = DEFAULT_MAX_WORKERS,
+                 conductor: Optional[ManusCondor] = None):
+        self.conductor = conductor if conductor is not None else ManusCondor(project_root)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="conductor")
+        self._file_locks: Dict[str, asyncio.Lock] = {}
+
+    async def __aenter__(self) -> "AsyncManusCondor":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Wait for running calls and shut the executor down."""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    async def _run(self, method, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(method, *args, **kwargs))
+
+    def _lock(self, path: Path) -> asyncio.Lock:
+        lock = self._file_locks.get(str(path))
+        if lock is None:
+            lock = self._file_locks[str(path)] = asyncio.Lock()
+        return lock
+
+    async def _write(self, path: Path, method, *args, **kwargs):
+        async with self._lock(path):
+            return await self._run(method, *args, **kwargs)
+
+    def _plan_file(self, track_id: str) -> Path:
+        return self.conductor.tracks_dir / track_id / "plan.md"
+
+    # Reads
+
+    async def load_context_files(self) -> Dict[str, str]:
+        return await self._run(self.conductor.load_context_files)
+
+    async def load_track_context(self, track_id: str) -> Dict[str, str]:
+        return await self._run(self.conductor.load_track_context, track_id)
+
+    async def load_state(self) -> str:
+        return await self._run(self.conductor.load_state)
+
+    async def parse_tracks(self) -> List[Dict]:
+        return await self._run(self.conductor.parse_tracks)
+
+    async def get_tracks_by_status(self, status: str) -> List[Dict]:
+        return await self._run(self.conductor.get_tracks_by_status, status)
+
+    async def get_track_by_id(self, track_id: str) -> Optional[Dict]:
+        return await self._run(self.conductor.get_track_by_id, track_id)
+
+    async def get_next_pending_track(self) -> Optional[Dict]:
+        return await self._run(self.conductor.get_next_pending_track)
+
+    async def parse_plan(self, track_id: str) -> List[Dict]:
+        return await self._run(self.conductor.parse_plan, track_id)
+
+    async def get_next_pending_task(self, track_id: str) -> Optional[Dict]:
+        return await self._run(self.conductor.get_next_pending_task, track_id)
+
+    async def get_project_status(self) -> Dict:
+        return await self._run(self.conductor.get_project_status)
+
+    async def get_plan_progress(self, track_id: str) -> Dict:
+        return await self._run(self.conductor.get_plan_progress, track_id)
+
+    async def get_progress_report(self) -> Dict:
+        # The report's own thread pool would multiply threads per call; one executor thread reads the plans
+        return await self._run(self.conductor.get_progress_report, 1)
+
+    # Writes
+
+    async def save_state(self, step: str):
+        await self._write(self.conductor.state_file, self.conductor.save_state, step)
+
+    async def create_track(self, description: str, spec_content: str, plan_content: str) -> str:
+        return await self._write(self.conductor.tracks_file, self.conductor.create_track,
+                                 description, spec_content, plan_content)
+
+    async def update_track_status(self, track_id: str, new_status: str):
+        await self._write(self.conductor.tracks_file, self.conductor.update_track_status, track_id, new_status)
+
+    async def update_track_statuses(self, updates: Dict[str, str]) -> int:
+        return await self._write(self.conductor.tracks_file, self.conductor.update_track_statuses, updates)
+
+    async def update_task_status(self, track_id: str, task_description: str, new_status: str):
+        await self._write(self._plan_file(track_id), self.conductor.update_task_status,
+                          track_id, task_description, new_status)
+
+    async def update_task_statuses(self, track_id: str, tasks: Optional[Dict[str, str]] = None,
+                                   subtasks: Optional[Dict[Tuple[str, str], str]] = None) -> int:
+        return await self._write(self._plan_file(track_id), self.conductor.update_task_statuses,
+                                 track_id, tasks, subtasks)
+
+
+async def _session(conductor: AsyncManusCondor, track_ids: List[str], session: int):
+    await conductor.load_context_files()
+    track_id = track_ids[session % len(track_ids)]
+    await conductor.load_track_context(track_id)
+    task = await conductor.get_next_pending_task(track_id)
+    await conductor.update_task_statuses(track_id, subtasks={(task['task'], f"Step {session}"): 'completed'})
+    await conductor.update_track_status(track_id, 'in_progress')
+
+
+async def _heartbeat(stop: asyncio.Event, lags: List[float], interval: float = 0.005):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def _check(root: str, sessions: int, tracks: int, max_workers: int) -> List[str]:
+    sync = ManusCondor(root)
+    sync.init_conductor_structure()
+    steps = ''.join(f"    - [ ] Step {i}\n" for i in range(sessions))
+    track_ids = [sync.create_track(f"Async {i}", "# Spec\n", f"# Plan\n\n## Phase 1\n- [ ] Task: Work\n{steps}")
+                 for i in range(tracks)]
+
+    stop, lags = asyncio.Event(), []
+    heartbeat = asyncio.create_task(_heartbeat(stop, lags))
+    started = time.perf_counter()
+    async with AsyncManusCondor(root, max_workers=max_workers) as conductor:
+        await asyncio.gather(*(_session(conductor, track_ids, i) for i in range(sessions)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await heartbeat
+        plans = [await conductor.parse_plan(track_id) for track_id in track_ids]
+        statuses = [track['status'] for track in await conductor.parse_tracks()]
+
+    done = sum(subtask['status'] == 'completed' for plan in plans for subtask in plan[0]['subtasks'])
+    print(f"{sessions} sessions on {tracks} tracks in {elapsed:.2f}s, "
+          f"longest event loop stall {max(lags, default=0) * 1000:.1f} ms")
+    problems = []
+    if done != sessions:
+        problems.append(f"{sessions - done} subtask updates lost")
+    if statuses != ['in_progress'] * tracks:
+        problems.append(f"track statuses {statuses}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run concurrent async sessions against a scratch project.")
+    parser.add_argument('--sessions', type=int, default=300, help="Concurrent sessions (default: 300)")
+    parser.add_argument('--tracks', type=int, default=10, help="Tracks the sessions share (default: 10)")
+    parser.add_argument('--max-workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f"Executor threads (default: {DEFAULT_MAX_WORKERS})")
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix="conductor-async-")
+    try:
+        problems = asyncio.run(_check(root, args.sessions, args.tracks, args.max_workers))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if problems:
+        return 1
+    print("OK: every update applied")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,20 +7,262 @@ A Python helper for implementing Conductor's structured development workflow in
 import os
 import json
 import re
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+STATUS_CHARS = {'pending': ' ', 'in_progress': '~', 'completed': 'x'}
+STATUS_NAMES = {char: status for status, char in STATUS_CHARS.items()}
+
+_TRACK_HEADING = re.compile(r'##\s*\[([ ~x])\]\s*Track:\s*(.+)')
+_TRACK_FOLDER = re.compile(r'\[conductor/tracks/([^\]]+)\]')
+# One pattern for every plan.md line kind: "## Phase", "- [ ] Task: ..." and "    - [ ] subtask"
+_PLAN_LINE = re.compile(
+    r'## (?P<phase>.*)'
+    r'|-\s*\[(?P<task_status>[ ~x])\]\s*Task:\s*(?P<task>.+)'
+    r'|\s{4}-\s*\[(?P<subtask_status>[ ~x])\]\s*(?P<subtask>.+)'
+)
+
+DEFAULT_CONTEXT_CACHE_BYTES = 32 * 2**20
+
+
+def atomic_write_text(path: Path, content: str):
+    """Write a file via a temporary file in the same directory and a rename, so readers never see a partial file."""
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(temp_path, path.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def _copy_json(value: Any) -> Any:
+    """Copy of a decoded JSON value; faster than copy.deepcopy for plain dicts and lists."""
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+
+class ContextCache:
+    """
+    Size-bounded LRU cache of context file contents, shared by every ManusCondor by default.
+    Entries are keyed by path and checked against the file's (mtime, size,
+    inode) on every lookup, so a cached read costs one stat() and an edited
+    or atomically replaced file is read again. The least recently used
+    entries are evicted once their file sizes exceed max_bytes.
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_CONTEXT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # (kind, path) -> (signature, value, size), least recently used first
+        self._entries: Dict[Tuple[str, str], Tuple[Tuple[int, int, int], Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def read_text(self, path: Path) -> Optional[str]:
+        """The file's text, or None if it does not exist."""
+        return self._get('text', path, lambda p: p.read_text())
+    
+    def read_json(self, path: Path) -> Optional[Any]:
+        """The file's decoded JSON (a copy the caller may modify), or None if it does not exist."""
+        value = self._get('json', path, lambda p: json.loads(p.read_text()))
+        return _copy_json(value)
+    
+    def _get(self, kind: str, path: Path, load: Callable[[Path], Any]) -> Optional[Any]:
+        key = (kind, os.fspath(path))
+        try:
+            stat = os.stat(key[1])
+        except FileNotFoundError:
+            self.invalidate(path)
+            return None
+        # The inode catches atomic replaces within one mtime tick that keep the size (a status character change)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        try:
+            value = load(Path(path))
+        except FileNotFoundError:
+            self.invalidate(path)
+            return None
+        
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            if stat.st_size <= self.max_bytes:
+                self._entries[key] = (signature, value, stat.st_size)
+                self.bytes += stat.st_size
+                while self.bytes > self.max_bytes:
+                    _, (_, _, size) = self._entries.popitem(last=False)
+                    self.bytes -= size
+                    self.evictions += 1
+        return value
+    
+    def invalidate(self, path: Path):
+        """Drop any cached contents of a file."""
+        with self._lock:
+            for kind in ('text', 'json'):
+                entry = self._entries.pop((kind, os.fspath(path)), None)
+                if entry is not None:
+                    self.bytes -= entry[2]
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters and current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+# Shared by every ManusCondor created without its own cache
+CONTEXT_CACHE = ContextCache()
+
+
+def _lock_file(f):
+    """Block until this process holds an exclusive lock on the open file f."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:  # LK_LOCK gives up after ten one-second retries
+            continue
+
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _parse_tracks_text(content: str) -> Tuple[List[Dict], Dict[str, List[int]]]:
+    """
+    Parse tracks.md content in one pass.
+    Returns: (tracks in file order, {track_id: offsets of its heading's status character})
+    """
+    tracks = []
+    offsets: Dict[str, List[int]] = {}
+    position = 0
+    for i, section in enumerate(content.split("---")):
+        start = position
+        position += len(section) + 3
+        if i == 0:  # Skip the header
+            continue
+        
+        heading_match = _TRACK_HEADING.search(section)
+        folder_match = _TRACK_FOLDER.search(section) if heading_match else None
+        if not folder_match:
+            continue
+        
+        track_id = folder_match.group(1)
+        tracks.append({
+            'id': track_id,
+            'description': heading_match.group(2).strip(),
+            'status': STATUS_NAMES.get(heading_match.group(1), 'pending'),
+            'folder': f"conductor/tracks/{track_id}"
+        })
+        offsets.setdefault(track_id, []).append(start + heading_match.start(1))
+    return tracks, offsets
+
+
+def _index_plan_lines(lines: List[str]) -> Tuple[Dict[str, List[int]], Dict[Tuple[str, str], List[int]]]:
+    """
+    Line numbers of every task and subtask in plan.md lines.
+    Returns: ({task: [line, ...]}, {(task, subtask): [line, ...]})
+    """
+    tasks: Dict[str, List[int]] = {}
+    subtasks: Dict[Tuple[str, str], List[int]] = {}
+    current_task = None
+    for number, line in enumerate(lines):
+        match = _PLAN_LINE.match(line)
+        if match is None:
+            continue
+        if match.group('task') is not None:
+            current_task = match.group('task').strip()
+            tasks.setdefault(current_task, []).append(number)
+        elif match.group('subtask') is not None and current_task is not None:
+            subtasks.setdefault((current_task, match.group('subtask').strip()), []).append(number)
+    return tasks, subtasks
+
+
+def _set_line_status(line: str, status_char: str) -> str:
+    """Replace the status character of a task or subtask line."""
+    match = _PLAN_LINE.match(line)
+    group = 'task_status' if match.group('task') is not None else 'subtask_status'
+    return line[:match.start(group)] + status_char + line[match.end(group):]
 
 
 class ManusCondor:
     """Main class for managing Conductor workflows in Manus."""
     
-    def __init__(self, project_root: str = "."):
+    def __init__(self, project_root: str = ".", context_cache: Optional[ContextCache] = None):
         self.project_root = Path(project_root).resolve()
         self.conductor_dir = self.project_root / "conductor"
         self.tracks_dir = self.conductor_dir / "tracks"
         self.state_file = self.conductor_dir / "setup_state.json"
         self.tracks_file = self.conductor_dir / "tracks.md"
+        self.lock_file = self.conductor_dir / ".conductor.lock"
+        self.track_counter_file = self.conductor_dir / ".track_counter"
+        
+        # Parsed tracks.md as one (signature, index) tuple, rebuilt when the file's (mtime, size, inode) changes.
+        # A single attribute is read and replaced atomically, so threads sharing
+        # this instance never pair an index with another version's signature.
+        self._track_index: Optional[Tuple[Optional[Tuple[int, int, int]], Dict]] = None
+        
+        # Parsed plan.md files: path -> ((mtime_ns, size, inode), tasks, summary), dropped on every write
+        self._plan_cache: Dict[str, Tuple[Tuple[int, int, int], List[Dict], Dict]] = {}
+        
+        # Context file contents for load_context_files() and load_track_context()
+        self.context_cache = context_cache if context_cache is not None else CONTEXT_CACHE
         
     def is_setup(self) -> bool:
         """Check if Conductor is properly set up."""
@@ -90,24 +332,28 @@ class ManusCondor:
         """Create or update product.md file."""
         product_file = self.conductor_dir / "product.md"
         product_file.write_text(content)
+        self.context_cache.invalidate(product_file)
         self.save_state("2.1_product_guide")
     
     def create_product_guidelines_md(self, content: str):
         """Create or update product-guidelines.md file."""
         guidelines_file = self.conductor_dir / "product-guidelines.md"
         guidelines_file.write_text(content)
+        self.context_cache.invalidate(guidelines_file)
         self.save_state("2.2_product_guidelines")
     
     def create_tech_stack_md(self, content: str):
         """Create or update tech-stack.md file."""
         tech_stack_file = self.conductor_dir / "tech-stack.md"
         tech_stack_file.write_text(content)
+        self.context_cache.invalidate(tech_stack_file)
         self.save_state("2.3_tech_stack")
     
     def create_workflow_md(self, content: str):
         """Create or update workflow.md file."""
         workflow_file = self.conductor_dir / "workflow.md"
         workflow_file.write_text(content)
+        self.context_cache.invalidate(workflow_file)
         self.save_state("2.5_workflow")
     
     def get_next_track_id(self) -> str:
@@ -131,14 +377,53 @@ class ManusCondor:
             return f"track-{next_num:03d}"
         return "track-001"
     
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """
+        Hold the conductor lock for the duration of a with block.
+        The lock is an exclusive flock on conductor/.conductor.lock, opened anew
+        on every call, so it excludes other threads as well as other processes.
+        Not reentrant: do not call locking methods inside the block.
+        """
+        self.conductor_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_file, 'a+b') as f:
+            _lock_file(f)
+            try:
+                yield
+            finally:
+                _unlock_file(f)
+    
+    def allocate_track_id(self) -> str:
+        """
+        Reserve the next track ID by creating its directory; safe across threads and processes.
+        The last allocated number is kept in conductor/.track_counter under the
+        conductor lock (the tracks directory is scanned only if it is missing),
+        and the directory is created without exist_ok, so a track created by a
+        tool that skips the lock is never handed out twice.
+        """
+        self.tracks_dir.mkdir(parents=True, exist_ok=True)
+        with self.locked():
+            try:
+                number = int(self.track_counter_file.read_text())
+            except (FileNotFoundError, ValueError):
+                number = int(self.get_next_track_id()[len("track-"):]) - 1
+            while True:
+                number += 1
+                track_id = f"track-{number:03d}"
+                try:
+                    (self.tracks_dir / track_id).mkdir()
+                except FileExistsError:
+                    continue
+                self.track_counter_file.write_text(f"{number}\n")
+                return track_id
+    
     def create_track(self, description: str, spec_content: str, plan_content: str) -> str:
         """
         Create a new track with spec and plan.
         Returns: track_id
         """
-        track_id = self.get_next_track_id()
+        track_id = self.allocate_track_id()
         track_dir = self.tracks_dir / track_id
-        track_dir.mkdir(exist_ok=True)
         
         # Create metadata
         metadata = {
@@ -159,194 +444,279 @@ class ManusCondor:
         return track_id
     
     def add_track_to_registry(self, track_id: str, description: str):
-        """Add a track to the tracks.md registry."""
+        """
+        Add a track to the tracks.md registry.
+        The entry is appended with a single write under the conductor lock, so
+        concurrent creators and status rewrites never drop an entry.
+        """
         track_entry = f"\n---\n\n## [ ] Track: {description}\n\n**Folder:** [conductor/tracks/{track_id}](conductor/tracks/{track_id})\n\n"
         
-        if self.tracks_file.exists():
-            content = self.tracks_file.read_text()
-            self.tracks_file.write_text(content + track_entry)
-        else:
-            self.tracks_file.write_text(f"# Tracks\n\nThis file contains all tracks for the project.\n{track_entry}")
+        with self.locked():
+            if not self.tracks_file.exists():
+                track_entry = f"# Tracks\n\nThis file contains all tracks for the project.\n{track_entry}"
+            with open(self.tracks_file, 'a', encoding='utf-8') as f:
+                f.write(track_entry)
+        self.invalidate_track_index()
     
     def parse_tracks(self) -> List[Dict]:
         """
         Parse the tracks.md file and return a list of tracks.
         Each track dict contains: {id, description, status, folder}
         """
-        if not self.tracks_file.exists():
-            return []
-        
-        content = self.tracks_file.read_text()
-        sections = content.split("---")
-        
-        tracks = []
-        for section in sections[1:]:  # Skip the header
-            # Extract status and description from heading
-            heading_match = re.search(r'##\s*\[([ ~x])\]\s*Track:\s*(.+)', section)
-            if not heading_match:
-                continue
-            
-            status_char = heading_match.group(1)
-            description = heading_match.group(2).strip()
-            
-            # Map status character to status name
-            status_map = {' ': 'pending', '~': 'in_progress', 'x': 'completed'}
-            status = status_map.get(status_char, 'pending')
-            
-            # Extract folder link
-            folder_match = re.search(r'\[conductor/tracks/([^\]]+)\]', section)
-            track_id = folder_match.group(1) if folder_match else None
-            
-            if track_id:
-                tracks.append({
-                    'id': track_id,
-                    'description': description,
-                    'status': status,
-                    'folder': f"conductor/tracks/{track_id}"
-                })
-        
-        return tracks
+        return [dict(track) for track in self._get_track_index()['tracks']]
+    
+    def _tracks_signature(self) -> Optional[Tuple[int, int, int]]:
+        """
+        (mtime_ns, size, inode) of tracks.md, or None if it does not exist.
+        The inode catches an atomic rewrite within one mtime tick that keeps the
+        size, such as a status change from [ ] to [x].
+        """
+        try:
+            stat = self.tracks_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+    
+    def _get_track_index(self) -> Dict:
+        """
+        Return the track index, re-parsing tracks.md only if its mtime, size or inode changed.
+        The index holds the tracks in file order, an id -> track map and status buckets.
+        """
+        signature = self._tracks_signature()
+        cached = self._track_index
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            content = self.tracks_file.read_text() if signature is not None else ""
+        except FileNotFoundError:
+            content = ""
+        return self._build_track_index(content, signature)
+    
+    def _build_track_index(self, content: str, signature: Optional[Tuple[int, int, int]]) -> Dict:
+        tracks, offsets = _parse_tracks_text(content)
+        by_id: Dict[str, Dict] = {}
+        by_status: Dict[str, List[Dict]] = {'pending': [], 'in_progress': [], 'completed': []}
+        for track in tracks:
+            by_id.setdefault(track['id'], track)
+            by_status[track['status']].append(track)
+        index = {
+            'tracks': tracks,
+            'by_id': by_id,
+            'by_status': by_status,
+            'offsets': offsets,
+            'next_pending': next((t for t in tracks if t['status'] != 'completed'), None),
+        }
+        # The signature was taken before the read, so a racing rewrite leaves a
+        # mismatch that makes the next lookup re-parse, never a stale match.
+        self._track_index = (signature, index)
+        return index
+    
+    def invalidate_track_index(self):
+        """Drop the cached track index; the next lookup re-reads tracks.md."""
+        self._track_index = None
+    
+    def get_tracks_by_status(self, status: str) -> List[Dict]:
+        """Get all tracks with a given status ('pending', 'in_progress' or 'completed')."""
+        return [dict(track) for track in self._get_track_index()['by_status'].get(status, [])]
     
     def get_track_by_id(self, track_id: str) -> Optional[Dict]:
         """Get a track by its ID."""
-        tracks = self.parse_tracks()
-        for track in tracks:
-            if track['id'] == track_id:
-                return track
-        return None
+        track = self._get_track_index()['by_id'].get(track_id)
+        return dict(track) if track else None
     
     def get_next_pending_track(self) -> Optional[Dict]:
         """Get the next track that is not completed."""
-        tracks = self.parse_tracks()
-        for track in tracks:
-            if track['status'] != 'completed':
-                return track
-        return None
+        track = self._get_track_index()['next_pending']
+        return dict(track) if track else None
     
     def update_track_status(self, track_id: str, new_status: str):
         """
         Update a track's status in tracks.md.
         new_status: 'pending', 'in_progress', or 'completed'
         """
-        status_map = {'pending': ' ', 'in_progress': '~', 'completed': 'x'}
-        status_char = status_map.get(new_status, ' ')
-        
-        content = self.tracks_file.read_text()
-        
-        # Find the track's description
-        track = self.get_track_by_id(track_id)
-        if not track:
-            return
-        
-        description = track['description']
-        
-        # Replace the status marker
-        old_pattern = r'##\s*\[[ ~x]\]\s*Track:\s*' + re.escape(description)
-        new_heading = f"## [{status_char}] Track: {description}"
+        self.update_track_statuses({track_id: new_status})
+    
+    def update_track_statuses(self, updates: Dict[str, str]) -> int:
+        """
+        Apply many track status changes ({track_id: new_status}) to tracks.md in one pass.
+        The file is read and parsed once, each heading's status character is
+        replaced at its indexed offset, and the result is written atomically.
+        Returns: number of headings changed
+        """
+        if not updates or not self.tracks_file.exists():
+            return 0
         
-        content = re.sub(old_pattern, new_heading, content)
-        self.tracks_file.write_text(content)
+        with self.locked():
+            signature = self._tracks_signature()
+            content = self.tracks_file.read_text()
+            offsets = self._build_track_index(content, signature)['offsets']
+            
+            chars = list(content)
+            changed = 0
+            for track_id, new_status in updates.items():
+                status_char = STATUS_CHARS.get(new_status, ' ')
+                for offset in offsets.get(track_id, ()):
+                    if chars[offset] != status_char:
+                        chars[offset] = status_char
+                        changed += 1
+            
+            if changed:
+                atomic_write_text(self.tracks_file, ''.join(chars))
+                self.invalidate_track_index()
+        return changed
     
     def parse_plan(self, track_id: str) -> List[Dict]:
         """
         Parse a track's plan.md and return tasks.
         Each task dict contains: {phase, task, status, subtasks}
         """
+        return list(self.iter_plan(track_id))
+    
+    def iter_plan(self, track_id: str) -> Iterator[Dict]:
+        """
+        Yield a track's plan.md tasks in order while streaming the file.
+        Each line is matched once against a combined pattern, and a task is
+        yielded as soon as the next task (or the end of the file) closes its
+        subtask list, so memory stays constant and callers can stop early.
+        """
         plan_file = self.tracks_dir / track_id / "plan.md"
-        if not plan_file.exists():
-            return []
-        
-        content = plan_file.read_text()
-        lines = content.split('\n')
-        
-        tasks = []
-        current_phase = None
+        try:
+            f = open(plan_file)
+        except FileNotFoundError:
+            return
         
-        for line in lines:
-            # Detect phase headers
-            if line.startswith('## '):
-                current_phase = line[3:].strip()
-                continue
-            
-            # Detect tasks (- [ ] Task: ...)
-            task_match = re.match(r'^-\s*\[([ ~x])\]\s*Task:\s*(.+)', line)
-            if task_match:
-                status_char = task_match.group(1)
-                task_desc = task_match.group(2).strip()
-                status_map = {' ': 'pending', '~': 'in_progress', 'x': 'completed'}
-                status = status_map.get(status_char, 'pending')
+        with f:
+            task = None
+            current_phase = None
+            for line in f:
+                match = _PLAN_LINE.match(line)
+                if match is None:
+                    continue
                 
-                tasks.append({
-                    'phase': current_phase,
-                    'task': task_desc,
-                    'status': status,
-                    'subtasks': []
-                })
-                continue
+                if match.group('phase') is not None:
+                    current_phase = match.group('phase').strip()
+                elif match.group('task') is not None:
+                    if task is not None:
+                        yield task
+                    task = {
+                        'phase': current_phase,
+                        'task': match.group('task').strip(),
+                        'status': STATUS_NAMES[match.group('task_status')],
+                        'subtasks': []
+                    }
+                elif task is not None:
+                    task['subtasks'].append({
+                        'subtask': match.group('subtask').strip(),
+                        'status': STATUS_NAMES[match.group('subtask_status')]
+                    })
             
-            # Detect subtasks (    - [ ] ...)
-            subtask_match = re.match(r'^\s{4}-\s*\[([ ~x])\]\s*(.+)', line)
-            if subtask_match and tasks:
-                status_char = subtask_match.group(1)
-                subtask_desc = subtask_match.group(2).strip()
-                status_map = {' ': 'pending', '~': 'in_progress', 'x': 'completed'}
-                status = status_map.get(status_char, 'pending')
-                
-                tasks[-1]['subtasks'].append({
-                    'subtask': subtask_desc,
-                    'status': status
-                })
-        
-        return tasks
+            if task is not None:
+                yield task
     
     def get_next_pending_task(self, track_id: str) -> Optional[Dict]:
-        """Get the next pending task from a track's plan."""
-        tasks = self.parse_plan(track_id)
-        for task in tasks:
-            if task['status'] != 'completed':
-                return task
-        return None
+        """Get the next pending task from a track's plan; stops reading at the first one."""
+        with closing(self.iter_plan(track_id)) as tasks:
+            return next((task for task in tasks if task['status'] != 'completed'), None)
     
     def update_task_status(self, track_id: str, task_description: str, new_status: str):
         """
         Update a task's status in plan.md.
         new_status: 'pending', 'in_progress', or 'completed'
         """
+        self.update_task_statuses(track_id, {task_description: new_status})
+    
+    def update_task_statuses(self, track_id: str, tasks: Optional[Dict[str, str]] = None,
+                             subtasks: Optional[Dict[Tuple[str, str], str]] = None) -> int:
+        """
+        Apply many status changes to a track's plan.md in one pass.
+        tasks: {task_description: new_status}
+        subtasks: {(task_description, subtask_description): new_status}
+        The plan's lines are indexed once, only the affected lines are edited,
+        and the file is written atomically.
+        Returns: number of lines changed
+        """
         plan_file = self.tracks_dir / track_id / "plan.md"
-        if not plan_file.exists():
-            return
+        if not plan_file.exists() or not (tasks or subtasks):
+            return 0
         
-        status_map = {'pending': ' ', 'in_progress': '~', 'completed': 'x'}
-        status_char = status_map.get(new_status, ' ')
-        
-        content = plan_file.read_text()
-        
-        # Replace the task status
-        old_pattern = r'-\s*\[[ ~x]\]\s*Task:\s*' + re.escape(task_description)
-        new_task = f"- [{status_char}] Task: {task_description}"
-        
-        content = re.sub(old_pattern, new_task, content)
-        plan_file.write_text(content)
+        with self.locked():
+            lines = plan_file.read_text().split('\n')
+            task_lines, subtask_lines = _index_plan_lines(lines)
+            
+            changed = 0
+            for updates, index in ((tasks or {}, task_lines), (subtasks or {}, subtask_lines)):
+                for key, new_status in updates.items():
+                    status_char = STATUS_CHARS.get(new_status, ' ')
+                    for number in index.get(key, ()):
+                        line = _set_line_status(lines[number], status_char)
+                        if line != lines[number]:
+                            lines[number] = line
+                            changed += 1
+            
+            if changed:
+                atomic_write_text(plan_file, '\n'.join(lines))
+                self._plan_cache.pop(str(plan_file), None)
+        return changed
     
     def get_project_status(self) -> Dict:
         """Get overall project status."""
-        tracks = self.parse_tracks()
-        
-        total_tracks = len(tracks)
-        completed_tracks = sum(1 for t in tracks if t['status'] == 'completed')
-        in_progress_tracks = sum(1 for t in tracks if t['status'] == 'in_progress')
-        pending_tracks = sum(1 for t in tracks if t['status'] == 'pending')
+        index = self._get_track_index()
+        by_status = index['by_status']
         
         return {
-            'total_tracks': total_tracks,
-            'completed': completed_tracks,
-            'in_progress': in_progress_tracks,
-            'pending': pending_tracks,
-            'tracks': tracks
+            'total_tracks': len(index['tracks']),
+            'completed': len(by_status['completed']),
+            'in_progress': len(by_status['in_progress']),
+            'pending': len(by_status['pending']),
+            'tracks': self.parse_tracks()
         }
     
+    def get_plan_progress(self, track_id: str) -> Dict:
+        """
+        Task and subtask completion counts for a track's plan.md.
+        Parsed plans are cached by (path, mtime, size, inode), so an unchanged plan costs one stat().
+        """
+        plan_file = self.tracks_dir / track_id / "plan.md"
+        try:
+            stat = plan_file.stat()
+        except FileNotFoundError:
+            self._plan_cache.pop(str(plan_file), None)
+            return _plan_summary([])
+        
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        cached = self._plan_cache.get(str(plan_file))
+        if cached is None or cached[0] != signature:
+            tasks = self.parse_plan(track_id)
+            cached = (signature, tasks, _plan_summary(tasks))
+            self._plan_cache[str(plan_file)] = cached
+        return cached[2]
+    
+    def get_progress_report(self, max_workers: Optional[int] = None) -> Dict:
+        """
+        Project-wide progress: track statuses plus task and subtask completion from every plan.md.
+        Plans are checked on a thread pool and only those changed since the
+        last report are re-parsed, so the report can be polled cheaply.
+        """
+        tracks = self.parse_tracks()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            progress = list(pool.map(self.get_plan_progress, [track['id'] for track in tracks]))
+        
+        totals = _plan_summary([])
+        for track, summary in zip(tracks, progress):
+            # Copies, so the caller cannot alter the cached summaries
+            track.update({key: dict(value) if isinstance(value, dict) else value for key, value in summary.items()})
+            for kind in ('tasks', 'subtasks'):
+                for status, count in summary[kind].items():
+                    totals[kind][status] += count
+        totals['percent_complete'] = _percent(totals['tasks'])
+        
+        report = self.get_project_status()
+        report.update(totals)
+        report['tracks'] = tracks
+        return report
+    
     def load_context_files(self) -> Dict[str, str]:
-        """Load all context files for reference."""
+        """Load all context files for reference; unchanged files come from the context cache."""
         context = {}
         
         files = {
@@ -357,15 +727,13 @@ class ManusCondor:
         }
         
         for key, path in files.items():
-            if path.exists():
-                context[key] = path.read_text()
-            else:
-                context[key] = ""
+            text = self.context_cache.read_text(path)
+            context[key] = text if text is not None else ""
         
         return context
     
     def load_track_context(self, track_id: str) -> Dict[str, str]:
-        """Load spec and plan for a specific track."""
+        """Load spec and plan for a specific track; unchanged files come from the context cache."""
         track_dir = self.tracks_dir / track_id
         
         context = {
@@ -374,29 +742,46 @@ class ManusCondor:
             'metadata': {}
         }
         
-        spec_file = track_dir / "spec.md"
-        plan_file = track_dir / "plan.md"
-        metadata_file = track_dir / "metadata.json"
+        spec = self.context_cache.read_text(track_dir / "spec.md")
+        plan = self.context_cache.read_text(track_dir / "plan.md")
+        metadata = self.context_cache.read_json(track_dir / "metadata.json")
         
-        if spec_file.exists():
-            context['spec'] = spec_file.read_text()
+        if spec is not None:
+            context['spec'] = spec
         
-        if plan_file.exists():
-            context['plan'] = plan_file.read_text()
+        if plan is not None:
+            context['plan'] = plan
         
-        if metadata_file.exists():
-            context['metadata'] = json.loads(metadata_file.read_text())
+        if metadata is not None:
+            context['metadata'] = metadata
         
         return context
 
 
+def _percent(counts: Dict[str, int]) -> float:
+    return round(100.0 * counts['completed'] / counts['total'], 1) if counts['total'] else 0.0
+
+
+def _plan_summary(tasks: List[Dict]) -> Dict:
+    """Completion counts of parse_plan() tasks and their subtasks."""
+    summary = {kind: {'total': 0, 'completed': 0, 'in_progress': 0, 'pending': 0} for kind in ('tasks', 'subtasks')}
+    for task in tasks:
+        summary['tasks']['total'] += 1
+        summary['tasks'][task['status']] += 1
+        for subtask in task['subtasks']:
+            summary['subtasks']['total'] += 1
+            summary['subtasks'][subtask['status']] += 1
+    summary['percent_complete'] = _percent(summary['tasks'])
+    return summary
+
+
 def main():
     """CLI interface for testing."""
     import sys
     
     if len(sys.argv) < 2:
         print("Usage: python manus_conductor.py <command> [args]")
-        print("Commands: detect, init, status")
+        print("Commands: detect, init, status, progress, watch")
         return
     
     conductor = ManusCondor()
@@ -419,6 +804,18 @@ def main():
         status = conductor.get_project_status()
         print(json.dumps(status, indent=2))
     
+    elif command == "progress":
+        if not conductor.is_setup():
+            print("Conductor is not set up. Run setup first.")
+            return
+        
+        print(json.dumps(conductor.get_progress_report(), indent=2))
+    
+    elif command == "watch":
+        # Track and task changes as JSON lines; see watcher.py for the options
+        from watcher import main as watch_main
+        watch_main(sys.argv[2:])
+    
     else:
         print(f"Unknown command: {command}")
 
@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+"""
+SQLite storage backend for ManusCondor.
+
+Usage:
+    python sqlite_store.py import      # load tracks.md, plan.md, metadata.json and setup_state.json
+    python sqlite_store.py export      # regenerate the markdown and JSON files from the database
+    python sqlite_store.py export --force   # ... overwriting files edited by hand since the last export
+    python sqlite_store.py status
+
+    from sqlite_store import SQLiteManusCondor
+    conductor = SQLiteManusCondor(".")                    # conductor/conductor.db
+    with conductor.exporting():                           # markdown rewritten once, on exit
+        conductor.update_task_statuses(track_id, subtasks={...})
+        conductor.update_track_status(track_id, "completed")
+
+SQLiteManusCondor is a drop-in ManusCondor whose source of truth is an
+indexed SQLite database: tracks, tasks and subtasks (one row each) and setup
+state. Queries and status updates are single indexed statements in a
+transaction, so they do not depend on the number of tracks. tracks.md,
+plan.md, metadata.json and setup_state.json become exports. Rewriting
+tracks.md costs time in proportion to the number of tracks, so by default a
+change only marks its files stale, in the same transaction as the change:
+export_pending() (or leaving an exporting() block) rewrites just those files,
+once however many changes were made. The marks live in the database, so a
+process that exits without exporting leaves them for the next one.
+auto_export=True exports after every change instead, for callers that read
+the markdown between calls. export() rewrites everything. Each plan's
+original text is stored and exported with only its status characters changed.
+
+The hash of every exported file is recorded. A file whose content no longer
+matches it was edited by hand: it is not overwritten (a warning names it and
+it stays pending) until import_markdown() takes the edit in or an export
+with force=True discards it.
+
+A new database is filled from the existing markdown on first use. After that,
+edit state through the API; hand edits to the markdown are not read back
+unless import_markdown() is called again.
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import warnings
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from manus_conductor import (STATUS_CHARS, STATUS_NAMES, ContextCache, ManusCondor, _PLAN_LINE, _percent,
+                             _plan_summary, _set_line_status, atomic_write_text)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    number INTEGER,
+    description TEXT NOT NULL,
+    status TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS tracks_by_status ON tracks (status, seq);
+CREATE TABLE IF NOT EXISTS plans (
+    track_id TEXT PRIMARY KEY,
+    content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    track_id TEXT NOT NULL,
+    parent_id INTEGER,
+    line INTEGER NOT NULL,
+    phase TEXT,
+    description TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_by_track ON tasks (track_id, line);
+CREATE INDEX IF NOT EXISTS tasks_by_description ON tasks (track_id, description);
+CREATE INDEX IF NOT EXISTS tasks_by_parent ON tasks (parent_id, line);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+TRACKS_HEADER = "# Tracks\n\nThis file contains all tracks for the project.\n\n"
+
+# state keys: exports waiting to be written ('tracks', 'state' or 'track/<id>', value bumped on every
+# change) and the sha256 of each file as last exported
+PENDING_PREFIX = "pending_export:"
+EXPORTED_PREFIX = "exported:"
+
+
+def _track_entry(track_id: str, description: str, status: str) -> str:
+    return (f"\n---\n\n## [{STATUS_CHARS.get(status, ' ')}] Track: {description}\n\n"
+            f"**Folder:** [conductor/tracks/{track_id}](conductor/tracks/{track_id})\n\n")
+
+
+def _plan_rows(content: str) -> Iterator[Tuple[int, bool, Optional[str], str, str]]:
+    """Yield (line, is_task, phase, description, status) for every task and subtask line of plan text."""
+    phase = None
+    has_task = False
+    for number, line in enumerate(content.split('\n')):
+        match = _PLAN_LINE.match(line)
+        if match is None:
+            continue
+        if match.group('phase') is not None:
+            phase = match.group('phase').strip()
+        elif match.group('task') is not None:
+            has_task = True
+            yield number, True, phase, match.group('task').strip(), STATUS_NAMES[match.group('task_status')]
+        elif has_task:
+            yield number, False, phase, match.group('subtask').strip(), STATUS_NAMES[match.group('subtask_status')]
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class SQLiteManusCondor(ManusCondor):
+    """ManusCondor backed by an SQLite database, with the markdown files as exports."""
+
+    def __init__(self, project_root: str = ".", db_path: Optional[str] = None, auto_export: bool = False,
+                 context_cache: Optional[ContextCache] = None):
+        super().__init__(project_root, context_cache)
+        self.db_file = Path(db_path) if db_path else self.conductor_dir / "conductor.db"
+        self.auto_export = auto_export
+        self._local = threading.local()
+
+        new_database = not self.db_file.exists()
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        if new_database and (self.tracks_file.exists() or self.state_file.exists()):
+            self.import_markdown()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """This thread's connection (sqlite3 connections are not shared between threads)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE ... COMMIT, rolled back on error; takes the write lock up front."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # Import and export
+
+    def import_markdown(self):
+        """Replace the database contents with the current markdown and JSON files."""
+        tracks = ManusCondor.parse_tracks(self)
+        step = ManusCondor.load_state(self)
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM tracks")
+            conn.execute("DELETE FROM plans")
+            conn.execute("DELETE FROM tasks")
+            conn.execute("DELETE FROM state")
+            conn.execute("INSERT INTO state (key, value) VALUES ('last_successful_step', ?)", (step,))
+            for path in (self.tracks_file, self.state_file):
+                if path.exists():
+                    self._record_export(conn, path, path.read_text())
+            for track in tracks:
+                if conn.execute("SELECT 1 FROM tracks WHERE id = ?", (track['id'],)).fetchone():
+                    continue    # a repeated heading: the first occurrence wins, as in ManusCondor
+                track_dir = self.tracks_dir / track['id']
+                metadata_file = track_dir / "metadata.json"
+                metadata = {}
+                if metadata_file.exists():
+                    text = metadata_file.read_text()
+                    metadata = json.loads(text)
+                    self._record_export(conn, metadata_file, text)
+                self._insert_track(conn, track['id'], track['description'], track['status'], metadata)
+                plan_file = track_dir / "plan.md"
+                if plan_file.exists():
+                    text = plan_file.read_text()
+                    self._insert_plan(conn, track['id'], text)
+                    self._record_export(conn, plan_file, text)
+
+    def export(self, track_ids: Optional[List[str]] = None, force: bool = False):
+        """
+        Write tracks.md, setup_state.json and the plan.md/metadata.json of the given (default: all) tracks.
+        force=True also overwrites files edited by hand since the last export.
+        """
+        pending = self._pending()
+        if track_ids is None:
+            track_ids = [row[0] for row in self.conn.execute("SELECT id FROM tracks ORDER BY seq")]
+        with self.locked():
+            written = {'tracks': self._export_tracks(force), 'state': self._export_state(force)}
+            for track_id in track_ids:
+                written[f"track/{track_id}"] = self._export_track_files(track_id, force)
+            self._clear_pending([(key, value) for key, value in pending if written.get(key[len(PENDING_PREFIX):])])
+
+    def export_pending(self, force: bool = False) -> int:
+        """
+        Rewrite only the files changed since the last export, by this or any other process.
+        Returns the number of pending exports written; one skipped for a hand edit stays pending.
+        """
+        pending = self._pending()
+        if not pending:
+            return 0
+        with self.locked():
+            done = []
+            for key, value in pending:
+                item = key[len(PENDING_PREFIX):]
+                if item == 'tracks':
+                    written = self._export_tracks(force)
+                elif item == 'state':
+                    written = self._export_state(force)
+                else:
+                    written = self._export_track_files(item[len("track/"):], force)
+                if written:
+                    done.append((key, value))
+            self._clear_pending(done)
+        return len(done)
+
+    @contextmanager
+    def exporting(self) -> Iterator["SQLiteManusCondor"]:
+        """Run a batch of changes, then export_pending(); the export runs even if the batch raises."""
+        try:
+            yield self
+        finally:
+            self.export_pending()
+
+    def _pending(self) -> List[Tuple[str, str]]:
+        # ';' follows ':', so this is a prefix range over the primary key
+        return self.conn.execute("SELECT key, value FROM state WHERE key >= ? AND key < ? ORDER BY key",
+                                 (PENDING_PREFIX, PENDING_PREFIX[:-1] + ';')).fetchall()
+
+    def _clear_pending(self, done: List[Tuple[str, str]]):
+        # A mark whose value moved on was bumped by a change during the export and stays pending.
+        with self.transaction() as conn:
+            conn.executemany("DELETE FROM state WHERE key = ? AND value = ?", done)
+
+    @staticmethod
+    def _mark_pending(conn: sqlite3.Connection, item: str):
+        """Queue an export inside the transaction that makes the change."""
+        conn.execute("INSERT INTO state (key, value) VALUES (?, '1') "
+                     "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1", (PENDING_PREFIX + item,))
+
+    def _after_change(self):
+        if self.auto_export:
+            self.export_pending()
+
+    def _record_export(self, conn: sqlite3.Connection, path: Path, content: str):
+        conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                     (EXPORTED_PREFIX + str(path), _sha256(content)))
+
+    def _write_export(self, path: Path, content: str, force: bool = False) -> bool:
+        """
+        atomic_write_text for an export, skipped when the file already holds content. A file that
+        no longer matches its last export was edited by hand: it is left alone, with a warning,
+        unless force is set. Returns whether the file now holds content.
+        """
+        try:
+            current = path.read_text()
+        except FileNotFoundError:
+            current = None
+        if current != content:
+            row = self.conn.execute("SELECT value FROM state WHERE key = ?", (EXPORTED_PREFIX + str(path),)).fetchone()
+            if current is not None and row is not None and _sha256(current) != row[0] and not force:
+                warnings.warn(f"{path} was edited after its last export and is not overwritten; "
+                              f"import_markdown() keeps the edit, export(force=True) discards it", stacklevel=3)
+                return False
+            atomic_write_text(path, content)
+        with self.transaction() as conn:
+            self._record_export(conn, path, content)
+        return True
+
+    def _export_tracks(self, force: bool = False) -> bool:
+        rows = self.conn.execute("SELECT id, description, status FROM tracks ORDER BY seq").fetchall()
+        self.conductor_dir.mkdir(parents=True, exist_ok=True)
+        return self._write_export(self.tracks_file, TRACKS_HEADER + ''.join(_track_entry(*row) for row in rows), force)
+
+    def _export_state(self, force: bool = False) -> bool:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        return self._write_export(self.state_file, json.dumps({"last_successful_step": self.load_state()}, indent=2),
+                                  force)
+
+    def _export_track_files(self, track_id: str, force: bool = False) -> bool:
+        track_dir = self.tracks_dir / track_id
+        track_dir.mkdir(parents=True, exist_ok=True)
+        written = True
+        plan = self.render_plan(track_id)
+        if plan is not None:
+            written = self._write_export(track_dir / "plan.md", plan, force)
+        row = self.conn.execute("SELECT metadata FROM tracks WHERE id = ?", (track_id,)).fetchone()
+        if row:
+            written = self._write_export(track_dir / "metadata.json", json.dumps(json.loads(row[0]), indent=2),
+                                         force) and written
+        return written
+
+    def render_plan(self, track_id: str) -> Optional[str]:
+        """The track's plan.md text with its current task and subtask statuses, or None without a plan."""
+        row = self.conn.execute("SELECT content FROM plans WHERE track_id = ?", (track_id,)).fetchone()
+        if row is None:
+            return None
+        lines = row[0].split('\n')
+        for line, status in self.conn.execute("SELECT line, status FROM tasks WHERE track_id = ?", (track_id,)):
+            lines[line] = _set_line_status(lines[line], STATUS_CHARS[status])
+        return '\n'.join(lines)
+
+    # Setup state
+
+    def save_state(self, step: str):
+        """Save the current setup state."""
+        with self.transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('last_successful_step', ?)", (step,))
+            self._mark_pending(conn, 'state')
+        self._after_change()
+
+    def load_state(self) -> str:
+        """Load the current setup state."""
+        row = self.conn.execute("SELECT value FROM state WHERE key = 'last_successful_step'").fetchone()
+        return row[0] if row else ""
+
+    # Tracks
+
+    def _insert_track(self, conn: sqlite3.Connection, track_id: str, description: str, status: str,
+                      metadata: Dict):
+        number = track_id[len("track-"):] if track_id.startswith("track-") else ""
+        conn.execute("INSERT INTO tracks (id, number, description, status, metadata) VALUES (?, ?, ?, ?, ?) "
+                     "ON CONFLICT (id) DO UPDATE SET description = excluded.description",
+                     (track_id, int(number) if number.isdigit() else None, description, status,
+                      json.dumps(metadata)))
+
+    def _insert_plan(self, conn: sqlite3.Connection, track_id: str, content: str):
+        conn.execute("DELETE FROM tasks WHERE track_id = ?", (track_id,))
+        conn.execute("INSERT OR REPLACE INTO plans (track_id, content) VALUES (?, ?)", (track_id, content))
+        parent = None
+        for line, is_task, phase, description, status in _plan_rows(content):
+            row_id = conn.execute(
+                "INSERT INTO tasks (track_id, parent_id, line, phase, description, status) VALUES (?, ?, ?, ?, ?, ?)",
+                (track_id, None if is_task else parent, line, phase, description, status)).lastrowid
+            if is_task:
+                parent = row_id
+
+    def allocate_track_id(self) -> str:
+        """Reserve the next track ID; the write transaction serializes allocators across threads and processes."""
+        return self._create_track_row(None, {})
+
+    def _create_track_row(self, description: Optional[str], metadata: Dict, plan_content: Optional[str] = None) -> str:
+        self.tracks_dir.mkdir(parents=True, exist_ok=True)
+        with self.transaction() as conn:
+            row = conn.execute("SELECT value FROM state WHERE key = 'last_track_number'").fetchone()
+            if row is not None:
+                number = int(row[0])
+            else:
+                number = int(ManusCondor.get_next_track_id(self)[len("track-"):]) - 1
+                number = max(number, conn.execute("SELECT COALESCE(MAX(number), 0) FROM tracks").fetchone()[0])
+            while True:
+                number += 1
+                track_id = f"track-{number:03d}"
+                try:
+                    (self.tracks_dir / track_id).mkdir()
+                except FileExistsError:
+                    continue
+                break
+            conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('last_track_number', ?)", (str(number),))
+            if description is not None:
+                metadata = dict(metadata, id=track_id)
+                self._insert_track(conn, track_id, description, "pending", metadata)
+                self._mark_pending(conn, 'tracks')
+                if plan_content is not None:
+                    self._insert_plan(conn, track_id, plan_content)
+        return track_id
+
+    def create_track(self, description: str, spec_content: str, plan_content: str) -> str:
+        """
+        Create a new track with spec and plan.
+        Returns: track_id
+        """
+        metadata = {"description": description, "created_at": datetime.now().isoformat(), "status": "pending"}
+        track_id = self._create_track_row(description, metadata, plan_content)
+        track_dir = self.tracks_dir / track_id
+        (track_dir / "spec.md").write_text(spec_content)
+        self._write_export(track_dir / "plan.md", plan_content)
+        self._write_export(track_dir / "metadata.json", json.dumps(dict(metadata, id=track_id), indent=2))
+        self._after_change()
+        return track_id
+
+    def add_track_to_registry(self, track_id: str, description: str):
+        """Add a track to the registry."""
+        with self.transaction() as conn:
+            self._insert_track(conn, track_id, description, "pending", {})
+            self._mark_pending(conn, 'tracks')
+        self._after_change()
+
+    def parse_tracks(self) -> List[Dict]:
+        """All tracks in registry order: {id, description, status, folder}."""
+        return [self._track(row) for row in self.conn.execute("SELECT id, description, status FROM tracks ORDER BY seq")]
+
+    @staticmethod
+    def _track(row) -> Dict:
+        return {'id': row[0], 'description': row[1], 'status': row[2], 'folder': f"conductor/tracks/{row[0]}"}
+
+    def get_tracks_by_status(self, status: str) -> List[Dict]:
+        rows = self.conn.execute("SELECT id, description, status FROM tracks WHERE status = ? ORDER BY seq", (status,))
+        return [self._track(row) for row in rows]
+
+    def get_track_by_id(self, track_id: str) -> Optional[Dict]:
+        row = self.conn.execute("SELECT id, description, status FROM tracks WHERE id = ?", (track_id,)).fetchone()
+        return self._track(row) if row else None
+
+    def get_next_pending_track(self) -> Optional[Dict]:
+        row = self.conn.execute("SELECT id, description, status FROM tracks WHERE status != 'completed' "
+                                "ORDER BY seq LIMIT 1").fetchone()
+        return self._track(row) if row else None
+
+    def update_track_statuses(self, updates: Dict[str, str]) -> int:
+        """Apply many track status changes ({track_id: new_status}) in one transaction. Returns rows changed."""
+        values = [(new_status if new_status in STATUS_CHARS else 'pending', track_id)
+                  for track_id, new_status in updates.items()]
+        with self.transaction() as conn:
+            changed = sum(conn.execute("UPDATE tracks SET status = ? WHERE id = ? AND status != ?",
+                                       (status, track_id, status)).rowcount for status, track_id in values)
+            if changed:
+                self._mark_pending(conn, 'tracks')
+        if changed:
+            self._after_change()
+        return changed
+
+    def get_project_status(self) -> Dict:
+        """Get overall project status."""
+        counts = dict(self.conn.execute("SELECT status, COUNT(*) FROM tracks GROUP BY status").fetchall())
+        return {
+            'total_tracks': sum(counts.values()),
+            'completed': counts.get('completed', 0),
+            'in_progress': counts.get('in_progress', 0),
+            'pending': counts.get('pending', 0),
+            'tracks': self.parse_tracks()
+        }
+
+    # Plans
+
+    def iter_plan(self, track_id: str) -> Iterator[Dict]:
+        """Yield a track's tasks, with their subtasks, in plan order."""
+        task = None
+        rows = self.conn.execute("SELECT parent_id, phase, description, status FROM tasks WHERE track_id = ? "
+                                 "ORDER BY line", (track_id,))
+        for parent_id, phase, description, status in rows:
+            if parent_id is None:
+                if task is not None:
+                    yield task
+                task = {'phase': phase, 'task': description, 'status': status, 'subtasks': []}
+            elif task is not None:
+                task['subtasks'].append({'subtask': description, 'status': status})
+        if task is not None:
+            yield task
+
+    def get_next_pending_task(self, track_id: str) -> Optional[Dict]:
+        """Get the next pending task from a track's plan."""
+        row = self.conn.execute("SELECT id, phase, description, status FROM tasks WHERE track_id = ? "
+                                "AND parent_id IS NULL AND status != 'completed' ORDER BY line LIMIT 1",
+                                (track_id,)).fetchone()
+        if row is None:
+            return None
+        subtasks = self.conn.execute("SELECT description, status FROM tasks WHERE parent_id = ? ORDER BY line",
+                                     (row[0],))
+        return {'phase': row[1], 'task': row[2], 'status': row[3],
+                'subtasks': [{'subtask': d, 'status': s} for d, s in subtasks]}
+
+    def update_task_statuses(self, track_id: str, tasks: Optional[Dict[str, str]] = None,
+                             subtasks: Optional[Dict[Tuple[str, str], str]] = None) -> int:
+        """
+        Apply many status changes to a track's plan in one transaction.
+        tasks: {task_description: new_status}
+        subtasks: {(task_description, subtask_description): new_status}
+        Returns: number of tasks and subtasks changed
+        """
+        changed = 0
+        with self.transaction() as conn:
+            for description, new_status in (tasks or {}).items():
+                status = new_status if new_status in STATUS_CHARS else 'pending'
+                changed += conn.execute(
+                    "UPDATE tasks SET status = ? WHERE track_id = ? AND parent_id IS NULL AND description = ? "
+                    "AND status != ?", (status, track_id, description, status)).rowcount
+            for (task, subtask), new_status in (subtasks or {}).items():
+                status = new_status if new_status in STATUS_CHARS else 'pending'
+                changed += conn.execute(
+                    "UPDATE tasks SET status = ? WHERE parent_id IN (SELECT id FROM tasks WHERE track_id = ? "
+                    "AND parent_id IS NULL AND description = ?) AND description = ? AND status != ?",
+                    (status, track_id, task, subtask, status)).rowcount
+            if changed:
+                self._mark_pending(conn, f"track/{track_id}")
+        if changed:
+            self._after_change()
+        return changed
+
+    def get_plan_progress(self, track_id: str) -> Dict:
+        """Task and subtask completion counts for a track's plan."""
+        return self._progress("WHERE track_id = ?", (track_id,)).get(track_id, _plan_summary([]))
+
+    def _progress(self, where: str = "", params: Tuple = ()) -> Dict[str, Dict]:
+        summaries: Dict[str, Dict] = {}
+        rows = self.conn.execute(f"SELECT track_id, parent_id IS NULL, status, COUNT(*) FROM tasks {where} "
+                                 f"GROUP BY 1, 2, 3", params)
+        for track_id, is_task, status, count in rows:
+            summary = summaries.setdefault(track_id, _plan_summary([]))
+            counts = summary['tasks' if is_task else 'subtasks']
+            counts[status] += count
+            counts['total'] += count
+        for summary in summaries.values():
+            summary['percent_complete'] = _percent(summary['tasks'])
+        return summaries
+
+    def get_progress_report(self, max_workers: Optional[int] = None) -> Dict:
+        """Project-wide progress from one grouped query; max_workers is accepted for compatibility."""
+        summaries = self._progress()
+        tracks = self.parse_tracks()
+        totals = _plan_summary([])
+        for track in tracks:
+            summary = summaries.get(track['id'], _plan_summary([]))
+            track.update(summary)
+            for kind in ('tasks', 'subtasks'):
+                for status, count in summary[kind].items():
+                    totals[kind][status] += count
+        totals['percent_complete'] = _percent(totals['tasks'])
+
+        report = self.get_project_status()
+        report.update(totals)
+        report['tracks'] = tracks
+        return report
+
+    def load_track_context(self, track_id: str) -> Dict[str, str]:
+        """Load spec and plan for a specific track; the plan and metadata come from the database."""
+        context = super().load_track_context(track_id)
+        plan = self.render_plan(track_id)
+        if plan is not None:
+            context['plan'] = plan
+        row = self.conn.execute("SELECT metadata FROM tracks WHERE id = ?", (track_id,)).fetchone()
+        if row:
+            context['metadata'] = json.loads(row[0])
+        return context
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SQLite storage for Conductor tracks, plans and setup state.")
+    parser.add_argument('command', choices=['import', 'export', 'status', 'progress'])
+    parser.add_argument('--root', default='.', help="Project root (default: current directory)")
+    parser.add_argument('--db', help="Database file (default: conductor/conductor.db)")
+    parser.add_argument('--force', action='store_true',
+                        help="export: also overwrite files edited by hand since the last export")
+    args = parser.parse_args(argv)
+
+    conductor = SQLiteManusCondor(args.root, db_path=args.db, auto_export=False)
+    if args.command == 'import':
+        conductor.import_markdown()
+        print(f"Imported {len(conductor.parse_tracks())} tracks into {conductor.db_file}")
+    elif args.command == 'export':
+        conductor.export(force=args.force)
+        print(f"Exported {len(conductor.parse_tracks())} tracks from {conductor.db_file}")
+    elif args.command == 'status':
+        print(json.dumps(conductor.get_project_status(), indent=2))
+    else:
+        print(json.dumps(conductor.get_progress_report(), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
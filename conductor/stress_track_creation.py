@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Stress test for concurrent track creation.
+
+Usage:
+    python stress_track_creation.py                          # 4 processes x 8 threads, 2000 tracks
+    python stress_track_creation.py --processes 8 --threads 16 --tracks 5000 --keep /tmp/stress-project
+
+Every thread of every process creates tracks in the same scratch project with
+ManusCondor.create_track and immediately marks each one in progress, so
+registry appends race with tracks.md rewrites. Afterwards the project is
+checked: every track ID is unique, has its directory and metadata, appears
+exactly once in tracks.md, and kept its status. Exits 1 on any violation.
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from manus_conductor import ManusCondor
+
+
+def create_tracks(root: str, worker: str, count: int):
+    """Create count tracks; returns [(track_id, description), ...]."""
+    conductor = ManusCondor(root)
+    created = []
+    for i in range(count):
+        description = f"Stress {worker}-{i}"
+        track_id = conductor.create_track(description, f"# Spec\n{description}\n",
+                                          "# Plan\n\n## Phase 1\n- [ ] Task: Run\n")
+        conductor.update_track_status(track_id, 'in_progress')
+        created.append((track_id, description))
+    return created
+
+
+def run_process(root: str, process: int, threads: int, per_thread: int):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = pool.map(create_tracks, [root] * threads, [f"{process}.{t}" for t in range(threads)],
+                           [per_thread] * threads)
+        return [entry for created in results for entry in created]
+
+
+def check(root: str, created) -> list:
+    """Return a list of problems found in the project after the run."""
+    conductor = ManusCondor(root)
+    problems = []
+    ids = [track_id for track_id, _ in created]
+    if len(set(ids)) != len(ids):
+        problems.append(f"{len(ids) - len(set(ids))} duplicate track IDs handed out")
+
+    tracks = conductor.parse_tracks()
+    registered = [t['id'] for t in tracks]
+    if len(registered) != len(set(registered)):
+        problems.append(f"{len(registered) - len(set(registered))} tracks registered more than once")
+    missing = set(ids) - set(registered)
+    if missing:
+        problems.append(f"{len(missing)} tracks missing from tracks.md, e.g. {sorted(missing)[:5]}")
+
+    descriptions = dict(created)
+    for track in tracks:
+        if track['id'] in descriptions and track['description'] != descriptions[track['id']]:
+            problems.append(f"{track['id']} registered as {track['description']!r}")
+        if track['status'] != 'in_progress':
+            problems.append(f"{track['id']} lost its status update ({track['status']})")
+
+    for track_id in ids:
+        metadata_file = conductor.tracks_dir / track_id / "metadata.json"
+        if not metadata_file.exists() or json.loads(metadata_file.read_text())['id'] != track_id:
+            problems.append(f"{track_id} has no matching metadata.json")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create tracks concurrently and verify the registry.")
+    parser.add_argument('--processes', type=int, default=4, help="Worker processes (default: 4)")
+    parser.add_argument('--threads', type=int, default=8, help="Threads per process (default: 8)")
+    parser.add_argument('--tracks', type=int, default=2000, help="Total tracks to create (default: 2000)")
+    parser.add_argument('--keep', metavar='DIR', help="Use (and keep) this project directory instead of a temp dir")
+    args = parser.parse_args(argv)
+
+    root = args.keep or tempfile.mkdtemp(prefix="conductor-stress-")
+    ManusCondor(root).init_conductor_structure()
+    per_thread = max(1, args.tracks // (args.processes * args.threads))
+
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            results = pool.map(run_process, [root] * args.processes, range(args.processes),
+                               [args.threads] * args.processes, [per_thread] * args.processes)
+            created = [entry for batch in results for entry in batch]
+        elapsed = time.perf_counter() - started
+        problems = check(root, created)
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print(f"{len(created)} tracks from {args.processes} processes x {args.threads} threads in {elapsed:.1f}s")
+    for problem in problems[:20]:
+        print(f"FAIL: {problem}")
+    if problems:
+        return 1
+    print("OK: unique IDs, every track registered once with its status")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
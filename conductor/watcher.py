@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Watch a Conductor project and emit change events as JSON lines.
+
+Usage:
+    python watcher.py                      # inotify on Linux, stat polling elsewhere
+    python watcher.py --poll --interval 0.5 --root /path/to/project
+    python manus_conductor.py watch
+
+    from watcher import ConductorWatcher
+    for event in ConductorWatcher(ManusCondor(".")).watch():
+        ...
+
+The watcher keeps the last parsed state of tracks.md and of every track's
+plan.md and metadata.json. When a file changes, only that file is re-parsed,
+and the difference from the last state is reported as events:
+
+    {"event": "snapshot", "status": {...}}                       first line (--no-snapshot to skip)
+    {"event": "track_added", "track": "track-004", "description": "...", "status": "pending"}
+    {"event": "track_status_changed", "track": "track-004", "from": "pending", "to": "in_progress"}
+    {"event": "track_completed", "track": "track-004", "from": "in_progress", "to": "completed"}
+    {"event": "track_removed", "track": "track-004"}
+    {"event": "plan_added", "track": "track-004", "tasks": {...}, "subtasks": {...}, "percent_complete": 0.0}
+    {"event": "task_status_changed" | "task_completed", "track": ..., "task": "...", "from": ..., "to": ...}
+    {"event": "subtask_status_changed" | "subtask_completed", "track": ..., "task": ..., "subtask": ..., ...}
+    {"event": "task_added" | "task_removed", "track": ..., "task": "...", "status": ...}
+    {"event": "plan_removed", "track": ...}
+    {"event": "metadata_changed", "track": ..., "changes": {"key": [old, new]}}
+
+Every event also carries "time". On Linux the conductor and track directories
+are watched with inotify (through libc, no extra package), so an event
+arrives as soon as the writer closes or renames the file. Elsewhere, or
+with --poll, every file is stat()ed each --interval seconds and re-parsed
+only when its (mtime, size, inode) changed.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from manus_conductor import ManusCondor, _plan_summary
+
+DEFAULT_INTERVAL = 1.0
+BURST_WINDOW = 0.01
+WATCHED_FILES = ("plan.md", "metadata.json")
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+# Written files are reported on close or rename, never half-written
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+
+class _Inotify:
+    """Minimal inotify(7) directory watcher through libc; raises OSError where inotify is unavailable."""
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("libc has no inotify")
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.dirs: Dict[int, str] = {}
+
+    def add(self, directory: str):
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(directory))
+        self.dirs[wd] = directory
+
+    def read(self, timeout: Optional[float]) -> Optional[List[Tuple[str, int]]]:
+        """(path, mask) of every event within timeout; None if the kernel queue overflowed."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        changes = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return changes
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                name = data[offset + _INOTIFY_EVENT.size:offset + _INOTIFY_EVENT.size + length].rstrip(b'\0')
+                offset += _INOTIFY_EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                directory = self.dirs.get(wd)
+                if mask & IN_IGNORED:
+                    self.dirs.pop(wd, None)
+                elif directory is not None:
+                    changes.append((os.path.join(directory, os.fsdecode(name)) if name else directory, mask))
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _signature(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _plan_statuses(tasks: List[Dict]) -> Dict[Tuple, str]:
+    """{(task, n): status, (task, n, subtask, m): status}; n and m number repeated descriptions."""
+    statuses = {}
+    seen = Counter()
+    for task in tasks:
+        key = (task['task'], seen[task['task']])
+        seen[task['task']] += 1
+        statuses[key] = task['status']
+        seen_subtasks = Counter()
+        for subtask in task['subtasks']:
+            statuses[key + (subtask['subtask'], seen_subtasks[subtask['subtask']])] = subtask['status']
+            seen_subtasks[subtask['subtask']] += 1
+    return statuses
+
+
+def _status_event(kind: str, new: str) -> str:
+    return f"{kind}_completed" if new == 'completed' else f"{kind}_status_changed"
+
+
+def _task_event(event: str, track_id: str, key: Tuple, **fields) -> Dict:
+    result = {'event': event, 'track': track_id, 'task': key[0]}
+    if len(key) > 2:
+        result['subtask'] = key[2]
+    result.update(fields)
+    return result
+
+
+class ConductorWatcher:
+    """Incrementally re-parses changed conductor files and reports what changed in them."""
+
+    def __init__(self, conductor: ManusCondor, interval: float = DEFAULT_INTERVAL, backend: str = 'auto'):
+        """backend: 'auto' (inotify if available, else polling), 'inotify' or 'poll'."""
+        self.conductor = conductor
+        self.interval = interval
+        # Paths are kept as str: at tens of thousands of files, pathlib dominates a polling pass
+        self._tracks_file = str(conductor.tracks_file)
+        self._tracks_dir = str(conductor.tracks_dir)
+        self._signatures: Dict[str, Tuple[int, int, int]] = {}
+        self._tracks: Dict[str, Dict] = {}
+        self._plans: Dict[str, Dict[Tuple, str]] = {}
+        self._metadata: Dict[str, Dict] = {}
+        self._inotify: Optional[_Inotify] = None
+        if backend in ('auto', 'inotify'):
+            try:
+                self._inotify = _Inotify()
+            except OSError:
+                if backend == 'inotify':
+                    raise
+        self.backend = 'inotify' if self._inotify else 'poll'
+        self._primed = False
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def files(self) -> Set[str]:
+        """Every file the watcher follows: tracks.md and each track's plan.md and metadata.json."""
+        paths = {self._tracks_file}
+        try:
+            entries = list(os.scandir(self._tracks_dir))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            if entry.is_dir():
+                paths.update(os.path.join(entry.path, name) for name in WATCHED_FILES)
+        # Files seen before but since deleted, so their removal is reported
+        paths.update(self._signatures)
+        return paths
+
+    def prime(self):
+        """Read the current state without reporting it, and start watching directories."""
+        self._add_watches()
+        self.check()
+        self._primed = True
+
+    def check(self, paths: Optional[Set[str]] = None) -> List[Dict]:
+        """
+        Re-parse the given files (default: every followed file) whose (mtime, size, inode) changed.
+        Returns: events for what changed since the last check
+        """
+        paths = self.files() if paths is None else paths
+        changed = []
+        for path in paths:
+            signature = _signature(path)
+            if signature != self._signatures.get(path):
+                changed.append((path, signature))
+        events = []
+        # tracks.md first, so track_added precedes the new track's plan_added
+        for path, signature in sorted(changed, key=lambda item: (item[0] != self._tracks_file, item[0])):
+            events.extend(self._reparse(path, signature))
+        now = datetime.now().isoformat()
+        for event in events:
+            event['time'] = now
+        return events
+
+    def watch(self, timeout: Optional[float] = None) -> Iterator[Dict]:
+        """Yield events as files change; runs forever, or until timeout seconds pass without an event."""
+        if not self._primed:
+            self.prime()
+        idle_since = time.monotonic()
+        while timeout is None or time.monotonic() - idle_since < timeout:
+            if self._inotify is not None:
+                wait = self.interval if timeout is None else min(self.interval, timeout)
+                events = self.check(self._changed_paths(wait))
+            else:
+                time.sleep(self.interval)
+                events = self.check()
+            for event in events:
+                yield event
+            if events:
+                idle_since = time.monotonic()
+
+    def _add_watches(self, track_dirs: Optional[List[str]] = None):
+        if self._inotify is None:
+            return
+        if track_dirs is None:
+            track_dirs = [str(self.conductor.conductor_dir), self._tracks_dir]
+            if os.path.isdir(self._tracks_dir):
+                track_dirs += [entry.path for entry in os.scandir(self._tracks_dir) if entry.is_dir()]
+        for directory in track_dirs:
+            try:
+                self._inotify.add(directory)
+            except FileNotFoundError:
+                continue
+            except OSError:
+                # Out of inotify watches (fs.inotify.max_user_watches): poll instead
+                self.close()
+                self.backend = 'poll'
+                return
+
+    def _changed_paths(self, timeout: float) -> Optional[Set[str]]:
+        """Followed files named by inotify events within timeout; None to rescan everything."""
+        # A burst of writes (create_track writes three files) is collected into one check
+        batch = self._inotify.read(timeout)
+        changes = []
+        deadline = time.monotonic() + self.interval
+        while batch and time.monotonic() < deadline:
+            changes += batch
+            batch = self._inotify.read(BURST_WINDOW)
+        if batch is None:
+            return None
+
+        paths = set()
+        for path, mask in changes:
+            parent, name = os.path.split(path)
+            if path == self._tracks_file:
+                paths.add(path)
+            elif path == self._tracks_dir:
+                # The tracks directory itself was created, replaced or removed
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_watches([path])
+                return None
+            elif parent == self._tracks_dir:
+                # A track directory appeared or went away
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_watches([path])
+                paths.update(os.path.join(path, name) for name in WATCHED_FILES)
+            elif name in WATCHED_FILES and os.path.dirname(parent) == self._tracks_dir:
+                paths.add(path)
+        return paths
+
+    def _reparse(self, path: str, signature: Optional[Tuple[int, int, int]]) -> List[Dict]:
+        if path == self._tracks_file:
+            events = self._reparse_tracks(signature is not None)
+        elif os.path.basename(path) == "plan.md":
+            events = self._reparse_plan(os.path.basename(os.path.dirname(path)), signature is not None)
+        else:
+            events = self._reparse_metadata(path, signature is not None)
+            if events is None:
+                # Unreadable (being written by a tool that does not write atomically): retry next check
+                return []
+        if signature is None:
+            self._signatures.pop(path, None)
+        else:
+            self._signatures[path] = signature
+        return events if self._primed else []
+
+    def _reparse_tracks(self, exists: bool) -> List[Dict]:
+        tracks = {}
+        if exists:
+            self.conductor.invalidate_track_index()
+            for track in self.conductor.parse_tracks():
+                tracks.setdefault(track['id'], track)
+
+        events = []
+        for track_id, track in tracks.items():
+            old = self._tracks.get(track_id)
+            if old is None:
+                events.append({'event': 'track_added', 'track': track_id, 'description': track['description'],
+                               'status': track['status']})
+            elif old['status'] != track['status']:
+                events.append({'event': _status_event('track', track['status']), 'track': track_id,
+                               'from': old['status'], 'to': track['status']})
+        events.extend({'event': 'track_removed', 'track': track_id} for track_id in self._tracks if track_id not in tracks)
+        self._tracks = tracks
+        return events
+
+    def _reparse_plan(self, track_id: str, exists: bool) -> List[Dict]:
+        if not exists:
+            return [{'event': 'plan_removed', 'track': track_id}] if self._plans.pop(track_id, None) is not None else []
+        tasks = self.conductor.parse_plan(track_id)
+        statuses = _plan_statuses(tasks)
+        old = self._plans.get(track_id)
+        self._plans[track_id] = statuses
+        if old is None:
+            return [{'event': 'plan_added', 'track': track_id, **_plan_summary(tasks)}]
+
+        events = []
+        for key, status in statuses.items():
+            kind = 'subtask' if len(key) > 2 else 'task'
+            if key not in old:
+                events.append(_task_event(f'{kind}_added', track_id, key, status=status))
+            elif old[key] != status:
+                events.append(_task_event(_status_event(kind, status), track_id, key, **{'from': old[key], 'to': status}))
+        for key, status in old.items():
+            if key not in statuses:
+                kind = 'subtask' if len(key) > 2 else 'task'
+                events.append(_task_event(f'{kind}_removed', track_id, key, status=status))
+        return events
+
+    def _reparse_metadata(self, path: str, exists: bool) -> Optional[List[Dict]]:
+        track_id = os.path.basename(os.path.dirname(path))
+        try:
+            metadata = json.loads(Path(path).read_text()) if exists else None
+        except FileNotFoundError:
+            metadata = None
+        except ValueError:
+            return None
+        old = self._metadata.pop(track_id, None)
+        if metadata is None or old is None:
+            # Metadata of a new or removed track: track_added, plan_added and plan_removed report those
+            if metadata is not None:
+                self._metadata[track_id] = metadata
+            return []
+        self._metadata[track_id] = metadata
+        changes = {key: [old.get(key), metadata.get(key)] for key in old.keys() | metadata.keys()
+                   if old.get(key) != metadata.get(key)}
+        return [{'event': 'metadata_changed', 'track': track_id, 'changes': changes}] if changes else []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Emit Conductor track and task changes as JSON lines.")
+    parser.add_argument('--root', default='.', help="Project root (default: current directory)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help=f"Polling interval in seconds (default: {DEFAULT_INTERVAL:g})")
+    parser.add_argument('--poll', action='store_true', help="Poll with stat() even where inotify is available")
+    parser.add_argument('--no-snapshot', action='store_true', help="Do not start with the full project status")
+    args = parser.parse_args(argv)
+
+    conductor = ManusCondor(args.root)
+    watcher = ConductorWatcher(conductor, interval=args.interval, backend='poll' if args.poll else 'auto')
+    watcher.prime()
+    print(f"Watching {conductor.conductor_dir} ({watcher.backend})", file=sys.stderr)
+    try:
+        if not args.no_snapshot:
+            print(json.dumps({'event': 'snapshot', 'time': datetime.now().isoformat(),
+                              'status': conductor.get_project_status()}), flush=True)
+        for event in watcher.watch():
+            print(json.dumps(event), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
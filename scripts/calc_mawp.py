@@ -1,64 +1,436 @@
 #!/usr/bin/env python3
 # ASME Section VIII Shell MAWP Calculation
 # MAWP = SEt / (R + 0.6t)
+#
+# Run with no arguments for the single-vessel worked example below. Pass a
+# readings file to evaluate a whole fleet in fixed-size chunks:
+#
+#   python scripts/calc_mawp.py readings.csv -o results.csv --summary vessels.csv
+#   python scripts/calc_mawp.py readings.parquet --chunk-rows 500000 --pressure 280
+#
+# Required columns: vessel, component, thickness (or current), diameter (or D).
+# Optional per-row columns stress (S), efficiency (E) and pressure (P) override
+# --stress, --efficiency and --pressure. Without a stress column, material and
+# temperature columns resolve S from the Section II-D table (material_stress.py). Each chunk is evaluated with
+# mawp_engine and its rows written before the next is read, so memory depends
+# on --chunk-rows and the number of vessels, not the size of the file.
+#
+#   python scripts/calc_mawp.py readings.csv --sweep 10000 --ut-sigma 0.005 --ca-max 0.0625 --summary sweep.csv
+#
+# --sweep runs a Monte Carlo uncertainty sweep (mawp_sweep.py) instead, giving
+# each vessel's governing MAWP distribution, P(UNSAFE) and rated pressure.
 
-# Given values
-t = 0.8006  # Current actual thickness (inches) - from 2025 UT readings
-S = 20000   # Allowable stress (psi) for SA-612 at 125F
-E = 1.0     # Joint efficiency (full RT)
-D = 130.26  # Inside diameter (inches)
-R = D / 2   # Inside radius = 65.13 inches
-
-# Shell MAWP calculation
-MAWP_shell = (S * E * t) / (R + 0.6 * t)
-
-print("=" * 60)
-print("SHELL MAWP CALCULATION (ASME Section VIII)")
-print("=" * 60)
-print(f"Current Thickness (t): {t:.4f} in")
-print(f"Allowable Stress (S): {S:,} psi")
-print(f"Joint Efficiency (E): {E}")
-print(f"Inside Diameter (D): {D} in")
-print(f"Inside Radius (R): {R:.2f} in")
-print()
-print("Formula: MAWP = SEt / (R + 0.6t)")
-print(f"MAWP = ({S} x {E} x {t:.4f}) / ({R:.2f} + 0.6 x {t:.4f})")
-print(f"MAWP = {S * E * t:.2f} / {R + 0.6 * t:.4f}")
-print()
-print(f">>> CALCULATED SHELL MAWP = {MAWP_shell:.1f} psi <<<")
-print()
-
-# Compare to design pressure
-design_pressure = 280
-print(f"Design Pressure: {design_pressure} psi")
-if MAWP_shell >= design_pressure:
-    print(f"SAFE: MAWP ({MAWP_shell:.1f} psi) >= Design Pressure ({design_pressure} psi)")
-else:
-    print(f"UNSAFE: MAWP ({MAWP_shell:.1f} psi) < Design Pressure ({design_pressure} psi)")
-    print(f"  Vessel must be de-rated to {MAWP_shell:.0f} psi or repaired")
-
-# Calculate minimum thickness required for 280 psi
-t_min = (design_pressure * R) / (S * E - 0.6 * design_pressure)
-print()
-print(f"Minimum thickness required for {design_pressure} psi: {t_min:.4f} in")
-print(f"Current thickness: {t:.4f} in")
-print(f"Thickness deficit: {t_min - t:.4f} in")
-
-# Also calculate for heads
-print()
-print("=" * 60)
-print("HEAD MAWP CALCULATION (2:1 Ellipsoidal)")
-print("=" * 60)
-t_head = 0.5070  # Current head thickness from 2025 UT
-# For 2:1 ellipsoidal head: MAWP = 2SEt / (D + 0.2t)
-MAWP_head = (2 * S * E * t_head) / (D + 0.2 * t_head)
-print(f"Current Head Thickness: {t_head:.4f} in")
-print(f"Formula: MAWP = 2SEt / (D + 0.2t)")
-print(f">>> HEAD MAWP = {MAWP_head:.1f} psi <<<")
-
-# Governing MAWP
-governing_mawp = min(MAWP_shell, MAWP_head)
-print()
-print("=" * 60)
-print(f">>> GOVERNING MAWP = {governing_mawp:.1f} psi <<<")
-print("=" * 60)
+import argparse
+import csv
+import os
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+COLUMN_ALIASES = {
+    'vessel': ('vessel', 'vessel_id', 'vesselTagNumber'),
+    'component': ('component', 'componentType'),
+    'thickness': ('thickness', 'current', 't', 'currentThickness'),
+    'diameter': ('diameter', 'D', 'insideDiameter'),
+    'stress': ('stress', 'S', 'allowableStress'),
+    'efficiency': ('efficiency', 'E', 'jointEfficiency'),
+    'pressure': ('pressure', 'P', 'designPressure'),
+    'material': ('material', 'materialSpec', 'materialSpecification'),
+    'temperature': ('temperature', 'designTemperature'),
+    'cml': ('cml', 'cmlNumber', 'tml', 'legacyLocationId'),
+}
+REQUIRED_COLUMNS = ('vessel', 'component', 'thickness', 'diameter')
+RESULT_COLUMNS = ('mawp', 't_min', 'deficit', 'status')
+DEFAULT_CHUNK_ROWS = 100000
+MAX_LISTED_UNSAFE = 20
+
+
+def single_vessel_report():
+    # Given values
+    t = 0.8006  # Current actual thickness (inches) - from 2025 UT readings
+    S = 20000   # Allowable stress (psi) for SA-612 at 125F
+    E = 1.0     # Joint efficiency (full RT)
+    D = 130.26  # Inside diameter (inches)
+    R = D / 2   # Inside radius = 65.13 inches
+
+    # Shell MAWP calculation
+    MAWP_shell = (S * E * t) / (R + 0.6 * t)
+
+    print("=" * 60)
+    print("SHELL MAWP CALCULATION (ASME Section VIII)")
+    print("=" * 60)
+    print(f"Current Thickness (t): {t:.4f} in")
+    print(f"Allowable Stress (S): {S:,} psi")
+    print(f"Joint Efficiency (E): {E}")
+    print(f"Inside Diameter (D): {D} in")
+    print(f"Inside Radius (R): {R:.2f} in")
+    print()
+    print("Formula: MAWP = SEt / (R + 0.6t)")
+    print(f"MAWP = ({S} x {E} x {t:.4f}) / ({R:.2f} + 0.6 x {t:.4f})")
+    print(f"MAWP = {S * E * t:.2f} / {R + 0.6 * t:.4f}")
+    print()
+    print(f">>> CALCULATED SHELL MAWP = {MAWP_shell:.1f} psi <<<")
+    print()
+
+    # Compare to design pressure
+    design_pressure = 280
+    print(f"Design Pressure: {design_pressure} psi")
+    if MAWP_shell >= design_pressure:
+        print(f"SAFE: MAWP ({MAWP_shell:.1f} psi) >= Design Pressure ({design_pressure} psi)")
+    else:
+        print(f"UNSAFE: MAWP ({MAWP_shell:.1f} psi) < Design Pressure ({design_pressure} psi)")
+        print(f"  Vessel must be de-rated to {MAWP_shell:.0f} psi or repaired")
+
+    # Calculate minimum thickness required for 280 psi
+    t_min = (design_pressure * R) / (S * E - 0.6 * design_pressure)
+    print()
+    print(f"Minimum thickness required for {design_pressure} psi: {t_min:.4f} in")
+    print(f"Current thickness: {t:.4f} in")
+    print(f"Thickness deficit: {t_min - t:.4f} in")
+
+    # Also calculate for heads
+    print()
+    print("=" * 60)
+    print("HEAD MAWP CALCULATION (2:1 Ellipsoidal)")
+    print("=" * 60)
+    t_head = 0.5070  # Current head thickness from 2025 UT
+    # For 2:1 ellipsoidal head: MAWP = 2SEt / (D + 0.2t)
+    MAWP_head = (2 * S * E * t_head) / (D + 0.2 * t_head)
+    print(f"Current Head Thickness: {t_head:.4f} in")
+    print(f"Formula: MAWP = 2SEt / (D + 0.2t)")
+    print(f">>> HEAD MAWP = {MAWP_head:.1f} psi <<<")
+
+    # Governing MAWP
+    governing_mawp = min(MAWP_shell, MAWP_head)
+    print()
+    print("=" * 60)
+    print(f">>> GOVERNING MAWP = {governing_mawp:.1f} psi <<<")
+    print("=" * 60)
+
+
+def resolve_columns(header):
+    """Map engine inputs to positions in the header. Raises ValueError if a required column is missing."""
+    positions = {name: i for i, name in enumerate(header)}
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        index = next((positions[a] for a in aliases if a in positions), None)
+        if index is not None:
+            columns[field] = index
+    missing = [field for field in REQUIRED_COLUMNS if field not in columns]
+    if missing:
+        raise ValueError(f"missing column(s): {', '.join(missing)} (header: {', '.join(header)})")
+    return columns
+
+
+def iter_csv_chunks(path, chunk_rows):
+    """
+    Yield (header, rows) with at most chunk_rows rows per chunk.
+
+    One csv.reader reads the whole file, so quoted fields may span lines.
+    Blank lines are skipped; a row with fewer fields than the header raises
+    ValueError naming its line.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("empty file")
+        while True:
+            rows = []
+            read = 0
+            for row in islice(reader, chunk_rows):
+                read += 1
+                if not row:
+                    continue
+                if len(row) < len(header):
+                    raise ValueError(f"line {reader.line_num}: {len(row)} field(s), expected {len(header)}")
+                rows.append(row)
+            if not read:
+                return
+            if rows:
+                yield header, rows
+
+
+def iter_parquet_chunks(path, chunk_rows):
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(path)
+    header = parquet.schema_arrow.names
+    for batch in parquet.iter_batches(batch_size=chunk_rows):
+        yield header, [list(row) for row in zip(*(column.to_pylist() for column in batch.columns))]
+
+
+def iter_chunks(path, chunk_rows):
+    if Path(path).suffix.lower() == '.parquet':
+        return iter_parquet_chunks(path, chunk_rows)
+    return iter_csv_chunks(path, chunk_rows)
+
+
+def _to_float(value, default):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _float_column(rows, index, default):
+    import numpy as np
+    if index is None:
+        return np.full(len(rows), default, dtype=np.float64)
+    values = [row[index] for row in rows]
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        # Blank or non-numeric cells, e.g. "N/A", fall back to the default.
+        return np.array([_to_float(v, default) for v in values], dtype=np.float64)
+
+
+class FleetSummary:
+    """
+    Running governing MAWP per vessel, merged one chunk at a time.
+
+    Vessel names are interned to integer ids as they are first seen, so each
+    chunk is reduced with integer group-bys and state grows with the number
+    of vessels, never with the number of readings.
+    """
+
+    def __init__(self):
+        import numpy as np
+        self.ids = {}
+        self.mawp = np.empty(0)
+        self.pressure = np.empty(0)
+        self.component = []
+        self.readings = np.empty(0, dtype=np.int64)
+        self.unsafe_readings = np.empty(0, dtype=np.int64)
+
+    def intern(self, names):
+        """Return integer vessel ids for names, growing the per-vessel arrays for new vessels."""
+        import numpy as np
+        ids = self.ids
+        codes = np.array([ids.setdefault(name, len(ids)) for name in names], dtype=np.intp)
+        grow = len(ids) - self.mawp.size
+        if grow:
+            self.mawp = np.concatenate([self.mawp, np.full(grow, np.nan)])
+            self.pressure = np.concatenate([self.pressure, np.full(grow, np.nan)])
+            self.component.extend([''] * grow)
+            self.readings = np.concatenate([self.readings, np.zeros(grow, dtype=np.int64)])
+            self.unsafe_readings = np.concatenate([self.unsafe_readings, np.zeros(grow, dtype=np.int64)])
+        return codes
+
+    def update(self, codes, component, mawp, pressure, unsafe):
+        import numpy as np
+        from mawp_engine import governing_mawp
+        self.readings += np.bincount(codes, minlength=self.readings.size)
+        self.unsafe_readings += np.bincount(codes[unsafe], minlength=self.unsafe_readings.size)
+        vessels, governing, rows = governing_mawp(codes, mawp)
+        # "not >=" so a NaN running value is replaced by the first real MAWP.
+        lower = (rows >= 0) & ~(governing >= self.mawp[vessels])
+        for vessel, value, row in zip(vessels[lower].tolist(), governing[lower].tolist(), rows[lower].tolist()):
+            self.mawp[vessel] = value
+            self.pressure[vessel] = pressure[row]
+            self.component[vessel] = component[row]
+
+    def rows(self):
+        names = sorted(self.ids)
+        for name in names:
+            i = self.ids[name]
+            mawp = float(self.mawp[i])
+            pressure = float(self.pressure[i])
+            status = 'UNSAFE' if mawp < pressure else ('SAFE' if mawp >= pressure else '')
+            yield {'vessel': name, 'governing_mawp': mawp, 'governing_component': self.component[i],
+                   'design_pressure': pressure, 'status': status,
+                   'readings': int(self.readings[i]), 'unsafe_readings': int(self.unsafe_readings[i])}
+
+
+def iter_inputs(path, chunk_rows=DEFAULT_CHUNK_ROWS, stress=20000.0, efficiency=1.0, pressure=280.0,
+                materials=None):
+    """
+    Yield (header, rows, inputs) per chunk of path.
+
+    inputs holds the engine arrays for the chunk: 'vessel', 'component' and
+    'cml' (names; cml is None without a CML column), 'code' (component codes) and float64 't', 'S', 'E', 'D' and 'P'.
+    When the file has material and temperature columns but no stress column,
+    S comes from the material_stress table at materials (the default Section
+    II-D table if None).
+    """
+    import numpy as np
+    from mawp_engine import COMPONENT_CODES, UNKNOWN_COMPONENT
+
+    component_codes = {}
+    stress_table = columns = None
+    for header, rows in iter_chunks(path, chunk_rows):
+        if columns is None:
+            columns = resolve_columns(header)
+            if 'stress' not in columns and 'material' in columns and 'temperature' in columns:
+                from material_stress import load_table
+                stress_table = load_table(materials)
+        component = [str(row[columns['component']]) for row in rows]
+        for name in set(component).difference(component_codes):
+            component_codes[name] = COMPONENT_CODES.get(name.strip().lower(), UNKNOWN_COMPONENT)
+        if stress_table is not None:
+            # lookup() resolves each distinct spec once (StressTable.codes runs np.unique over the column)
+            material = np.array([str(row[columns['material']]) for row in rows])
+            S = stress_table.lookup(material, _float_column(rows, columns['temperature'], np.nan))
+        else:
+            S = _float_column(rows, columns.get('stress'), stress)
+        yield header, rows, {
+            'vessel': [str(row[columns['vessel']]) for row in rows],
+            'component': component,
+            'cml': [str(row[columns['cml']]) for row in rows] if 'cml' in columns else None,
+            'code': np.array([component_codes[name] for name in component], dtype=np.int8),
+            't': _float_column(rows, columns['thickness'], np.nan),
+            'S': S,
+            'E': _float_column(rows, columns.get('efficiency'), efficiency),
+            'D': _float_column(rows, columns['diameter'], np.nan),
+            'P': _float_column(rows, columns.get('pressure'), pressure),
+        }
+
+
+def evaluate_stream(path, output=None, chunk_rows=DEFAULT_CHUNK_ROWS, stress=20000.0, efficiency=1.0,
+                    pressure=280.0, materials=None):
+    """
+    Evaluate every reading in path chunk by chunk.
+
+    Rows are written to output (CSV, input columns plus RESULT_COLUMNS) as each
+    chunk finishes. Returns (summary, rows, seconds).
+    """
+    import numpy as np
+    from mawp_engine import evaluate
+
+    summary = FleetSummary()
+    out_file = writer = None
+    total = 0
+    started = time.perf_counter()
+    try:
+        for header, rows, inputs in iter_inputs(path, chunk_rows, stress, efficiency, pressure, materials):
+            if output and out_file is None:
+                out_file = open(output, 'w', newline='', encoding='utf-8')
+                writer = csv.writer(out_file)
+                writer.writerow(list(header) + list(RESULT_COLUMNS))
+            P = inputs['P']
+            result = evaluate(t=inputs['t'], S=inputs['S'], E=inputs['E'], D=inputs['D'], component=inputs['code'],
+                              P=P)
+            mawp = result['mawp']
+            unsafe = mawp < P
+            summary.update(summary.intern(inputs['vessel']), inputs['component'], mawp, P, unsafe)
+
+            if writer is not None:
+                status = np.where(unsafe, 'UNSAFE', np.where(mawp >= P, 'SAFE', '')).tolist()
+                values = zip(mawp.tolist(), result['t_min'].tolist(), result['deficit'].tolist(), status)
+                writer.writerows(list(row) + [f"{m:.1f}", f"{t:.4f}", f"{d:.4f}", s]
+                                 for row, (m, t, d, s) in zip(rows, values))
+            total += len(rows)
+    finally:
+        if out_file is not None:
+            out_file.close()
+    return summary, total, time.perf_counter() - started
+
+
+def write_summary(summary, path):
+    fieldnames = ['vessel', 'governing_mawp', 'governing_component', 'design_pressure', 'status',
+                  'readings', 'unsafe_readings']
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(summary.rows())
+
+
+def run_sweep(args):
+    """Load every reading, run the Monte Carlo sweep and report vessels whose SAFE/UNSAFE call is uncertain."""
+    import numpy as np
+    from mawp_sweep import prepare, summarize, sweep
+
+    columns = {name: [] for name in ('vessel', 'code', 't', 'S', 'E', 'D', 'P')}
+    for _, _, inputs in iter_inputs(args.readings, args.chunk_rows, args.stress, args.efficiency, args.pressure,
+                                       args.materials):
+        for name, values in columns.items():
+            values.append(np.asarray(inputs[name]))
+    fleet = prepare(*(np.concatenate(values) if values else np.empty(0) for values in columns.values()))
+
+    started = time.perf_counter()
+    governing = sweep(fleet, args.sweep, ut_sigma=args.ut_sigma, ca_max=args.ca_max, stress_sigma=args.stress_sigma,
+                      seed=args.seed, workers=args.workers)
+    seconds = time.perf_counter() - started
+    rows = list(summarize(fleet, governing, confidence=args.confidence))
+
+    if args.summary:
+        with open(args.summary, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ['vessel'])
+            writer.writeheader()
+            writer.writerows({name: round(value, 4) if isinstance(value, float) else value
+                              for name, value in row.items()} for row in rows)
+    uncertain = [row for row in rows if 0 < row['p_unsafe'] < 1]
+    for row in uncertain[:MAX_LISTED_UNSAFE]:
+        print(f"UNCERTAIN: {row['vessel']} P(UNSAFE) = {row['p_unsafe']:.1%}, governing MAWP "
+              f"{row['p05_mawp']:.1f}-{row['p95_mawp']:.1f} psi (90%), rated {row['rated_pressure']:.0f} psi "
+              f"at {args.confidence:.0%}")
+    if len(uncertain) > MAX_LISTED_UNSAFE:
+        print(f"... and {len(uncertain) - MAX_LISTED_UNSAFE:,} more uncertain vessel(s)"
+              + (f", see {args.summary}" if args.summary else ""))
+    unsafe = sum(row['p_unsafe'] >= 0.5 for row in rows)
+    print(f"{args.sweep:,} trials x {len(rows):,} vessels ({fleet['t'].size:,} readings): {unsafe:,} likely UNSAFE, "
+          f"{len(uncertain):,} uncertain in {seconds:.2f}s")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ASME VIII-1 shell/head MAWP for one vessel or a readings file.")
+    parser.add_argument('readings', nargs='?', help="CSV or Parquet readings file (omit for the worked example)")
+    parser.add_argument('-o', '--output', help="Per-reading results CSV")
+    parser.add_argument('--summary', help="Per-vessel governing MAWP CSV")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"Rows evaluated per chunk (default: {DEFAULT_CHUNK_ROWS})")
+    parser.add_argument('--stress', type=float, default=20000.0, help="Allowable stress S when not a column (psi)")
+    parser.add_argument('--efficiency', type=float, default=1.0, help="Joint efficiency E when not a column")
+    parser.add_argument('--pressure', type=float, default=280.0, help="Design pressure P when not a column (psi)")
+    sweep = parser.add_argument_group("Monte Carlo sweep (see mawp_sweep.py)")
+    sweep.add_argument('--sweep', type=int, metavar='TRIALS', help="Run TRIALS uncertainty trials per vessel")
+    sweep.add_argument('--ut-sigma', type=float, default=0.005, help="UT thickness error std. dev. (in, default: 0.005)")
+    sweep.add_argument('--ca-max', type=float, default=0.0, help="Corrosion allowance drawn from [0, CA_MAX] (in)")
+    sweep.add_argument('--stress-sigma', type=float, default=0.0, help="Relative std. dev. of allowable stress")
+    sweep.add_argument('--confidence', type=float, default=0.95, help="Confidence for rated pressure (default: 0.95)")
+    sweep.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+    sweep.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                       help="Worker processes (default: CPU count)")
+    parser.add_argument('--materials', help="Allowable stress table for material/temperature columns "
+                                            "(default: server/asmeMaterialDatabase.ts)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.readings is None:
+        single_vessel_report()
+        return 0
+    if args.sweep:
+        try:
+            return run_sweep(args)
+        except ValueError as e:
+            print(f"{args.readings}: {e}")
+            return 1
+
+    try:
+        summary, rows, seconds = evaluate_stream(args.readings, args.output, chunk_rows=args.chunk_rows,
+                                                 stress=args.stress, efficiency=args.efficiency,
+                                                 pressure=args.pressure, materials=args.materials)
+    except ValueError as e:
+        print(f"{args.readings}: {e}")
+        return 1
+    if args.summary:
+        write_summary(summary, args.summary)
+
+    unsafe = [row for row in summary.rows() if row['status'] == 'UNSAFE']
+    for row in unsafe[:MAX_LISTED_UNSAFE]:
+        print(f"UNSAFE: {row['vessel']} governing MAWP {row['governing_mawp']:.1f} psi "
+              f"({row['governing_component']}) < {row['design_pressure']:g} psi")
+    if len(unsafe) > MAX_LISTED_UNSAFE:
+        print(f"... and {len(unsafe) - MAX_LISTED_UNSAFE:,} more UNSAFE vessel(s)"
+              + (f", see {args.summary}" if args.summary else ""))
+    rate = rows / seconds if seconds else 0.0
+    print(f"{rows:,} readings, {len(summary.ids):,} vessels, {len(unsafe):,} UNSAFE "
+          f"in {seconds:.2f}s ({rate:,.0f} rows/sec)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
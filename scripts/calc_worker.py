@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Long-lived JSON-lines worker for MAWP, t_min, allowable stress and extraction requests.
+
+Usage:
+    python scripts/calc_worker.py                          # requests on stdin, results on stdout
+    python scripts/calc_worker.py --socket /tmp/calc.sock  # any number of clients on a Unix socket
+
+Each input line is one request object, or a JSON array of them; one result
+line is written per request, in order, and flushed after each input line.
+Every request may carry an "id" that is echoed back.
+
+    {"id": 1, "op": "mawp", "t": [0.8006, 0.507], "S": 20000, "E": 1.0, "D": 130.26,
+     "component": ["shell", "2:1 ellipsoidal"], "P": 280}
+      -> {"id": 1, "ok": true, "mawp": [244.05, 155.57], "t_min": [...], "deficit": [...]}
+    {"op": "t_min", ...}       same inputs without t, P required -> {"t_min": ...}
+    {"op": "stress", "material": ["SA-516-70"], "temperature": [650]}
+      -> {"ok": true, "stress": [20000.0]}
+    {"op": "extract", "pdf": "report.pdf", "match": ["CML"]}
+      -> {"ok": true, "pages": [{"page": 3, "text": "..."}], "failed_pages": [], "cached_pages": 3}
+    {"op": "ping"}
+
+Scalars in give scalars out; NaN and infinite results are written as null. numpy, the
+engines and PyPDF2 are imported once at startup, and the extraction cache and
+stress tables stay open, so a request costs only its own work. Failures are
+reported as {"ok": false, "error": "..."} and the worker keeps running.
+"""
+
+import argparse
+import json
+import math
+import os
+import signal
+import socketserver
+import sys
+import time
+
+import numpy as np
+
+import mawp_engine
+
+try:
+    import extract
+    from extraction_cache import ExtractionCache
+except ImportError:  # PyPDF2 not installed: everything but "extract" still works
+    extract = None
+
+
+def _values(array, scalar):
+    values = [v if math.isfinite(v) else None for v in np.asarray(array, dtype=np.float64).reshape(-1).tolist()]
+    return values[0] if scalar else values
+
+
+class Worker:
+    """Dispatches request dicts to the engines, keeping caches warm between requests."""
+
+    def __init__(self, cache_dir=None, use_cache=True):
+        self.cache = None
+        if extract is not None and use_cache:
+            self.cache = ExtractionCache(cache_dir or extract.DEFAULT_CACHE_DIR, extract.EXTRACTOR_VERSION)
+        self.patterns = {}
+        self.handlers = {'mawp': self.mawp, 't_min': self.t_min, 'stress': self.stress,
+                         'extract': self.extract, 'ping': self.ping}
+
+    def handle(self, request):
+        """Return the result dict for one request dict."""
+        response = {'id': request.get('id')} if isinstance(request, dict) and 'id' in request else {}
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            handler = self.handlers.get(request.get('op'))
+            if handler is None:
+                raise ValueError(f"unknown op {request.get('op')!r}; expected one of {', '.join(self.handlers)}")
+            response.update(handler(request))
+            response['ok'] = True
+        except Exception as e:
+            response.update(ok=False, error=f"{type(e).__name__}: {e}")
+        return response
+
+    def handle_line(self, line):
+        """Return the result lines for one input line (one request or a JSON array of them)."""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return [json.dumps({'ok': False, 'error': f"invalid JSON: {e}"})]
+        requests = request if isinstance(request, list) else [request]
+        return [self.handle_json(r) for r in requests]
+
+    def handle_json(self, request):
+        """Return the result line for one request; a result that cannot be written becomes an error line."""
+        response = self.handle(request)
+        try:
+            return json.dumps(response, allow_nan=False)
+        except (TypeError, ValueError) as e:
+            error = {'id': response['id']} if 'id' in response else {}
+            error.update(ok=False, error=f"unserializable result: {type(e).__name__}: {e}")
+            return json.dumps(error)
+
+    def ping(self, request):
+        return {'pid': os.getpid(), 'time': time.time()}
+
+    def mawp(self, request):
+        inputs = [request.get(name) for name in ('t', 'S', 'E', 'D', 'component', 'P', 'L', 'r')]
+        scalar = all(np.ndim(value) == 0 for value in inputs)
+        t, S, E, D, component, P, L, r = inputs
+        result = mawp_engine.evaluate(np.nan if t is None else t, S, 1.0 if E is None else E, D,
+                                      component or 'shell', P=P, L=L, r=r)
+        return {name: _values(values, scalar) for name, values in result.items()}
+
+    def t_min(self, request):
+        if request.get('P') is None:
+            raise ValueError("t_min requires P")
+        return {'t_min': self.mawp(request)['t_min']}
+
+    def stress(self, request):
+        from material_stress import load_table
+        scalar = np.ndim(request['material']) == 0 and np.ndim(request['temperature']) == 0
+        table = load_table(request.get('table'))
+        return {'stress': _values(table.lookup(request['material'], request['temperature']), scalar)}
+
+    def extract(self, request):
+        if extract is None:
+            raise RuntimeError("extraction needs PyPDF2")
+        pattern = None
+        if request.get('match'):
+            key = tuple(request['match'])
+            pattern = self.patterns.get(key)
+            if pattern is None:
+                pattern = self.patterns[key] = extract.compile_patterns(key)
+        stats = {}
+        pages = [{'page': number, 'text': text}
+                 for number, text in extract.iter_pages(request['pdf'], cache=self.cache, stats=stats, pattern=pattern)]
+        return {'pages': pages, 'page_count': stats.get('pages'), 'failed_pages': stats['failed_pages'],
+                'cached_pages': stats['cached_pages']}
+
+
+def serve_stream(worker, stream_in, stream_out):
+    """Answer requests line by line, flushing after each line so the caller never waits on a buffer."""
+    for line in stream_in:
+        if not line.strip():
+            continue
+        stream_out.write(''.join(result + '\n' for result in worker.handle_line(line)))
+        stream_out.flush()
+
+
+def serve_socket(worker, path):
+    """Serve JSON lines on a Unix socket, one thread per connection."""
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                self.wfile.write(''.join(r + '\n' for r in worker.handle_line(line)).encode('utf-8'))
+
+    if os.path.exists(path):
+        os.unlink(path)
+    # Let a plain `kill` run the finally block below so the socket file is removed.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        print(f"Listening on {path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Persistent JSON-lines calculation and extraction worker.")
+    parser.add_argument('--socket', metavar='PATH', help="Listen on a Unix socket instead of stdin/stdout")
+    parser.add_argument('--cache-dir', help="Extraction cache directory (default: extract.py's)")
+    parser.add_argument('--no-cache', action='store_true', help="Extract PDF pages without the extraction cache")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    worker = Worker(cache_dir=args.cache_dir, use_cache=not args.no_cache)
+    if args.socket:
+        serve_socket(worker, args.socket)
+    else:
+        serve_stream(worker, sys.stdin, sys.stdout)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Bulk CML correlation across inspection years.
+
+Usage:
+    python scripts/cml_correlation.py readings_2017.csv readings_2020.csv readings_2025.csv -o history.csv
+    python scripts/corrosion_engine.py history.csv --t-min 0.9195
+
+    from cml_correlation import correlate
+    result = correlate(rows)                       # dicts with vessel, component, cml, location, date, thickness
+    cmls, surveys, thickness = corrosion_engine.pivot(result.keys(), dates, readings)
+
+CML numbers change between reports while the physical location does not, so
+every reading is assigned to a track: one physical CML followed through every
+survey. Surveys of a vessel are visited in date order and a survey's readings
+are matched against the vessel's open tracks through hash indexes, one pass
+per key kind in order of confidence:
+
+    station     station key equal                                     1.0
+    exact       component and normalized location equal               1.0
+    angular     component, base location and angle equal ("10-45")    0.95
+    cml         component and CML number equal, axial positions       0.9
+                within --axial-window when both are known
+
+Every reading of the survey gets its chance at a stronger key before any
+weaker one is tried, so a renumbered CML cannot take a track that another
+reading matches exactly.
+
+A track is indexed under the keys of every reading it has, so a report that
+goes back to an older numbering still matches. Readings left over fall back
+to the fuzzy location similarity of locationMatcher.ts (containment ratio or
+Levenshtein, x1.1 for the same component, at least --min-confidence),
+compared only within a block: the same vessel and component, the same angle
+when both sides have one, and an axial position (slice number or feet) within
+--axial-window. Tracks are bucketed by axial position in --axial-window
+steps, so a reading is scored only against its own and the neighbouring
+buckets, not every track of its component. A track takes at most one reading per survey; readings that
+match nothing start a new track named after their own CML.
+
+Normalization follows normalizeLocation(): case, quote styles, ft/feet,
+in/inch and o'clock spellings, and whitespace. Output is one row per reading,
+in the corrosion_engine.py history shape (dates as YYYY-MM-DD), with cml set to the track's name
+(its CML number in the first survey) and source_cml, match and confidence
+columns recording how it was paired.
+"""
+
+import argparse
+import csv
+import math
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+from readings_store import NO_DATE, parse_date
+
+MATCH_CONFIDENCE = {'station': 1.0, 'exact': 1.0, 'angular': 0.95, 'cml': 0.9}
+DEFAULT_MIN_CONFIDENCE = 0.7
+DEFAULT_AXIAL_WINDOW = 1.0
+COLUMN_ALIASES = {
+    'vessel': ('vessel', 'vessel_id', 'vesselTagNumber'),
+    'component': ('component', 'componentType'),
+    'cml': ('cml', 'cmlNumber', 'tml', 'legacyLocationId'),
+    'location': ('location',),
+    'date': ('date', 'inspectionDate', 'readingDate', 'surveyDate'),
+    'thickness': ('thickness', 'current', 't', 'currentThickness'),
+    'station': ('station_key', 'stationKey'),
+    'angle': ('angle', 'angularPosition'),
+}
+OUTPUT_COLUMNS = ['vessel', 'component', 'cml', 'location', 'date', 'thickness', 'source_cml', 'match', 'confidence']
+
+_QUOTES = str.maketrans({'‘': "'", '’': "'", '`': "'", '“': '"', '”': '"'})
+_FEET = re.compile(r'\s*\b(?:ft|feet)\b\s*')
+_INCHES = re.compile(r'\s*\b(?:in|inch|inches)\b\s*')
+_OCLOCK = re.compile(r"o'?\s*clock")
+_SPACES = re.compile(r'\s+')
+_SLICE_ANGLE = re.compile(r'^(\d+)-(\d+)$')
+_AXIAL = re.compile(r"^(\d+(?:\.\d+)?)\s*'?")
+_HOUR = re.compile(r'\b(\d{1,2})\s*oclock')
+_DEGREES = re.compile(r'\b(\d{1,3})\s*°')
+
+
+def normalize_location(location):
+    """Comparable form of a location, as normalizeLocation() in locationMatcher.ts."""
+    if not location:
+        return ''
+    text = location.strip().lower().translate(_QUOTES)
+    text = _INCHES.sub('"', _FEET.sub("'", text))
+    text = _OCLOCK.sub('oclock', text)
+    return _SPACES.sub(' ', text).strip()
+
+
+def parse_location(normalized):
+    """(base location, angle in degrees or None, axial position or None) of a normalized location."""
+    match = _SLICE_ANGLE.match(normalized)
+    if match:
+        return match.group(1), int(match.group(2)), float(match.group(1))
+    angle = None
+    hour = _HOUR.search(normalized)
+    if hour:
+        angle = int(hour.group(1)) % 12 * 30
+    else:
+        degrees = _DEGREES.search(normalized)
+        if degrees:
+            angle = int(degrees.group(1)) % 360
+    axial = _AXIAL.match(normalized)
+    return normalized, angle, float(axial.group(1)) if axial else None
+
+
+def levenshtein(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(previous[j - 1] if ca == cb else 1 + min(previous[j], current[j - 1], previous[j - 1]))
+        previous = current
+    return previous[-1]
+
+
+def location_similarity(a, b):
+    """Similarity of two normalized locations in [0, 1], as calculateLocationSimilarity()."""
+    if a == b:
+        return 1.0
+    if a in b or b in a:
+        return min(len(a), len(b)) / max(len(a), len(b))
+    return 1 - levenshtein(a, b) / max(len(a), len(b))
+
+
+class _Reading:
+    __slots__ = ('index', 'row', 'vessel', 'component', 'cml', 'location', 'base', 'angle', 'axial', 'station')
+
+    def __init__(self, index, row):
+        self.index, self.row = index, row
+        self.vessel = (row.get('vessel') or '').strip()
+        self.component = normalize_location(row.get('component') or '')
+        self.cml = (row.get('cml') or '').strip().upper()
+        self.location = normalize_location(row.get('location') or '')
+        self.base, self.angle, self.axial = parse_location(self.location)
+        if row.get('angle') not in (None, ''):
+            self.angle = int(float(row['angle'])) % 360
+        self.station = (row.get('station') or '').strip()
+
+    def keys(self):
+        """(match type, hash key) pairs this reading can be found under, strongest first."""
+        if self.station:
+            yield 'station', self.station
+        if self.location:
+            yield 'exact', (self.component, self.location, self.angle)
+            if self.angle is not None:
+                yield 'angular', (self.component, self.base, self.angle)
+        if self.cml:
+            yield 'cml', (self.component, self.cml)
+
+
+class Correlation:
+    """Track assignment for every input reading, in input order."""
+
+    def __init__(self, rows, track, names, match, confidence):
+        self.rows, self.track, self.names = rows, track, names
+        self.match, self.confidence = match, confidence
+
+    def keys(self):
+        """'vessel\\ttrack name' per reading, usable as corrosion_engine.pivot() keys."""
+        return [f"{row.get('vessel') or ''}\t{self.names[t]}" for row, t in zip(self.rows, self.track)]
+
+    def summary(self):
+        return Counter(self.match)
+
+
+def correlate(rows, min_confidence=DEFAULT_MIN_CONFIDENCE, axial_window=DEFAULT_AXIAL_WINDOW):
+    """
+    Assign every reading to a track. rows are dicts with vessel, component, cml,
+    location and date (YYYY-MM-DD or MM/DD/YYYY; other labels sort after
+    dated surveys) and optional station and angle.
+    """
+    rows = list(rows)
+    track = [-1] * len(rows)
+    match = [''] * len(rows)
+    confidence = [0.0] * len(rows)
+    names = []
+
+    surveys = defaultdict(lambda: defaultdict(list))
+    for i, row in enumerate(rows):
+        reading = _Reading(i, row)
+        surveys[reading.vessel][row.get('date') or ''].append(reading)
+
+    for vessel, by_date in surveys.items():
+        index = {kind: defaultdict(list) for kind in MATCH_CONFIDENCE}
+        # Fuzzy fallback blocks: (component, angle) -> axial bucket -> tracks (dicts as ordered sets)
+        blocks = defaultdict(lambda: defaultdict(dict))
+        angles = defaultdict(dict)          # component -> angles with a block
+        placed = {}                         # track -> (block, bucket) of its latest reading
+        latest = {}                         # track -> its most recent reading
+        used_names = set()
+
+        def add(t, reading):
+            for kind, key in reading.keys():
+                candidates = index[kind][key]
+                if t not in candidates:
+                    candidates.append(t)
+            place = ((reading.component, reading.angle), _bucket(reading.axial, axial_window))
+            if placed.get(t) != place:
+                if t in placed:
+                    block, bucket = placed[t]
+                    del blocks[block][bucket][t]
+                blocks[place[0]][place[1]][t] = None
+                angles[reading.component][reading.angle] = None
+                placed[t] = place
+            latest[t] = reading
+
+        for survey in sorted(by_date, key=lambda label: (parse_date(label), label)):
+            taken = set()
+            pending = by_date[survey]
+            for kind in MATCH_CONFIDENCE:
+                unmatched = []
+                for reading in pending:
+                    key = dict(reading.keys()).get(kind)
+                    t = None if key is None else next(
+                        (t for t in index[kind].get(key, ())
+                         if t not in taken and (kind != 'cml' or _axial_close(reading, latest[t], axial_window))),
+                        None)
+                    if t is None:
+                        unmatched.append(reading)
+                        continue
+                    taken.add(t)
+                    _assign(reading, t, kind, MATCH_CONFIDENCE[kind], track, match, confidence)
+                pending = unmatched
+
+            for reading in pending:
+                best, best_score = None, 0.0
+                if reading.location:
+                    for t in _candidates(blocks, angles, reading, axial_window):
+                        if t in taken:
+                            continue
+                        other = latest[t]
+                        if reading.angle is not None and other.angle is not None and reading.angle != other.angle:
+                            continue
+                        if not _axial_close(reading, other, axial_window):
+                            continue
+                        # Blocks share a component, so the 1.1 same-component factor always applies.
+                        score = min(1.0, location_similarity(reading.location, other.location) * 1.1)
+                        if score > best_score or (score == best_score and best is not None and t < best):
+                            best, best_score = t, score
+                if best is not None and best_score >= min_confidence:
+                    taken.add(best)
+                    _assign(reading, best, 'fuzzy', round(best_score, 3), track, match, confidence)
+                    continue
+                t = len(names)
+                names.append(_unique_name(reading, used_names))
+                taken.add(t)
+                _assign(reading, t, 'baseline' if not latest else 'new', 1.0, track, match, confidence)
+
+            for reading in by_date[survey]:
+                add(track[reading.index], reading)
+
+    return Correlation(rows, track, names, match, confidence)
+
+
+def _bucket(axial, axial_window):
+    """Axial bucket of a position: readings within axial_window are in the same or a neighbouring bucket."""
+    if axial is None:
+        return None
+    return math.floor(axial / axial_window) if axial_window > 0 else axial
+
+
+def _axial_close(reading, other, axial_window):
+    """True unless both readings have an axial position and they are more than axial_window apart."""
+    return reading.axial is None or other.axial is None or abs(reading.axial - other.axial) <= axial_window
+
+
+def _candidates(blocks, angles, reading, axial_window):
+    """
+    Tracks worth comparing with a reading: the same component; the same angle
+    or none (any angle when the reading has none); and an axial bucket within
+    one of the reading's, or no axial position on either side.
+    """
+    angle_keys = list(angles.get(reading.component, ())) if reading.angle is None else (reading.angle, None)
+    bucket = _bucket(reading.axial, axial_window)
+    for angle in angle_keys:
+        by_bucket = blocks.get((reading.component, angle))
+        if not by_bucket:
+            continue
+        if bucket is None:
+            for tracks in list(by_bucket.values()):
+                yield from tracks
+        else:
+            for key in (bucket - 1, bucket, bucket + 1, None):
+                yield from by_bucket.get(key, ())
+
+
+def _assign(reading, t, kind, score, track, match, confidence):
+    track[reading.index], match[reading.index], confidence[reading.index] = t, kind, score
+
+
+def _unique_name(reading, used):
+    name = (reading.row.get('cml') or '').strip() or str(reading.index)
+    base, n = name, 1
+    while name in used:
+        n += 1
+        name = f"{base}#{n}"
+    used.add(name)
+    return name
+
+
+def _iso_date(label):
+    day = parse_date(label)
+    return label if day == NO_DATE else (date(1970, 1, 1) + timedelta(days=day)).isoformat()
+
+
+def read_rows(path, defaults=None):
+    """Rows of a readings CSV as dicts keyed by COLUMN_ALIASES fields; defaults fill missing columns."""
+    defaults = defaults or {}
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        positions = {name: i for i, name in enumerate(next(reader))}
+        columns = {field: next((positions[a] for a in aliases if a in positions), None)
+                   for field, aliases in COLUMN_ALIASES.items()}
+        missing = [field for field in ('cml', 'date', 'thickness') if columns[field] is None and field not in defaults]
+        if missing:
+            raise ValueError(f"{path}: missing column(s): {', '.join(missing)}")
+        for values in reader:
+            if not values:
+                continue
+            row = dict(defaults)
+            for field, index in columns.items():
+                if index is not None and index < len(values):
+                    row[field] = values[index]
+            yield row
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Correlate CMLs across inspection years into one reading history.")
+    parser.add_argument('inputs', nargs='+', help="Readings CSVs (vessel, component, cml, location, date, thickness)")
+    parser.add_argument('-o', '--output', default='history.csv', help="Output history CSV (default: history.csv)")
+    parser.add_argument('--vessel', help="Vessel for files without a vessel column")
+    parser.add_argument('--date', help="Survey date for files without a date column")
+    parser.add_argument('--min-confidence', type=float, default=DEFAULT_MIN_CONFIDENCE,
+                        help=f"Minimum fuzzy location similarity (default: {DEFAULT_MIN_CONFIDENCE})")
+    parser.add_argument('--axial-window', type=float, default=DEFAULT_AXIAL_WINDOW,
+                        help=f"Largest axial distance compared by the fuzzy fallback (default: {DEFAULT_AXIAL_WINDOW:g})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    defaults = {field: getattr(args, field) for field in ('vessel', 'date') if getattr(args, field)}
+    try:
+        rows = [row for path in args.inputs for row in read_rows(path, defaults)]
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    result = correlate(rows, min_confidence=args.min_confidence, axial_window=args.axial_window)
+
+    with open(args.output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(OUTPUT_COLUMNS)
+        for row, t, kind, score in zip(rows, result.track, result.match, result.confidence):
+            writer.writerow([row.get('vessel', ''), row.get('component', ''), result.names[t], row.get('location', ''),
+                             _iso_date(row.get('date') or ''), row.get('thickness', ''), row.get('cml', ''), kind, score])
+
+    counts = result.summary()
+    print(f"{len(rows):,} readings on {len(result.names):,} tracks in {time.perf_counter() - started:.2f}s "
+          f"({', '.join(f'{kind} {n:,}' for kind, n in counts.most_common())}) -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
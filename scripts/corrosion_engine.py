@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Vectorized API 510 corrosion rate, remaining life and inspection interval engine.
+
+Usage:
+    python scripts/corrosion_engine.py history.csv -o remaining_life.csv --t-min 0.9195
+    python scripts/corrosion_engine.py fleet.readings --t-min 0.9195     # readings_store.py store
+
+    from corrosion_engine import evaluate, pivot
+    cmls, dates, thickness = pivot(cml_keys, reading_dates, readings)
+    result = evaluate(thickness, dates, t_min=t_min, nominal=nominal, in_service='1998-06-01')
+
+Readings are a 2-D array, one row per CML and one column per survey, with NaN
+where a CML was not read. Survey dates are datetime64 values, either one per
+column or one per cell. Every quantity is computed for all CMLs at once:
+
+    CR_LT = (t_first - t_current) / years between first and current reading
+            (t_nominal and the in-service date replace the first reading when given)
+    CR_ST = (t_previous - t_current) / years between the last two readings
+    rate  = max(CR_LT, CR_ST), rates from apparent growth are 0
+    RL    = (t_current - t_min) / rate
+    interval = RL if RL < 2, 2 if RL <= 4, else min(RL / 2, 10) years
+
+as in lockedCalculationEngine.ts. A CML without a positive rate has NaN
+remaining life and a 10 year interval ("insufficient data", never unlimited
+life). The CSV form has one row per reading with vessel, cml, date and
+thickness columns and optional component, t_min and nominal columns; a
+readings_store.py store directory is read through its memory map instead.
+"""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+DAYS_PER_YEAR = 365.25
+MAX_INTERVAL_YEARS = 10.0
+
+
+def _years(start, end):
+    return (end - start).astype('timedelta64[D]').astype(np.float64) / DAYS_PER_YEAR
+
+
+def _last_valid(valid):
+    """Column index of the last True in each row, or -1."""
+    n = valid.shape[1]
+    last = n - 1 - np.argmax(valid[:, ::-1], axis=1)
+    return np.where(valid.any(axis=1), last, -1)
+
+
+def _take(values, column):
+    rows = np.arange(values.shape[0])
+    return np.where(column >= 0, values[rows, np.maximum(column, 0)], _missing(values.dtype))
+
+
+def _missing(dtype):
+    return np.datetime64('NaT') if dtype.kind == 'M' else np.nan
+
+
+def pivot(keys, dates, thickness):
+    """
+    Turn long-format readings into (keys, dates, thickness) with one row per key.
+
+    keys may be any array (e.g. CML ids, or vessel/CML pairs joined into one
+    string); dates are converted to datetime64[D]. Returns the sorted distinct
+    keys, the sorted distinct survey dates and a (keys x dates) float64 array.
+    A repeated (key, date) keeps the minimum reading, as t act is reported.
+    """
+    keys = np.asarray(keys)
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    thickness = np.asarray(thickness, dtype=np.float64)
+    unique_keys, row = np.unique(keys, return_inverse=True)
+    unique_dates, column = np.unique(dates, return_inverse=True)
+    table = np.full((unique_keys.size, unique_dates.size), np.inf)
+    np.fmin.at(table, (row.reshape(-1), column.reshape(-1)), thickness)
+    table[np.isinf(table)] = np.nan
+    return unique_keys, unique_dates, table
+
+
+def corrosion_rates(thickness, dates, nominal=None, in_service=None):
+    """
+    Long-term and short-term corrosion rates (in/yr) for every CML.
+
+    thickness is (n_cml, n_surveys); dates is (n_surveys,) or the same shape as
+    thickness. nominal and in_service together replace the first reading for
+    the long-term rate wherever both are known. Returns a dict of per-CML
+    arrays: 'current', 'current_date', 'cr_lt', 'cr_st' and 'rate' (the
+    governing, larger of the two).
+    """
+    thickness = np.atleast_2d(np.asarray(thickness, dtype=np.float64))
+    dates = np.broadcast_to(np.asarray(dates, dtype='datetime64[D]'), thickness.shape)
+    valid = ~np.isnan(thickness) & ~np.isnat(dates)
+
+    last = _last_valid(valid)
+    before_last = valid & (np.arange(valid.shape[1]) < np.where(last >= 0, last, 0)[:, None])
+    previous = _last_valid(before_last)
+    first = np.where(valid.any(axis=1), np.argmax(valid, axis=1), -1)
+
+    current, current_date = _take(thickness, last), _take(dates, last)
+    start, start_date = _take(thickness, first), _take(dates, first)
+    if nominal is not None and in_service is not None:
+        nominal = np.broadcast_to(np.asarray(nominal, dtype=np.float64), current.shape)
+        in_service = np.broadcast_to(np.asarray(in_service, dtype='datetime64[D]'), current.shape)
+        use_nominal = ~np.isnan(nominal) & ~np.isnat(in_service)
+        start = np.where(use_nominal, nominal, start)
+        start_date = np.where(use_nominal, in_service, start_date)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lt_years = _years(start_date, current_date)
+        cr_lt = np.where(lt_years > 0, (start - current) / lt_years, np.nan)
+        st_years = _years(_take(dates, previous), current_date)
+        cr_st = np.where(st_years > 0, (_take(thickness, previous) - current) / st_years, np.nan)
+    # Apparent growth (measurement error or repair) gives a rate of 0, not a negative rate.
+    cr_lt = np.where(cr_lt < 0, 0.0, cr_lt)
+    cr_st = np.where(cr_st < 0, 0.0, cr_st)
+    return {'current': current, 'current_date': current_date, 'cr_lt': cr_lt, 'cr_st': cr_st,
+            'rate': np.fmax(cr_lt, cr_st)}
+
+
+def remaining_life(current, t_min, rate):
+    """(t_current - t_min) / rate in years, NaN where the rate is missing or zero, 0 once below t_min."""
+    current, t_min, rate = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (current, t_min, rate)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        life = np.where(rate > 0, (current - t_min) / rate, np.nan)
+    return np.where(life < 0, 0.0, life)
+
+
+def inspection_interval(life):
+    """API 510 interval in years for each remaining life; NaN life (no rate) gets the 10 year maximum."""
+    life = np.asarray(life, dtype=np.float64)
+    interval = np.select([life < 2, life <= 4], [life, 2.0], np.minimum(life / 2, MAX_INTERVAL_YEARS))
+    return np.where(np.isnan(life), MAX_INTERVAL_YEARS, np.maximum(interval, 0.0))
+
+
+def evaluate(thickness, dates, t_min, nominal=None, in_service=None):
+    """
+    Corrosion rates, remaining life and next inspection date for every CML.
+
+    t_min broadcasts against the CMLs, e.g. mawp_engine.evaluate(...)['t_min']
+    for each CML's component. Returns the corrosion_rates() dict plus
+    'remaining_life', 'interval' (years) and 'next_inspection' (datetime64[D],
+    current reading date + interval).
+    """
+    result = corrosion_rates(thickness, dates, nominal=nominal, in_service=in_service)
+    life = remaining_life(result['current'], t_min, result['rate'])
+    interval = inspection_interval(life)
+    result['remaining_life'] = life
+    result['interval'] = interval
+    result['next_inspection'] = result['current_date'] + np.round(interval * DAYS_PER_YEAR).astype('timedelta64[D]')
+    return result
+
+
+def read_history(path):
+    """
+    Read a long-format readings CSV into (keys, dates, thickness, t_min, nominal) arrays.
+
+    Keys are 'vessel\tcomponent\tcml', as ReadingsStore.keys() gives, so the
+    same CML number on two components of a vessel stays two CMLs. Dates are
+    parsed with readings_store.parse_date (YYYY-MM-DD or MM/DD/YYYY); an
+    unparseable date becomes NaT and that reading is ignored.
+    """
+    from readings_store import date_days, to_datetime64
+
+    vessels, components, cmls, dates, thickness, t_min, nominal = [], [], [], [], [], [], []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            vessels.append(row.get('vessel', ''))
+            components.append(row.get('component', ''))
+            cmls.append(row['cml'])
+            dates.append(row['date'])
+            thickness.append(_float(row.get('thickness') or row.get('current')))
+            t_min.append(_float(row.get('t_min')))
+            nominal.append(_float(row.get('nominal')))
+    keys = np.array([f"{vessel}\t{component}\t{cml}" for vessel, component, cml in zip(vessels, components, cmls)])
+    return keys, to_datetime64(date_days(dates)), np.array(thickness), np.array(t_min), np.array(nominal)
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _per_key(keys, unique_keys, values):
+    """Smallest non-NaN value of a per-reading column for each key, NaN where a key has none."""
+    row = np.searchsorted(unique_keys, keys)
+    out = np.full(unique_keys.size, np.nan)
+    valid = ~np.isnan(values)
+    np.fmin.at(out, row[valid], values[valid])
+    return out
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="API 510 corrosion rates and remaining life for every CML.")
+    parser.add_argument('history', help="CSV with vessel, cml, date, thickness (and optional component, t_min, "
+                                             "nominal) columns, or a readings_store.py store directory")
+    parser.add_argument('-o', '--output', default='remaining_life.csv', help="Output CSV (default: remaining_life.csv)")
+    parser.add_argument('--t-min', type=float, help="Required thickness for CMLs without a t_min column value")
+    parser.add_argument('--in-service', help="In-service date (YYYY-MM-DD); long-term rate then uses nominal thickness")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    if Path(args.history).is_dir():
+        from readings_store import ReadingsStore
+        store = ReadingsStore(args.history)
+        cmls, surveys, thickness = store.pivot()
+        unique_keys = store.keys(cmls)
+        t_min = nominal = np.full(unique_keys.size, np.nan)
+    else:
+        keys, dates, readings, t_min, nominal = read_history(args.history)
+        unique_keys, surveys, thickness = pivot(keys, dates, readings)
+        t_min, nominal = _per_key(keys, unique_keys, t_min), _per_key(keys, unique_keys, nominal)
+    if args.t_min is not None:
+        t_min = np.where(np.isnan(t_min), args.t_min, t_min)
+    result = evaluate(thickness, surveys, t_min, nominal=nominal,
+                      in_service=np.datetime64(args.in_service, 'D') if args.in_service else None)
+
+    with open(args.output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['vessel', 'component', 'cml', 'current', 'current_date', 'cr_lt', 'cr_st', 't_min',
+                         'remaining_life', 'interval', 'next_inspection'])
+        for i, key in enumerate(unique_keys.tolist()):
+            vessel, component, cml = key.split('\t', 2)
+            writer.writerow([vessel, component, cml, f"{result['current'][i]:.4f}", result['current_date'][i],
+                             f"{result['cr_lt'][i]:.5f}", f"{result['cr_st'][i]:.5f}", f"{t_min[i]:.4f}",
+                             f"{result['remaining_life'][i]:.2f}", f"{result['interval'][i]:.2f}",
+                             result['next_inspection'][i]])
+
+    life = result['remaining_life']
+    due = np.sum(life < 4)
+    print(f"{unique_keys.size:,} CMLs over {surveys.size} survey dates, {due:,} with remaining life under 4 years "
+          f"in {time.perf_counter() - started:.2f}s -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,18 +1,607 @@
+#!/usr/bin/env python3
+"""
+Batch text extraction for inspection report PDFs.
+
+Usage:
+    python scripts/extract.py REPORTS_DIR [MORE_DIRS_OR_GLOBS ...] -o extracted/ -j 8
+    python scripts/extract.py REPORTS_DIR -o extracted/ --resume
+
+Each input PDF is written to <output-dir>/<stem>.txt. Files are spread over a
+process pool, each result is printed as it finishes, and a JSON summary is
+written next to the outputs.
+
+A page that fails to extract is recorded and skipped instead of failing the
+whole file. Finished files are appended to extract_checkpoint.jsonl and every
+output file keeps a <stem>.txt.progress page log while it is being written, so
+--resume after an interruption skips finished files and continues partially
+written ones from their last completed page.
+
+--targeted (or one or more --match REGEX) keeps only pages with UT thickness
+tables, nameplate data or U-1 forms. Pages are pre-screened from their raw
+content streams, so photo, drawing and narrative pages are mostly never run
+through full text extraction, and each kept page is tagged "[Page N]".
+
+--index DB adds the extracted pages (only the matching ones with --targeted or
+--match) to the report_index.py full-text index, read back from the output
+files rather than parsed again; unchanged files already in the index are
+skipped.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
 import PyPDF2
 
-def extract_pdf(pdf_path, output_path):
+from extraction_cache import ExtractionCache
+
+# Bump when extraction output changes so stale cache entries are never served.
+EXTRACTOR_VERSION = f"2/PyPDF2-{PyPDF2.__version__}"
+SUMMARY_FILE = "extract_summary.json"
+CHECKPOINT_FILE = "extract_checkpoint.jsonl"
+PROGRESS_SUFFIX = ".progress"
+DEFAULT_CACHE_DIR = ".extract_cache"
+DEFAULT_CACHE_SIZE_MB = 2048
+
+# Pages worth sending to the downstream parsers in --targeted mode: UT thickness
+# tables, nameplate data and U-1 data reports.
+DEFAULT_PAGE_PATTERNS = [r'\bTML\b', r'\bCML\b', r'thickness', r'\bU-?1A?\b', r'name\s*plate']
+
+# Content stream tokens: whitespace and comments, a hex string, a delimiter, or a name/number/operator.
+_TOKEN = re.compile(rb'(?:\s+|%[^\r\n]*)|<([0-9A-Fa-f\s]*)>|(<<|>>|[\[\]{}])|(/?[^\s/\[\]()<>{}%]*)')
+_ESCAPES = {ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t', ord('b'): b'\b', ord('f'): b'\f'}
+_INLINE_IMAGE_END = re.compile(rb'\sEI(?=\s|$)')
+_SHOW_OPERATORS = {b'Tj', b"'", b'"'}
+_SIMPLE_FONTS = {'/Type1', '/TrueType', '/MMType1'}
+_STANDARD_ENCODINGS = {'/WinAnsiEncoding', '/MacRomanEncoding', '/StandardEncoding'}
+
+
+def _error_text(e):
+    return f"{type(e).__name__}: {e}"
+
+
+def compile_patterns(patterns):
+    """Combine page patterns into one case-insensitive regex."""
+    return re.compile('|'.join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+def _page_content(page):
+    contents = page.get('/Contents')
+    if contents is None:
+        return b''
+    contents = contents.get_object()
+    return b''.join(stream.get_object().get_data()
+                    for stream in (contents if isinstance(contents, list) else [contents]))
+
+
+def _literal_string(content, i):
+    """Decode the literal string starting after the "(" at content[i - 1]. Returns (bytes, index after ")")."""
+    out = bytearray()
+    depth = 1
+    n = len(content)
+    while i < n:
+        c = content[i]
+        i += 1
+        if c == 0x5C:  # backslash
+            if i >= n:
+                break
+            c = content[i]
+            i += 1
+            if 0x30 <= c <= 0x37:
+                digits = bytes([c])
+                while len(digits) < 3 and i < n and 0x30 <= content[i] <= 0x37:
+                    digits += content[i:i + 1]
+                    i += 1
+                out.append(int(digits, 8) & 0xFF)
+            elif c in (0x0D, 0x0A):
+                if c == 0x0D and i < n and content[i] == 0x0A:
+                    i += 1  # line continuation
+            else:
+                out += _ESCAPES.get(c, bytes([c]))
+        elif c == 0x28:
+            depth += 1
+            out.append(c)
+        elif c == 0x29:
+            depth -= 1
+            if depth == 0:
+                return bytes(out), i
+            out.append(c)
+        else:
+            out.append(c)
+    return bytes(out), i
+
+
+def _shown_strings(content):
+    """
+    (has_text_object, shown) for a content stream: whether it has a BT
+    operator, and the bytes drawn by each Tj, TJ, ' and " operator, with TJ
+    kerning wider than a space rendered as one.
+    """
+    operands, array, shown = [], None, []
+    has_text = False
+    i, n = 0, len(content)
+    while i < n:
+        if content[i] == 0x28:
+            value, i = _literal_string(content, i + 1)
+        else:
+            match = _TOKEN.match(content, i)
+            i = match.end() if match.end() > i else i + 1
+            hex_string, delimiter, word = match.groups()
+            if hex_string is not None:
+                digits = re.sub(rb'\s', b'', hex_string)
+                value = bytes.fromhex((digits + b'0' * (len(digits) % 2)).decode('ascii'))
+            elif delimiter == b'[':
+                array = []
+                continue
+            elif delimiter == b']':
+                operands.append(array if array is not None else [])
+                array = None
+                continue
+            elif not word or delimiter is not None:
+                continue
+            elif word[:1] == b'/':
+                value = word.decode('latin-1')  # str, so names never pass for shown strings
+            else:
+                try:
+                    value = float(word)
+                except ValueError:
+                    if word == b'BT':
+                        has_text = True
+                    elif word in _SHOW_OPERATORS:
+                        shown.extend(operand for operand in operands[-1:] if isinstance(operand, bytes))
+                    elif word == b'TJ' and operands and isinstance(operands[-1], list):
+                        pieces = [item if isinstance(item, bytes) else b' ' for item in operands[-1]
+                                  if isinstance(item, bytes) or (isinstance(item, float) and item < -200)]
+                        shown.append(b''.join(pieces))
+                    elif word == b'ID':
+                        end = _INLINE_IMAGE_END.search(content, i)
+                        i = end.end() if end else n
+                    operands = []
+                    continue
+        if array is not None:
+            array.append(value)
+        else:
+            operands.append(value)
+    return has_text, shown
+
+
+def prescan_page(page, pattern):
+    """
+    Decide whether a page can match pattern without running extract_text.
+
+    Returns False only when that is certain: the page has no text objects
+    (photos, scanned drawings), or its fonts all use a standard single-byte
+    encoding and none of its shown strings, literal or hex, match. Returns
+    True when a shown string matches, and None when the page has to be
+    extracted to know: it draws Form XObjects, which can hold text of their
+    own, or composite or re-mapped fonts make the raw bytes unreadable.
+    """
+    resources = page.get('/Resources')
+    resources = resources.get_object() if resources is not None else {}
+    xobjects = resources.get('/XObject')
+    for xobject in (xobjects.get_object().values() if xobjects is not None else []):
+        if xobject.get_object().get('/Subtype') != '/Image':
+            return None
+
+    has_text, shown = _shown_strings(_page_content(page))
+    if not has_text:
+        return False
+
+    fonts = resources.get('/Font')
+    for font in (fonts.get_object().values() if fonts is not None else []):
+        font = font.get_object()
+        if (font.get('/Subtype') not in _SIMPLE_FONTS or '/ToUnicode' in font
+                or font.get('/Encoding') not in _STANDARD_ENCODINGS):
+            return None
+    # Some producers draw one glyph per operator, others one word; try both joins.
+    for joined in (b' '.join(shown), b''.join(shown)):
+        if pattern.search(joined.decode('latin-1')):
+            return True
+    return False
+
+
+def iter_pages(pdf_path, cache=None, refresh=False, stats=None, start_page=1, pattern=None):
+    """
+    Yield (page_number, text) for each page of pdf_path, 1-based.
+
+    Pages are parsed lazily from the open file, so a consumer that handles one
+    page at a time holds roughly one page of text regardless of document size.
+
+    With an ExtractionCache, a file whose bytes are unchanged is replayed from
+    the cache without opening it in PyPDF2, and in a changed file any page whose
+    content is unchanged is still served from the cache. refresh=True ignores
+    existing entries and overwrites them.
+
+    A page that raises is not yielded; it is appended to stats['failed_pages']
+    as {'page', 'error'} and extraction carries on with the next page. If given,
+    stats also receives 'pages' (the document's page count) and 'cached_pages'.
+    Pages before start_page are skipped.
+
+    With a compiled pattern only pages whose text matches are yielded. Cached
+    text is matched directly; otherwise prescan_page rules pages out before the
+    expensive extract_text call, and stats['prescan_skipped'] counts them.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('cached_pages', 0)
+    stats.setdefault('failed_pages', [])
+    stats.setdefault('prescan_skipped', 0)
+
+    file_key = cache.file_key(pdf_path) if cache is not None else None
+    page_keys = cache.get_file(file_key) if cache is not None and not refresh else None
+
+    next_page = start_page
+    if page_keys is not None and all(cache.has_page(key) for key in page_keys):
+        stats['pages'] = len(page_keys)
+        for page_number, page_key in enumerate(page_keys, start=1):
+            if page_number < next_page:
+                continue
+            text = cache.get_page(page_key)
+            if text is None:
+                break  # evicted underneath us; extract the rest below
+            stats['cached_pages'] += 1
+            next_page = page_number + 1
+            if pattern is None or pattern.search(text):
+                yield page_number, text
+        else:
+            return
+
+    page_keys = []
+    complete = True
+    with open(pdf_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        stats['pages'] = len(reader.pages)
+        for index in range(stats['pages']):
+            page_number = index + 1
+            page_key = None
+            try:
+                page = reader.pages[index]
+                if cache is not None:
+                    page_key = cache.page_key(page)
+                if page_number < next_page:
+                    page_keys.append(page_key)
+                    continue
+                text = None if cache is None or refresh else cache.get_page(page_key)
+                if text is None:
+                    if pattern is not None and prescan_page(page, pattern) is False:
+                        stats['prescan_skipped'] += 1
+                        complete = False
+                        page_keys.append(page_key)
+                        continue
+                    text = page.extract_text() or ''
+                    if cache is not None:
+                        cache.put_page(page_key, text)
+                else:
+                    stats['cached_pages'] += 1
+            except Exception as e:
+                stats['failed_pages'].append({'page': page_number, 'error': _error_text(e)})
+                complete = False
+                page_keys.append(page_key)
+                continue
+            page_keys.append(page_key)
+            if pattern is None or pattern.search(text):
+                yield page_number, text
+    if cache is not None and complete:
+        cache.put_file(file_key, page_keys)
+
+
+def _read_progress(progress_path):
+    """Return (last page, output byte offset, written pages, failed pages) from a progress log."""
+    last_page, offset, written, failed = 0, 0, [], []
     try:
-        with open(pdf_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            text = ''
-            for page in reader.pages:
-                text += page.extract_text() + '\n'
-                
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(text)
-        print(f"Done: {output_path}")
+        lines = progress_path.read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return last_page, offset, written, failed
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            break  # torn final line from an interrupted write
+        last_page, offset = entry['page'], entry['offset']
+        if entry.get('error'):
+            failed.append({'page': entry['page'], 'error': entry['error']})
+        else:
+            written.append(entry['page'])
+    return last_page, offset, written, failed
+
+
+def extract_pdf(pdf_path, output_path, cache=None, refresh=False, stats=None, resume=False, pattern=None):
+    """
+    Stream page text from pdf_path into output_path as it is extracted. Returns the page count.
+
+    With a pattern only matching pages are written, each preceded by a
+    "[Page N]" line, and stats['pages_written'] lists their page numbers.
+    stats['page_spans'] holds [page, start, end] byte offsets of the text of
+    every page written by this call (not pages kept from a resumed run).
+
+    While the file is being written, each processed page is appended to
+    <output_path>.progress with the output offset after it. With resume=True an
+    existing progress log is honoured: the output is truncated to the last
+    completed page and extraction continues from the next one. The log is
+    removed once the file is complete.
+    """
+    if stats is None:
+        stats = {}
+    progress_path = Path(str(output_path) + PROGRESS_SUFFIX)
+    last_page, offset, written, failed = _read_progress(progress_path) if resume else (0, 0, [], [])
+    if last_page and not Path(output_path).exists():
+        last_page, offset, written, failed = 0, 0, [], []
+    stats['failed_pages'] = list(failed)
+    stats['pages_written'] = list(written)
+    stats['page_spans'] = []
+    stats['resumed_from_page'] = last_page + 1 if last_page else None
+
+    with open(output_path, 'r+b' if last_page else 'wb') as out, \
+            open(progress_path, 'a' if last_page else 'w', encoding='utf-8') as progress:
+        out.seek(offset)
+        out.truncate()
+        recorded = len(stats['failed_pages'])
+        for page_number, text in iter_pages(pdf_path, cache=cache, refresh=refresh,
+                                            stats=stats, start_page=last_page + 1, pattern=pattern):
+            for failure in stats['failed_pages'][recorded:]:
+                progress.write(json.dumps({**failure, 'offset': out.tell()}) + '\n')
+            recorded = len(stats['failed_pages'])
+            if pattern is not None:
+                out.write(f"[Page {page_number}]\n".encode('utf-8'))
+            start = out.tell()
+            out.write(text.encode('utf-8'))
+            stats['page_spans'].append([page_number, start, out.tell()])
+            out.write(b'\n')
+            out.flush()
+            progress.write(json.dumps({'page': page_number, 'offset': out.tell()}) + '\n')
+            progress.flush()
+            stats['pages_written'].append(page_number)
+    progress_path.unlink()
+    return stats.get('pages', 0)
+
+
+def iter_output_pages(output_path, spans):
+    """Yield (page_number, text) for page spans extract_pdf recorded, read back from its output file."""
+    with open(output_path, 'rb') as f:
+        for page_number, start, end in spans:
+            f.seek(start)
+            yield page_number, f.read(end - start).decode('utf-8')
+
+
+def find_pdfs(inputs):
+    """Expand files, directories (recursive) and glob patterns into a sorted, de-duplicated PDF list."""
+    found = {}
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            candidates = path.rglob('*')
+        elif path.is_file():
+            candidates = [path]
+        else:
+            candidates = (Path(p) for p in glob.glob(item, recursive=True))
+        for candidate in candidates:
+            if candidate.is_file() and candidate.suffix.lower() == '.pdf':
+                found.setdefault(str(candidate.resolve()), candidate)
+    return [found[key] for key in sorted(found)]
+
+
+def plan_outputs(pdf_paths, output_dir):
+    """Map each PDF to an output .txt path, suffixing duplicate stems so nothing is overwritten."""
+    used = set()
+    jobs = []
+    for pdf_path in pdf_paths:
+        name = pdf_path.stem
+        candidate = name
+        n = 2
+        while candidate.lower() in used:
+            candidate = f"{name}-{n}"
+            n += 1
+        used.add(candidate.lower())
+        jobs.append((pdf_path, Path(output_dir) / f"{candidate}.txt"))
+    return jobs
+
+
+def _file_signature(pdf_path):
+    stat = os.stat(pdf_path)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def load_checkpoint(output_dir):
+    """Return {pdf path: result} for files a previous run finished and that have not changed since."""
+    done = {}
+    try:
+        lines = (Path(output_dir) / CHECKPOINT_FILE).read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return done
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        try:
+            unchanged = entry['signature'] == _file_signature(entry['result']['pdf'])
+        except OSError:
+            unchanged = False
+        if entry['result']['ok'] and unchanged and Path(entry['result']['output']).exists():
+            done[entry['result']['pdf']] = entry['result']
+        else:
+            done.pop(entry['result']['pdf'], None)
+    return done
+
+
+def run_job(pdf_path, output_path, options):
+    """Process-pool entry point: extract one file and never raise."""
+    started = time.perf_counter()
+    result = {'pdf': str(pdf_path), 'output': str(output_path), 'ok': False, 'pages': 0, 'error': None}
+    stats = {}
+    try:
+        result['pages'] = extract_pdf(pdf_path, output_path, cache=options.get('cache'),
+                                      refresh=options.get('refresh', False), stats=stats,
+                                      resume=options.get('resume', False), pattern=options.get('pattern'))
+        result['ok'] = True
     except Exception as e:
-        print(f"Error on {pdf_path}: {e}")
+        result['error'] = _error_text(e)
+    result['cached_pages'] = stats.get('cached_pages', 0)
+    result['failed_pages'] = stats.get('failed_pages', [])
+    result['resumed_from_page'] = stats.get('resumed_from_page')
+    if options.get('pattern') is not None:
+        result['matched_pages'] = stats.get('pages_written', [])
+        result['prescan_skipped'] = stats.get('prescan_skipped', 0)
+    if options.get('index') and result['ok'] and result['resumed_from_page'] is None:
+        result['page_spans'] = stats['page_spans']
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_batch(jobs, workers, options, checkpoint_path=None, page_spans=None):
+    """
+    Run jobs on a process pool, printing each result and checkpointing it as it completes.
+    Page spans recorded for --index are moved into page_spans (pdf -> spans), never into results.
+    """
+    results = []
+    if workers <= 1:
+        completed = (run_job(pdf, out, options) for pdf, out in jobs)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        futures = [pool.submit(run_job, pdf, out, options) for pdf, out in jobs]
+        completed = (future.result() for future in as_completed(futures))
+    checkpoint = open(checkpoint_path, 'a', encoding='utf-8') if checkpoint_path else None
+    try:
+        for result in completed:
+            spans = result.pop('page_spans', None)
+            if spans is not None and page_spans is not None:
+                page_spans[result['pdf']] = spans
+            if result['ok']:
+                notes = ""
+                if result['cached_pages']:
+                    notes += f", {result['cached_pages']} cached"
+                if result['failed_pages']:
+                    notes += f", {len(result['failed_pages'])} failed"
+                if 'matched_pages' in result:
+                    notes += f", {len(result['matched_pages'])} matched"
+                if result['resumed_from_page']:
+                    notes += f", resumed at page {result['resumed_from_page']}"
+                print(f"Done: {result['output']} ({result['pages']} pages{notes}, {result['seconds']:.1f}s)")
+                for failure in result['failed_pages']:
+                    print(f"  Skipped page {failure['page']}: {failure['error']}")
+            else:
+                print(f"Error on {result['pdf']}: {result['error']}")
+            if checkpoint is not None:
+                try:
+                    signature = _file_signature(result['pdf'])
+                except OSError:
+                    signature = None
+                checkpoint.write(json.dumps({'signature': signature, 'result': result}) + '\n')
+                checkpoint.flush()
+            results.append(result)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+        if workers > 1:
+            pool.shutdown(cancel_futures=True)
+    return results
+
+
+def write_summary(results, output_dir, elapsed):
+    results = sorted(results, key=lambda r: r['pdf'])
+    summary = {
+        'total': len(results),
+        'succeeded': sum(1 for r in results if r['ok']),
+        'failed': sum(1 for r in results if not r['ok']),
+        'resumed': sum(1 for r in results if r.get('resumed')),
+        'pages': sum(r['pages'] for r in results),
+        'cached_pages': sum(r['cached_pages'] for r in results),
+        'failed_pages': sum(len(r['failed_pages']) for r in results),
+        'matched_pages': sum(len(r.get('matched_pages', [])) for r in results),
+        'elapsed_seconds': round(elapsed, 3),
+        'files': results,
+    }
+    summary_path = Path(output_dir) / SUMMARY_FILE
+    summary_path.write_text(json.dumps(summary, indent=2), encoding='utf-8')
+    return summary, summary_path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Extract text from inspection report PDFs.")
+    parser.add_argument('inputs', nargs='+', help="PDF files, directories or glob patterns")
+    parser.add_argument('-o', '--output-dir', default='extracted', help="Directory for extracted text (default: extracted)")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Skip files finished by a previous run and continue partial ones from their last page")
+    parser.add_argument('--targeted', action='store_true',
+                        help="Only extract pages matching the thickness/TML/U-1 patterns, tagged with page numbers")
+    parser.add_argument('--match', action='append', metavar='REGEX',
+                        help="Page pattern for targeted mode (repeatable, case-insensitive; implies --targeted "
+                             "and replaces the defaults)")
+    parser.add_argument('--index', metavar='DB',
+                        help="Add extracted pages to a report_index.py full-text index (updated incrementally)")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f"Per-page extraction cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--cache-size-mb', type=int, default=DEFAULT_CACHE_SIZE_MB,
+                        help=f"Evict least recently used cache entries above this size (default: {DEFAULT_CACHE_SIZE_MB})")
+    parser.add_argument('--no-cache', action='store_true', help="Neither read nor write the extraction cache")
+    parser.add_argument('--refresh', action='store_true', help="Re-extract every page and overwrite cached entries")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pdf_paths = find_pdfs(args.inputs)
+    if not pdf_paths:
+        print("No PDF files found.")
+        return 1
+
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    checkpoint_path = Path(args.output_dir) / CHECKPOINT_FILE
+    jobs = plan_outputs(pdf_paths, args.output_dir)
+
+    finished = []
+    if args.resume:
+        done = load_checkpoint(args.output_dir)
+        finished = [{**done[str(pdf)], 'resumed': True} for pdf, _ in jobs if str(pdf) in done]
+        jobs = [(pdf, out) for pdf, out in jobs if str(pdf) not in done]
+        print(f"Resuming: {len(finished)} file(s) already done")
+    else:
+        checkpoint_path.unlink(missing_ok=True)
+
+    workers = max(1, min(args.workers, len(jobs)))
+    print(f"Extracting {len(jobs)} PDF(s) with {workers} worker(s)...")
+
+    options = {
+        'cache': None if args.no_cache else ExtractionCache(args.cache_dir, EXTRACTOR_VERSION),
+        'refresh': args.refresh,
+        'resume': args.resume,
+        'pattern': None,
+        'index': bool(args.index),
+    }
+    if args.targeted or args.match:
+        options['pattern'] = compile_patterns(args.match or DEFAULT_PAGE_PATTERNS)
+
+    started = time.perf_counter()
+    page_spans = {}
+    results = finished + run_batch(jobs, workers, options, checkpoint_path, page_spans)
+    summary, summary_path = write_summary(results, args.output_dir, time.perf_counter() - started)
+    if args.index:
+        from report_index import update_index
+        # Pages extracted by this run are read back from the output files; only files
+        # finished by an earlier run are parsed again.
+        outputs = {r['pdf']: r['output'] for r in results}
+        pages = {pdf: iter_output_pages(outputs[pdf], spans) for pdf, spans in page_spans.items()}
+        update_index(args.index, [r['pdf'] for r in results if r['ok']], cache=options['cache'], pages=pages)
+    if options['cache'] is not None:
+        options['cache'].evict(args.cache_size_mb * 1024 * 1024)
+
+    print()
+    print(f"{summary['succeeded']} succeeded, {summary['failed']} failed, "
+          f"{summary['pages']} pages ({summary['cached_pages']} from cache, "
+          f"{summary['failed_pages']} skipped) in {summary['elapsed_seconds']:.1f}s")
+    if options['pattern'] is not None:
+        print(f"{summary['matched_pages']} page(s) matched {options['pattern'].pattern}")
+    print(f"Summary: {summary_path}")
+    return 0 if summary['failed'] == 0 else 1
+
 
-extract_pdf(r'E:\jerry\Dropbox\MANUS\004\54-11-004.pdf', 'extracted_text_004.log')
-extract_pdf(r'E:\jerry\Dropbox\MANUS\005\54-11-005 final.pdf', 'extracted_text_005.log')
+if __name__ == '__main__':
+    sys.exit(main())
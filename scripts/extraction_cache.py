@@ -0,0 +1,175 @@
+"""
+Content-addressed on-disk cache for extracted PDF page text.
+
+Layout under the cache directory:
+    files/<sha256 of pdf bytes + version>.json   ordered list of page keys
+    pages/<aa>/<page key>.txt                    extracted text of one page
+
+A page key hashes the page's content stream and its whole resource tree
+(fonts, Form XObjects with their own streams and resources, ...), so when a
+report is re-issued with a few pages changed, the untouched pages are still
+served from the cache. Every entry is written via temp file + rename, which
+keeps the cache consistent when several worker processes share it.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+HASH_CHUNK = 1024 * 1024
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _hash_object(digest, obj, seen):
+    """
+    Feed a PDF object and everything it references into digest.
+
+    An indirect object is hashed in full the first time it is reached and by
+    its visit order after that, so shared fonts and cyclic references end the
+    walk while object numbers, which change when a file is rewritten, stay out
+    of the key. Image samples are skipped: they cannot change extracted text,
+    and hashing them would dominate the key.
+    """
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+    if isinstance(obj, IndirectObject):
+        ref = (obj.idnum, obj.generation)
+        if ref in seen:
+            digest.update(f"@{seen[ref]}".encode())
+            return
+        seen[ref] = len(seen)
+        obj = obj.get_object()
+    if isinstance(obj, DictionaryObject):
+        digest.update(b'<<')
+        for key in sorted(obj):
+            if key == '/Parent':
+                continue
+            digest.update(str(key).encode())
+            _hash_object(digest, obj.raw_get(key), seen)
+        digest.update(b'>>')
+        if isinstance(obj, StreamObject) and obj.get('/Subtype') != '/Image':
+            digest.update(obj.get_data())
+    elif isinstance(obj, ArrayObject):
+        digest.update(b'[')
+        for item in obj:
+            _hash_object(digest, item, seen)
+        digest.update(b']')
+    else:
+        digest.update(repr(obj).encode())
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+class ExtractionCache:
+    """Per-page text cache keyed by PDF hash and extractor version."""
+
+    def __init__(self, cache_dir, version):
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+        self.files_dir = self.cache_dir / 'files'
+        self.pages_dir = self.cache_dir / 'pages'
+
+    def file_key(self, pdf_path):
+        return hashlib.sha256(f"{file_sha256(pdf_path)}:{self.version}".encode()).hexdigest()
+
+    def page_key(self, page):
+        """Fingerprint a PyPDF2 page from its raw content stream and its whole resource tree."""
+        digest = hashlib.sha256(self.version.encode())
+        contents = page.get('/Contents')
+        contents = contents.get_object() if contents is not None else []
+        for stream in (contents if isinstance(contents, list) else [contents]):
+            digest.update(stream.get_object().get_data())
+        resources = page.raw_get('/Resources') if '/Resources' in page else None
+        if resources is not None:
+            _hash_object(digest, resources, {})
+        return digest.hexdigest()
+
+    def _file_path(self, file_key):
+        return self.files_dir / f"{file_key}.json"
+
+    def _page_path(self, page_key):
+        return self.pages_dir / page_key[:2] / f"{page_key}.txt"
+
+    def get_file(self, file_key):
+        """Return the ordered page keys for a cached file, or None."""
+        path = self._file_path(file_key)
+        try:
+            manifest = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        _touch(path)
+        return manifest.get('pages')
+
+    def put_file(self, file_key, page_keys):
+        data = json.dumps({'version': self.version, 'pages': page_keys}).encode('utf-8')
+        _atomic_write(self._file_path(file_key), data)
+
+    def has_page(self, page_key):
+        return self._page_path(page_key).exists()
+
+    def get_page(self, page_key):
+        path = self._page_path(page_key)
+        try:
+            text = path.read_bytes().decode('utf-8')
+        except OSError:
+            return None
+        _touch(path)
+        return text
+
+    def put_page(self, page_key, text):
+        _atomic_write(self._page_path(page_key), text.encode('utf-8'))
+
+    def _entries(self):
+        for root in (self.files_dir, self.pages_dir):
+            if root.exists():
+                yield from (p for p in root.rglob('*') if p.is_file() and not p.name.startswith('.tmp-'))
+
+    def evict(self, max_bytes):
+        """Delete least recently used entries until the cache fits in max_bytes. Returns bytes freed."""
+        entries = []
+        total = 0
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= max_bytes:
+                break
+            try:
+                path.unlink()
+                freed += size
+            except OSError:
+                pass
+        return freed
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+ASME Section II Part D allowable stress lookup for batch calculations.
+
+Usage:
+    python scripts/material_stress.py SA-516-70 650
+    python scripts/material_stress.py "SA-612" 125 --table server/asmeMaterialsDatabase.ts
+
+    from material_stress import load_table
+    table = load_table()
+    S = table.lookup(materials, design_temperatures)   # arrays in, float64 array out
+
+The table is read once per source file into two flat arrays: temperatures and
+stresses for every material, concatenated in material order, with each
+material's temperatures offset by its index times TEMPERATURE_STRIDE. That
+keeps the whole table sorted, so a batch of (material, temperature) pairs is
+resolved with one np.searchsorted and one linear interpolation, and only
+distinct pairs are interpolated.
+
+Sources:
+  - server/asmeMaterialDatabase.ts (default), the locked Table 1A module;
+  - server/asmeMaterialsDatabase.ts, including its material aliases;
+  - a CSV with materialSpec, temperatureF and allowableStress columns, the
+    shape seed-material-stress.mjs loads into materialStressValues.
+
+As in getAllowableStress, interpolated values are rounded to the nearest psi,
+and temperatures outside a material's tabulated range or unknown materials
+give NaN.
+"""
+
+import argparse
+import csv
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_TABLE = REPO_ROOT / 'server' / 'asmeMaterialDatabase.ts'
+# More than twice any design temperature, so offset temperatures never overlap between materials.
+TEMPERATURE_STRIDE = 1.0e5
+
+_TABLE_1A = re.compile(r'ALLOWABLE_STRESS_TABLE_1A[^=]*=\s*\{(.*?)\n\};', re.DOTALL)
+_TABLE_1A_ENTRY = re.compile(r'"([^"]+)"\s*:\s*\{([^}]*)\}')
+_TABLE_1A_POINT = re.compile(r'\[?(-?\d+(?:\.\d+)?)\]?\s*:\s*(\d+(?:\.\d+)?)')
+_MATERIAL_SPEC = re.compile(r'const\s+\w+\s*:\s*MaterialSpec\s*=\s*\{(.*?)\n\};', re.DOTALL)
+_SPEC_CODE = re.compile(r"\bcode:\s*'([^']+)'")
+_SPEC_ALIASES = re.compile(r"\baliases:\s*\[([^\]]*)\]")
+_SPEC_POINT = re.compile(r'temperatureF:\s*(-?\d+(?:\.\d+)?)\s*,\s*allowableStressPsi:\s*(\d+(?:\.\d+)?)')
+_QUOTED = re.compile(r"'([^']*)'")
+
+
+def _read_ts(path):
+    """Return ({material: {temperature: stress}}, {alias: material}) from either TypeScript database."""
+    text = Path(path).read_text(encoding='utf-8')
+    table, aliases = {}, {}
+    block = _TABLE_1A.search(text)
+    if block:
+        for material, points in _TABLE_1A_ENTRY.findall(block.group(1)):
+            table[material] = {float(t): float(s) for t, s in _TABLE_1A_POINT.findall(points)}
+    for spec in _MATERIAL_SPEC.findall(text):
+        code = _SPEC_CODE.search(spec)
+        if not code:
+            continue
+        table[code.group(1)] = {float(t): float(s) for t, s in _SPEC_POINT.findall(spec)}
+        names = _SPEC_ALIASES.search(spec)
+        for alias in _QUOTED.findall(names.group(1)) if names else ():
+            aliases[alias] = code.group(1)
+    return table, aliases
+
+
+def _read_csv(path):
+    table = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            table.setdefault(row['materialSpec'], {})[float(row['temperatureF'])] = float(row['allowableStress'])
+    return table, {}
+
+
+def _squash(spec):
+    """Loose key: upper case, alphanumerics only, without GR/GRADE/TYPE, as in normalizeMaterialCode."""
+    key = re.sub(r'[^A-Z0-9]', '', spec.upper())
+    return re.sub(r'TYPE', '', re.sub(r'GR(ADE)?', '', key))
+
+
+class StressTable:
+    """Allowable stress for many materials, laid out for vectorized interpolation."""
+
+    def __init__(self, table, aliases=None, source=''):
+        self.source = str(source)
+        self.materials = sorted(m for m, points in table.items() if points)
+        temperatures, stresses, starts = [], [], [0]
+        for i, material in enumerate(self.materials):
+            points = sorted(table[material].items())
+            temperatures.extend(i * TEMPERATURE_STRIDE + t for t, _ in points)
+            stresses.extend(s for _, s in points)
+            starts.append(len(temperatures))
+        self.temperatures = np.array(temperatures, dtype=np.float64)
+        self.stresses = np.array(stresses, dtype=np.float64)
+        self.starts = np.array(starts, dtype=np.intp)
+        lengths = np.diff(self.starts)
+        offsets = np.arange(len(self.materials)) * TEMPERATURE_STRIDE
+        self.min_temperature = self.temperatures[self.starts[:-1]] - offsets if lengths.size else np.empty(0)
+        self.max_temperature = self.temperatures[self.starts[1:] - 1] - offsets if lengths.size else np.empty(0)
+
+        self._exact = {m: i for i, m in enumerate(self.materials)}
+        self._loose = {}
+        for name, material in list((m, m) for m in self.materials) + list((aliases or {}).items()):
+            if material in self._exact:
+                self._loose.setdefault(_squash(name), self._exact[material])
+        self._names = {}
+
+    def index(self, spec):
+        """Index of a material spec such as "SA-516 Gr 70", "SA-516-70" or "SA516 GR70", or -1 if unknown."""
+        code = self._names.get(spec)
+        if code is None:
+            code = self._exact.get(spec)
+            if code is None:
+                code = self._loose.get(_squash(str(spec)), -1)
+            self._names[spec] = code
+        return code
+
+    def codes(self, materials):
+        """Material indexes for an array of specs (or pass-through for integer indexes)."""
+        materials = np.asarray(materials)
+        if materials.dtype.kind in 'iu':
+            return materials.astype(np.intp)
+        names, inverse = np.unique(materials.astype(str), return_inverse=True)
+        codes = np.array([self.index(name) for name in names.tolist()], dtype=np.intp)
+        return codes[inverse.reshape(-1)].reshape(materials.shape)
+
+    def _interpolate(self, code, temperature):
+        stress = np.full(code.shape, np.nan)
+        known = code >= 0
+        code, temperature = code[known], temperature[known]
+        in_range = (temperature >= self.min_temperature[code]) & (temperature <= self.max_temperature[code])
+        code, temperature = code[in_range], temperature[in_range]
+
+        x = code * TEMPERATURE_STRIDE + temperature
+        upper = np.searchsorted(self.temperatures, x, side='left')
+        exact = self.temperatures[np.minimum(upper, self.temperatures.size - 1)] == x
+        lower = np.where(exact, upper, upper - 1)
+        x0, x1 = self.temperatures[lower], self.temperatures[upper]
+        y0, y1 = self.stresses[lower], self.stresses[upper]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.where(exact, y0, np.floor(y0 + (y1 - y0) * (x - x0) / (x1 - x0) + 0.5))
+
+        result = stress[known]
+        result[in_range] = values
+        stress[known] = result
+        return stress
+
+    def lookup(self, materials, temperatures):
+        """
+        Allowable stress (psi) for arrays of material specs and design temperatures (°F).
+
+        Inputs broadcast against each other. Repeated (material, temperature)
+        pairs, the usual case for a fleet, are interpolated once.
+        """
+        codes = self.codes(materials)
+        temperatures = np.asarray(temperatures, dtype=np.float64)
+        codes, temperatures = np.broadcast_arrays(codes, temperatures)
+        # code * TEMPERATURE_STRIDE + temperature identifies a pair with a single float,
+        # so deduplicating pairs is a plain float sort.
+        keys = np.where(codes >= 0, codes * TEMPERATURE_STRIDE + temperatures, -np.inf).reshape(-1)
+        unique, inverse = np.unique(keys, return_inverse=True)
+        finite = np.isfinite(unique)
+        code = np.full(unique.shape, -1, dtype=np.intp)
+        code[finite] = np.rint(unique[finite] / TEMPERATURE_STRIDE)
+        stress = self._interpolate(code, unique - code * TEMPERATURE_STRIDE)
+        return stress[inverse.reshape(-1)].reshape(codes.shape)
+
+    @lru_cache(maxsize=4096)
+    def stress(self, material, temperature):
+        """Scalar lookup, memoized. Returns None when the material or temperature is not covered."""
+        value = float(self._interpolate(np.array([self.index(material)]), np.array([float(temperature)]))[0])
+        return None if value != value else value
+
+
+@lru_cache(maxsize=None)
+def _load(path, mtime):
+    loader = _read_csv if Path(path).suffix.lower() == '.csv' else _read_ts
+    table, aliases = loader(path)
+    if not table:
+        raise ValueError(f"no allowable stress table found in {path}")
+    return StressTable(table, aliases, source=path)
+
+
+def load_table(path=None):
+    """Load a stress table once per source file; reloaded only if the file changes."""
+    path = str(Path(path or DEFAULT_TABLE).resolve())
+    return _load(path, Path(path).stat().st_mtime)
+
+
+def allowable_stress(materials, temperatures, path=None):
+    """Vectorized allowable stress lookup against the default (or given) table."""
+    return load_table(path).lookup(materials, temperatures)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ASME Section II Part D allowable stress lookup.")
+    parser.add_argument('material', nargs='?', help="Material spec, e.g. SA-516-70")
+    parser.add_argument('temperature', nargs='?', type=float, help="Design temperature (°F)")
+    parser.add_argument('--table', help=f"TypeScript database or CSV (default: {DEFAULT_TABLE.relative_to(REPO_ROOT)})")
+    parser.add_argument('--list', action='store_true', help="List materials and their temperature ranges")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    table = load_table(args.table)
+    if args.list or args.material is None:
+        for material, low, high in zip(table.materials, table.min_temperature, table.max_temperature):
+            print(f"{material}: {low:g} to {high:g} °F")
+        return 0
+    if args.temperature is None:
+        print("A design temperature is required.")
+        return 1
+    stress = table.stress(args.material, args.temperature)
+    if stress is None:
+        print(f"No allowable stress for {args.material!r} at {args.temperature:g} °F in {table.source}")
+        return 1
+    print(f"{table.materials[table.index(args.material)]} at {args.temperature:g} °F: S = {stress:,.0f} psi")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Vectorized ASME Section VIII Div. 1 MAWP / t_min engine.
+
+Generalizes the single-vessel arithmetic in calc_mawp.py to arrays, so every
+CML of every vessel in a unit is evaluated in one call:
+
+    import numpy as np
+    from mawp_engine import evaluate, governing_mawp
+
+    result = evaluate(t=t, S=S, E=E, D=D, component=['shell', '2:1 ellipsoidal', ...], P=P)
+    vessels, mawp, governing_row = governing_mawp(vessel_ids, result['mawp'])
+
+Formulas (inside dimensions, R = D/2):
+    shell            MAWP = SEt / (R + 0.6t)          t_min = PR / (SE - 0.6P)
+    2:1 ellipsoidal  MAWP = 2SEt / (D + 0.2t)         t_min = PD / (2SE - 0.2P)
+    hemispherical    MAWP = 2SEt / (R + 0.2t)         t_min = PR / (2SE - 0.2P)
+    torispherical    MAWP = 2SEt / (LM + 0.2t)        t_min = PLM / (2SE - 0.2P)
+                     M = (3 + sqrt(L/r)) / 4, with L = D and r = 0.06D when not given
+
+Invalid inputs (t, S, E or D <= 0, unknown component) give NaN rather than
+raising, so one bad row never stops a fleet run.
+"""
+
+import numpy as np
+
+SHELL = 0
+ELLIPSOIDAL_HEAD = 1
+HEMISPHERICAL_HEAD = 2
+TORISPHERICAL_HEAD = 3
+UNKNOWN_COMPONENT = -1
+
+COMPONENT_CODES = {
+    'shell': SHELL,
+    'cylinder': SHELL,
+    'cylindrical shell': SHELL,
+    'head': ELLIPSOIDAL_HEAD,
+    'ellipsoidal': ELLIPSOIDAL_HEAD,
+    '2:1 ellipsoidal': ELLIPSOIDAL_HEAD,
+    'ellipsoidal head': ELLIPSOIDAL_HEAD,
+    'hemispherical': HEMISPHERICAL_HEAD,
+    'hemispherical head': HEMISPHERICAL_HEAD,
+    'torispherical': TORISPHERICAL_HEAD,
+    'torispherical head': TORISPHERICAL_HEAD,
+    'f&d': TORISPHERICAL_HEAD,
+}
+
+
+def component_codes(component):
+    """
+    Map component names (or integer codes) to engine codes.
+
+    Names are looked up once per distinct value, so a million-row column with a
+    handful of component types costs one np.unique, not a million dict lookups.
+    """
+    component = np.asarray(component)
+    if component.dtype.kind in 'iu':
+        return component.astype(np.int8)
+    names, inverse = np.unique(component.astype(str), return_inverse=True)
+    codes = np.array([COMPONENT_CODES.get(name.strip().lower(), UNKNOWN_COMPONENT) for name in names],
+                     dtype=np.int8)
+    return codes[inverse.reshape(-1)].reshape(component.shape)
+
+
+def torispherical_m(L, r):
+    """ASME VIII-1 Appendix 1-4 factor M = (3 + sqrt(L/r)) / 4."""
+    return 0.25 * (3.0 + np.sqrt(L / r))
+
+
+# Every supported formula has the form MAWP = kSEt / (A + ct) and
+# t_min = PA / (kSE - cP); only k, c and the length A differ by component.
+_K = np.array([1.0, 2.0, 2.0, 2.0, np.nan])
+_C = np.array([0.6, 0.2, 0.2, 0.2, np.nan])
+
+
+def coefficients(component, D, L=None, r=None):
+    """
+    Per-reading (k, c, A) so that MAWP = kSEt / (A + ct) and t_min = PA / (kSE - cP).
+
+    Unknown components get NaN k and c. Useful when the same geometry is
+    evaluated many times with different t, S or E, as in a Monte Carlo sweep.
+    """
+    D = np.asarray(D, dtype=np.float64)
+    code = component_codes(component)
+    D, code = np.broadcast_arrays(D, code)
+    code = np.where((code >= SHELL) & (code <= TORISPHERICAL_HEAD), code, len(_K) - 1)
+
+    # A = R for shells and hemispherical heads, D for 2:1 heads, LM for torispherical heads.
+    A = np.where(code == ELLIPSOIDAL_HEAD, D, D / 2.0)
+    torispherical = code == TORISPHERICAL_HEAD
+    if torispherical.any():
+        L = D if L is None else np.broadcast_to(np.asarray(L, dtype=np.float64), D.shape)
+        r = 0.06 * D if r is None else np.broadcast_to(np.asarray(r, dtype=np.float64), D.shape)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            A = np.where(torispherical, L * torispherical_m(L, r), A)
+    return _K[code], _C[code], A
+
+
+def evaluate(t, S, E, D, component, P=None, L=None, r=None):
+    """
+    Evaluate MAWP, t_min and thickness deficit for arrays of readings.
+
+    t, S, E, D, P, L and r broadcast against each other; component is an
+    array of names or codes (codes skip the name lookup, which matters at
+    fleet scale). P is the design pressure used for t_min and may be omitted,
+    in which case t_min and deficit are NaN; they are also NaN where kSE <= cP,
+    as no thickness can then hold P. Returns a dict of float64 arrays:
+    'mawp', 't_min' and 'deficit' (t_min - t, positive when the reading is
+    below the required thickness).
+    """
+    t, S, E, D = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (t, S, E, D)))
+    k, c, A = coefficients(np.broadcast_to(component_codes(component), t.shape), D, L, r)
+
+    kSE = k * S * E
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mawp = np.where((t > 0) & (S > 0) & (E > 0) & (D > 0), kSE * t / (A + c * t), np.nan)
+        if P is None:
+            t_min = np.full(t.shape, np.nan)
+        else:
+            P = np.broadcast_to(np.asarray(P, dtype=np.float64), t.shape)
+            denominator = kSE - c * P
+            t_min = np.where((S > 0) & (E > 0) & (D > 0) & (P > 0) & (denominator > 0), P * A / denominator, np.nan)
+
+    return {'mawp': mawp, 't_min': t_min, 'deficit': t_min - t}
+
+
+def governing_mawp(vessel, mawp):
+    """
+    Reduce per-reading MAWP to the governing (minimum) MAWP per vessel.
+
+    Returns (vessels, governing, row): the sorted distinct vessel ids, their
+    minimum MAWP (NaN if every reading of that vessel is NaN) and the index of
+    the governing reading in the input arrays (-1 when all are NaN). Integer
+    vessel ids are much cheaper to group than strings.
+    """
+    vessel = np.asarray(vessel).reshape(-1)
+    mawp = np.asarray(mawp, dtype=np.float64).reshape(-1)
+    vessels, inverse = np.unique(vessel, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    governing = np.full(vessels.size, np.inf)
+    np.fmin.at(governing, inverse, mawp)
+
+    index = np.flatnonzero(mawp == governing[inverse])
+    row = np.full(vessels.size, mawp.size, dtype=np.intp)
+    np.minimum.at(row, inverse[index], index)
+
+    missing = np.isinf(governing) & (row == mawp.size)
+    governing[missing] = np.nan
+    row[row == mawp.size] = -1
+    return vessels, governing, row
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Incremental governing-MAWP service for single-reading edits.
+
+Usage:
+    python scripts/mawp_service.py readings.csv < edits.jsonl
+
+    from mawp_service import MawpService
+    service = MawpService()
+    service.set_component('54-11-067', 'Vessel Shell', kind='shell', D=130.26, S=20000, E=1.0, P=280)
+    service.set_reading('54-11-067', 'Vessel Shell', '12', 0.8006)
+    service.subscribe(print)          # called with every governing-MAWP change event
+
+Every component keeps a min segment tree of its readings' MAWP and every
+vessel a min segment tree of its components' MAWP, so changing, adding or
+removing one reading recomputes that reading's MAWP and walks two tree paths:
+O(log readings + log components) instead of re-evaluating the vessel. The
+governing MAWP and the CML that sets it are always at the vessel tree's root.
+
+The CLI loads a calc_mawp.py-style readings file (with a cml column), then
+reads JSON-lines edits on stdin, {"vessel", "component", "cml", "thickness"}
+(thickness null removes the reading), and writes one JSON-lines event per
+governing-MAWP change.
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+
+INF = math.inf
+GEOMETRY_FIELDS = ('component code', 'D', 'S', 'E', 'P')
+MAX_LISTED_CONFLICTS = 5
+
+
+class MinTree:
+    """Segment tree over integer slots: O(log n) point update, O(1) minimum and argmin."""
+
+    def __init__(self, capacity=1):
+        self.size = 1 << max(0, capacity - 1).bit_length()
+        self.value = [INF] * (2 * self.size)
+        self.arg = [-1] * (2 * self.size)
+        self.arg[self.size:] = range(self.size)
+
+    @property
+    def min(self):
+        return self.value[1]
+
+    @property
+    def argmin(self):
+        """Slot holding the minimum, or -1 when every slot is empty."""
+        return self.arg[1] if self.value[1] < INF else -1
+
+    def _grow(self, slot):
+        leaves = self.value[self.size:]
+        self.__init__(max(slot + 1, 2 * self.size))
+        self.value[self.size:self.size + len(leaves)] = leaves
+        self.build()
+
+    def assign(self, slot, value):
+        """Set a leaf without updating its ancestors; call build() after a batch of assigns."""
+        if slot >= self.size:
+            self._grow(slot)
+        self.value[self.size + slot] = INF if value != value else value
+
+    def build(self):
+        value, arg = self.value, self.arg
+        for i in range(self.size - 1, 0, -1):
+            child = 2 * i if value[2 * i] <= value[2 * i + 1] else 2 * i + 1
+            value[i], arg[i] = value[child], arg[child]
+
+    def update(self, slot, value):
+        """Set one leaf (NaN counts as empty) and repair the path to the root."""
+        if slot >= self.size:
+            self._grow(slot)
+        value_, arg = self.value, self.arg
+        i = self.size + slot
+        value_[i] = INF if value != value else value
+        i //= 2
+        while i:
+            child = 2 * i if value_[2 * i] <= value_[2 * i + 1] else 2 * i + 1
+            if value_[i] == value_[child] and arg[i] == arg[child]:
+                break
+            value_[i], arg[i] = value_[child], arg[child]
+            i //= 2
+
+
+class _Slots:
+    """Stable slot numbers for keys, reusing slots freed by removals."""
+
+    def __init__(self):
+        self.slots = {}
+        self.keys = []
+        self.free = []
+
+    def get(self, key):
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.free.pop() if self.free else len(self.keys)
+            if slot == len(self.keys):
+                self.keys.append(key)
+            else:
+                self.keys[slot] = key
+            self.slots[key] = slot
+        return slot
+
+    def release(self, key):
+        slot = self.slots.pop(key, None)
+        if slot is not None:
+            self.keys[slot] = None
+            self.free.append(slot)
+        return slot
+
+
+class _Component:
+    def __init__(self, kind, D, S, E, P):
+        from mawp_engine import coefficients
+        k, c, A = (float(x[0]) for x in coefficients([kind], [D]))
+        self.kSE, self.c, self.A, self.P = k * S * E, c, A, P
+        self.geometry = (kind, D, S, E, P)
+        self.valid = S > 0 and E > 0 and D > 0 and k == k
+        self.readings = _Slots()
+        self.thickness = {}
+        self.tree = MinTree()
+
+    def mawp(self, t):
+        if not (self.valid and t is not None and t > 0):
+            return math.nan
+        return self.kSE * t / (self.A + self.c * t)
+
+
+class _Vessel:
+    def __init__(self):
+        self.components = {}
+        self.slots = _Slots()
+        self.tree = MinTree()
+
+
+class MawpService:
+    """Governing MAWP per vessel, kept current under single-reading edits."""
+
+    def __init__(self):
+        self.vessels = {}
+        self.listeners = []
+
+    def subscribe(self, callback):
+        """Call callback(event) for every change of a vessel's governing MAWP or governing CML."""
+        self.listeners.append(callback)
+
+    def set_component(self, vessel, component, kind, D, S, E=1.0, P=None):
+        """Define (or redefine) a component's geometry; its existing readings are re-evaluated."""
+        entry = self.vessels.setdefault(vessel, _Vessel())
+        before = self.governing(vessel)
+        part = _Component(kind, float(D), float(S), float(E), P)
+        previous = entry.components.get(component)
+        if previous is not None:
+            part.readings, part.thickness = previous.readings, previous.thickness
+            for cml, slot in part.readings.slots.items():
+                part.tree.assign(slot, part.mawp(part.thickness[cml]))
+            part.tree.build()
+        entry.components[component] = part
+        return self._update_component(vessel, entry, component, before)
+
+    def set_reading(self, vessel, component, cml, thickness):
+        """Add or change one reading. Returns the change event, or None if the governing MAWP did not change."""
+        entry = self.vessels[vessel]
+        part = entry.components[component]
+        before = self.governing(vessel)
+        if thickness is None:
+            slot = part.readings.release(cml)
+            part.thickness.pop(cml, None)
+            if slot is None:
+                return None
+            part.tree.update(slot, INF)
+        else:
+            # Validate and evaluate before touching any state, so a bad value leaves the vessel unchanged
+            thickness = float(thickness)
+            mawp = part.mawp(thickness)
+            slot = part.readings.get(cml)
+            part.thickness[cml] = thickness
+            part.tree.update(slot, mawp)
+        return self._update_component(vessel, entry, component, before)
+
+    def remove_reading(self, vessel, component, cml):
+        return self.set_reading(vessel, component, cml, None)
+
+    def _update_component(self, vessel, entry, component, before):
+        entry.tree.update(entry.slots.get(component), entry.components[component].tree.min)
+        after = self.governing(vessel)
+        if before[:3] == after[:3]:
+            return None
+        event = {'vessel': vessel, 'previous_mawp': before[0], 'mawp': after[0], 'component': after[1],
+                 'cml': after[2], 'pressure': after[3], 'status': _status(after[0], after[3]),
+                 'previous_status': _status(before[0], before[3])}
+        for callback in self.listeners:
+            callback(event)
+        return event
+
+    def governing(self, vessel):
+        """(mawp, component, cml, design_pressure) for a vessel; mawp is None while it has no valid reading."""
+        entry = self.vessels.get(vessel)
+        slot = entry.tree.argmin if entry else -1
+        if slot < 0:
+            return None, None, None, None
+        component = entry.slots.keys[slot]
+        part = entry.components[component]
+        return entry.tree.min, component, part.readings.keys[part.tree.argmin], part.P
+
+    def load(self, chunks):
+        """
+        Bulk-load calc_mawp.iter_inputs() chunks: MAWP is evaluated per chunk
+        with mawp_engine and every tree is built once at the end, O(n) overall.
+        Returns the number of readings loaded.
+
+        A component's geometry (kind, D, S, E, P) comes from its first row.
+        Rows that disagree with it are still loaded with that geometry, and
+        once the trees are built a ValueError lists the conflicts.
+        """
+        from mawp_engine import evaluate
+        touched = set()
+        conflicts = []
+        total = 0
+        for inputs in chunks:
+            mawp = evaluate(t=inputs['t'], S=inputs['S'], E=inputs['E'], D=inputs['D'], component=inputs['code'])['mawp']
+            cmls = inputs['cml'] or [str(i) for i in range(total, total + len(mawp))]
+            geometry = zip(inputs['vessel'], inputs['component'], inputs['code'].tolist(), inputs['D'].tolist(),
+                           inputs['S'].tolist(), inputs['E'].tolist(), inputs['P'].tolist())
+            for (vessel, component, kind, D, S, E, P), cml, t, value in zip(geometry, cmls, inputs['t'].tolist(),
+                                                                           mawp.tolist()):
+                entry = self.vessels.get(vessel)
+                if entry is None:
+                    entry = self.vessels[vessel] = _Vessel()
+                part = entry.components.get(component)
+                if part is None:
+                    part = entry.components[component] = _Component(kind, D, S, E, P)
+                elif part.geometry != (kind, D, S, E, P):
+                    conflicts.extend(
+                        f"{vessel} {component} CML {cml}: {field} {new:g}, component has {old:g}"
+                        for field, old, new in zip(GEOMETRY_FIELDS, part.geometry, (kind, D, S, E, P))
+                        if old != new and (old == old or new == new))
+                part.thickness[cml] = t
+                part.tree.assign(part.readings.get(cml), value)
+                touched.add(vessel)
+            total += len(mawp)
+        for vessel in touched:
+            entry = self.vessels[vessel]
+            for component, part in entry.components.items():
+                part.tree.build()
+                entry.tree.assign(entry.slots.get(component), part.tree.min)
+            entry.tree.build()
+        if conflicts:
+            listed = '; '.join(conflicts[:MAX_LISTED_CONFLICTS])
+            more = len(conflicts) - MAX_LISTED_CONFLICTS
+            raise ValueError(f"{len(conflicts):,} geometry conflict(s) within components: {listed}"
+                             + (f" and {more:,} more" if more > 0 else ""))
+        return total
+
+
+def _status(mawp, pressure):
+    if mawp is None or pressure is None or pressure != pressure:
+        return None
+    return 'SAFE' if mawp >= pressure else 'UNSAFE'
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Keep governing MAWP current under single-reading edits.")
+    parser.add_argument('readings', help="calc_mawp.py-style readings CSV or Parquet with a cml column")
+    parser.add_argument('--stress', type=float, default=20000.0, help="Allowable stress S when not a column (psi)")
+    parser.add_argument('--efficiency', type=float, default=1.0, help="Joint efficiency E when not a column")
+    parser.add_argument('--pressure', type=float, default=280.0, help="Design pressure P when not a column (psi)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from calc_mawp import iter_inputs
+
+    args = parse_args(argv)
+    service = MawpService()
+    started = time.perf_counter()
+    try:
+        loaded = service.load(inputs for _, _, inputs in iter_inputs(
+            args.readings, stress=args.stress, efficiency=args.efficiency, pressure=args.pressure))
+    except ValueError as e:
+        print(f"{args.readings}: {e}", file=sys.stderr)
+        return 1
+    print(f"Loaded {loaded:,} readings for {len(service.vessels):,} vessels in "
+          f"{time.perf_counter() - started:.2f}s", file=sys.stderr)
+
+    service.subscribe(lambda event: print(json.dumps(event), flush=True))
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            edit = json.loads(line)
+            service.set_reading(edit['vessel'], edit['component'], str(edit['cml']), edit.get('thickness'))
+        except (ValueError, KeyError, TypeError) as e:
+            print(json.dumps({'error': f"{type(e).__name__}: {e}", 'request': line.strip()}), flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
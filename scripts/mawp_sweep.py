@@ -0,0 +1,128 @@
+"""
+Monte Carlo sweep of governing MAWP under UT, corrosion allowance and stress uncertainty.
+
+Used by calc_mawp.py --sweep, or directly:
+
+    from mawp_sweep import prepare, sweep, summarize
+    fleet = prepare(vessel, component, t, S, E, D, P)
+    governing = sweep(fleet, trials=10000, ut_sigma=0.005, ca_max=0.0625, stress_sigma=0.03, seed=1, workers=8)
+    for row in summarize(fleet, governing, confidence=0.95): ...
+
+Each trial perturbs every reading independently with N(0, ut_sigma) inches of
+UT error, takes a corrosion allowance uniform on [0, ca_max] inches and a
+stress factor 1 + N(0, stress_sigma) per vessel, and records every vessel's
+governing (minimum) MAWP. Trials run in blocks of about block_elements
+readings as float32 arrays; blocks are spread over a process pool and each
+block draws from its own SeedSequence(seed, spawn_key=(block,)), so results
+depend on the seed, never on the number of workers.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from mawp_engine import coefficients
+
+DEFAULT_BLOCK_ELEMENTS = 2000000
+
+_fleet = None
+
+
+def prepare(vessel, component, t, S, E, D, P):
+    """
+    Sort readings by vessel and precompute per-reading geometry for the sweep.
+
+    Readings whose nominal MAWP is not defined (non-positive inputs or unknown
+    component) are dropped. A vessel's design pressure is the largest P among
+    its readings.
+    """
+    t, S, E, D, P = (np.asarray(x, dtype=np.float64) for x in (t, S, E, D, P))
+    k, c, A = coefficients(component, D)
+    valid = (t > 0) & (S > 0) & (E > 0) & (D > 0) & ~np.isnan(k)
+    vessels, inverse = np.unique(np.asarray(vessel)[valid], return_inverse=True)
+    inverse = inverse.reshape(-1)
+    order = np.argsort(inverse, kind='stable')
+    counts = np.bincount(inverse, minlength=vessels.size)
+    starts = (np.cumsum(counts) - counts).astype(np.intp)
+    pressure = np.full(vessels.size, -np.inf)
+    np.maximum.at(pressure, inverse, P[valid])
+
+    def sort(values):
+        return np.ascontiguousarray(values[valid][order], dtype=np.float32)
+
+    t, kSE, c, A = sort(t), sort(k * S * E), sort(c), sort(A)
+    nominal = np.minimum.reduceat(kSE * t / (A + c * t), starts) if vessels.size else np.empty(0, dtype=np.float32)
+    return {'vessels': vessels, 'starts': starts, 'counts': counts, 'pressure': pressure, 'nominal': nominal,
+            't': t, 'kSE': kSE, 'c': c, 'A': A}
+
+
+def _init(fleet):
+    global _fleet
+    _fleet = fleet
+
+
+def _run_block(block, trials, seed, ut_sigma, ca_max, stress_sigma):
+    """Governing MAWP for trials trials of every vessel, as a (trials, vessels) float32 array."""
+    fleet = _fleet
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block,)))
+    n, vessels = fleet['t'].size, fleet['starts'].size
+
+    t = rng.standard_normal((trials, n), dtype=np.float32)
+    t *= np.float32(ut_sigma)
+    t += fleet['t']
+    if ca_max:
+        allowance = rng.random((trials, vessels), dtype=np.float32) * np.float32(ca_max)
+        t -= np.repeat(allowance, fleet['counts'], axis=1)
+    np.maximum(t, 0, out=t)
+
+    mawp = t * fleet['kSE']
+    if stress_sigma:
+        factor = 1 + rng.standard_normal((trials, vessels), dtype=np.float32) * np.float32(stress_sigma)
+        mawp *= np.repeat(np.maximum(factor, 0), fleet['counts'], axis=1)
+    t *= fleet['c']
+    t += fleet['A']
+    mawp /= t
+    return block, np.minimum.reduceat(mawp, fleet['starts'], axis=1)
+
+
+def sweep(fleet, trials, ut_sigma=0.0, ca_max=0.0, stress_sigma=0.0, seed=0, workers=1,
+          block_elements=DEFAULT_BLOCK_ELEMENTS):
+    """Run trials and return the (trials, vessels) float32 array of governing MAWP."""
+    per_block = max(1, block_elements // max(1, fleet['t'].size))
+    blocks = [(i, min(per_block, trials - start)) for i, start in enumerate(range(0, trials, per_block))]
+    governing = np.empty((trials, fleet['starts'].size), dtype=np.float32)
+    args = (seed, ut_sigma, ca_max, stress_sigma)
+    pool = None
+    if workers <= 1 or len(blocks) == 1:
+        _init(fleet)
+        completed = (_run_block(block, n, *args) for block, n in blocks)
+    else:
+        # The fleet arrays are sent once per worker, not once per block.
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init, initargs=(fleet,))
+        completed = pool.map(_run_block, *zip(*((block, n) + args for block, n in blocks)))
+    try:
+        for block, values in completed:
+            start = block * per_block
+            governing[start:start + values.shape[0]] = values
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return governing
+
+
+def summarize(fleet, governing, confidence=0.95):
+    """
+    Yield one dict per vessel with the governing MAWP distribution.
+
+    'p_unsafe' is the fraction of trials below design pressure and
+    'rated_pressure' the pressure the vessel holds in the given fraction of
+    trials, capped at design pressure: below design pressure it is the
+    de-rate pressure.
+    """
+    low, median, high, lower = np.quantile(governing, [0.05, 0.5, 0.95, 1 - confidence], axis=0)
+    p_unsafe = (governing < fleet['pressure'].astype(np.float32)).mean(axis=0)
+    for i, vessel in enumerate(fleet['vessels'].tolist()):
+        yield {'vessel': vessel, 'design_pressure': float(fleet['pressure'][i]),
+               'nominal_mawp': float(fleet['nominal'][i]), 'mean_mawp': float(governing[:, i].mean()),
+               'p05_mawp': float(low[i]), 'p50_mawp': float(median[i]), 'p95_mawp': float(high[i]),
+               'p_unsafe': float(p_unsafe[i]), 'rated_pressure': float(min(lower[i], fleet['pressure'][i]))}
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Compact memory-mapped store for fleet thickness readings.
+
+Usage:
+    python scripts/readings_store.py build fleet.readings history.csv more.csv
+    python scripts/readings_store.py build fleet.readings readings.csv --vessel 54-11-001 --date 2017-06-20 --append
+    python scripts/readings_store.py info fleet.readings
+    python scripts/readings_store.py export fleet.readings -o history.csv --vessel 54-11-067
+
+    from readings_store import ReadingsStore
+    store = ReadingsStore('fleet.readings')          # maps the file, reads nothing yet
+    shell = store.select(vessel='54-11-067')
+    keys, surveys, thickness = store.pivot()         # corrosion_engine.evaluate() input
+
+A store is a directory holding readings.npy, one 20-byte record per reading
+
+    vessel, component, cml   uint32 ids into strings.json
+    date                     int32 days since 1970-01-01 (NO_DATE if unknown)
+    thickness                float32 inches
+
+sorted by (vessel, component, cml, date), so every vessel, component and CML
+is a contiguous run found with np.searchsorted and a CML's latest reading is
+the last row of its run. readings.npy is opened with np.load(mmap_mode='r'):
+opening a store of millions of readings costs a few page faults, and worker
+processes that open the same store share the operating system's page cache
+instead of each holding a copy. A ReadingsStore pickles as its path, so
+passing one to a ProcessPoolExecutor re-maps it in the worker with no copy.
+
+strings.json only ever grows, so ids stay valid when readings are appended.
+Both files are written to a temporary name and renamed into place.
+
+Inputs are CSVs with vessel, component, cml, date and thickness columns (the
+corrosion_engine.py history shape; the calc_mawp.py and tml_tables.py column
+names are accepted too). --vessel and --date fill in a column a file lacks,
+e.g. tml_tables.py output for one report. Dates may be YYYY-MM-DD or
+MM/DD/YYYY.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+READINGS_FILE = 'readings.npy'
+STRINGS_FILE = 'strings.json'
+STRING_FIELDS = ('vessel', 'component', 'cml')
+READING_DTYPE = np.dtype([('vessel', '<u4'), ('component', '<u4'), ('cml', '<u4'),
+                          ('date', '<i4'), ('thickness', '<f4')])
+NO_DATE = np.iinfo(np.int32).min
+DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y', '%Y/%m/%d')
+COLUMN_ALIASES = {
+    'vessel': ('vessel', 'vessel_id', 'vesselTagNumber'),
+    'component': ('component', 'componentType'),
+    'cml': ('cml', 'cmlNumber', 'tml', 'legacyLocationId'),
+    'date': ('date', 'inspectionDate', 'readingDate', 'surveyDate'),
+    'thickness': ('thickness', 'current', 't', 'currentThickness'),
+}
+DEFAULT_CHUNK_ROWS = 100000
+
+
+def parse_date(text):
+    """Days since 1970-01-01 for a YYYY-MM-DD or MM/DD/YYYY date, or NO_DATE."""
+    text = text.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return (datetime.strptime(text, fmt).date() - datetime(1970, 1, 1).date()).days
+        except ValueError:
+            continue
+    return NO_DATE
+
+
+def date_days(dates, parsed=None):
+    """Days since 1970-01-01 (int32) for a sequence of date strings; unparseable dates give NO_DATE."""
+    parsed = {} if parsed is None else parsed
+    days = np.empty(len(dates), dtype=np.int32)
+    for i, text in enumerate(dates):
+        day = parsed.get(text)
+        if day is None:
+            day = parsed[text] = parse_date(text)
+        days[i] = day
+    return days
+
+
+def to_datetime64(days):
+    """int32 day numbers to datetime64[D], NO_DATE to NaT."""
+    days = np.asarray(days)
+    return np.where(days == NO_DATE, np.datetime64('NaT'), days.astype('datetime64[D]'))
+
+
+class _Strings:
+    """Append-only interning of names to ids, one table per string field."""
+
+    def __init__(self, tables=None):
+        # Dicts keep insertion order, so each dict's keys are its names in id order.
+        self.ids = {field: {name: i for i, name in enumerate((tables or {}).get(field, ()))}
+                    for field in STRING_FIELDS}
+
+    @property
+    def names(self):
+        return {field: list(ids) for field, ids in self.ids.items()}
+
+    def intern(self, field, values):
+        """uint32 ids for a sequence of names, adding unseen names to the table."""
+        ids = self.ids[field]
+        return np.fromiter((ids.setdefault(name, len(ids)) for name in values), dtype=np.uint32, count=len(values))
+
+
+class ReadingsStore:
+    """Read-only view of a readings store directory; the readings array is memory-mapped."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.readings = np.load(self.path / READINGS_FILE, mmap_mode='r')
+        if self.readings.dtype != READING_DTYPE:
+            raise ValueError(f"{self.path}: unexpected record layout {self.readings.dtype}")
+        self._strings = None
+
+    def __reduce__(self):
+        # Pickle as the path: a worker process maps the same file instead of receiving a copy.
+        return type(self), (str(self.path),)
+
+    def __len__(self):
+        return self.readings.shape[0]
+
+    @property
+    def strings(self):
+        if self._strings is None:
+            with open(self.path / STRINGS_FILE, encoding='utf-8') as f:
+                tables = json.load(f)
+            self._strings = {field: np.array(tables[field], dtype=str) for field in STRING_FIELDS}
+        return self._strings
+
+    def id(self, field, name):
+        """Id of a vessel, component or CML name, or -1 if the store has none."""
+        matches = np.flatnonzero(self.strings[field] == name)
+        return int(matches[0]) if matches.size else -1
+
+    def names(self, field, ids=None):
+        """Names for an array of ids of a string field (every id of the field by default)."""
+        table = self.strings[field]
+        return table if ids is None else table[np.asarray(ids, dtype=np.intp)]
+
+    def dates(self, readings=None):
+        return to_datetime64((self.readings if readings is None else readings)['date'])
+
+    def select(self, vessel=None, component=None):
+        """
+        The contiguous slice of readings for a vessel (and component), still memory-mapped.
+
+        Both lookups are binary searches over the sorted id columns.
+        """
+        readings = self.readings
+        for field, name in (('vessel', vessel), ('component', component)):
+            if name is None:
+                continue
+            if field == 'component' and vessel is None:
+                raise ValueError("selecting a component needs a vessel")
+            code = self.id(field, name)
+            if code < 0:
+                return readings[:0]
+            column = readings[field]
+            readings = readings[np.searchsorted(column, code, 'left'):np.searchsorted(column, code, 'right')]
+        return readings
+
+    def runs(self, readings=None):
+        """Start index of every (vessel, component, cml) run; readings[starts] identifies each CML."""
+        readings = self.readings if readings is None else readings
+        if readings.shape[0] == 0:
+            return np.empty(0, dtype=np.intp)
+        change = np.zeros(readings.shape[0], dtype=bool)
+        change[0] = True
+        for field in STRING_FIELDS:
+            column = readings[field]
+            change[1:] |= column[1:] != column[:-1]
+        return np.flatnonzero(change)
+
+    def latest(self, readings=None):
+        """Index of the most recent reading of every CML (the last row of its run)."""
+        readings = self.readings if readings is None else readings
+        starts = self.runs(readings)
+        return np.append(starts[1:], readings.shape[0]) - 1 if starts.size else starts
+
+    def pivot(self, readings=None):
+        """
+        (cmls, dates, thickness) ready for corrosion_engine.evaluate().
+
+        cmls is a structured array of the (vessel, component, cml) ids of each
+        row; dates the sorted distinct survey dates and thickness the
+        (cmls x dates) float64 table with NaN where a CML was not read. A
+        repeated (CML, date) keeps the minimum reading, as in corrosion_engine.pivot.
+        """
+        readings = self.readings if readings is None else readings
+        starts = self.runs(readings)
+        row = np.zeros(readings.shape[0], dtype=np.intp)
+        row[starts] = 1
+        row = np.cumsum(row) - 1
+        surveys, column = np.unique(readings['date'], return_inverse=True)
+        table = np.full((starts.size, surveys.size), np.inf)
+        np.fmin.at(table, (row, column.reshape(-1)), readings['thickness'].astype(np.float64))
+        table[np.isinf(table)] = np.nan
+        cmls = np.asarray(readings[list(STRING_FIELDS)][starts])
+        return cmls, to_datetime64(surveys), table
+
+    def keys(self, cmls):
+        """'vessel\\tcomponent\\tcml' keys for pivot() rows, as corrosion_engine.read_history() builds them."""
+        keys = self.names('vessel', cmls['vessel'])
+        for field in ('component', 'cml'):
+            keys = np.char.add(np.char.add(keys, '\t'), self.names(field, cmls[field]))
+        return keys
+
+
+def resolve_columns(header, defaults=()):
+    """Map store fields to header positions; fields with a default value may be missing."""
+    positions = {name: i for i, name in enumerate(header)}
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        index = next((positions[a] for a in aliases if a in positions), None)
+        if index is not None:
+            columns[field] = index
+    missing = [field for field in COLUMN_ALIASES if field not in columns and field not in defaults]
+    if missing:
+        raise ValueError(f"missing column(s): {', '.join(missing)} (header: {', '.join(header)})")
+    return columns
+
+
+def iter_records(path, strings, defaults=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield READING_DTYPE arrays of at most chunk_rows readings from a CSV, interning names into strings."""
+    defaults = defaults or {}
+    parsed = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        columns = resolve_columns(header, defaults)
+        while True:
+            chunk = list(islice(reader, chunk_rows))
+            if not chunk:
+                return
+            rows = [row for row in chunk if row]
+            if not rows:
+                continue
+            if min(map(len, rows)) < len(header):
+                # Short rows are padded so the transpose below keeps every column.
+                rows = [row + [''] * (len(header) - len(row)) for row in rows]
+            values = list(zip(*rows))
+
+            def column(field):
+                index = columns.get(field)
+                return values[index] if index is not None else [defaults[field]] * len(rows)
+
+            records = np.empty(len(rows), dtype=READING_DTYPE)
+            for field in STRING_FIELDS:
+                records[field] = strings.intern(field, column(field))
+            records['date'] = date_days(column('date'), parsed)
+            thickness = np.array([_float(value) for value in column('thickness')], dtype=np.float32)
+            records['thickness'] = thickness
+            yield records[~np.isnan(thickness)]
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _replace(path, write):
+    temporary = path.with_name(path.name + '.tmp')
+    with open(temporary, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def build(store_path, inputs, defaults=None, append=False, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Write (or extend) a store from readings CSVs. Returns (readings in store, readings added).
+
+    Readings are sorted by (vessel, component, cml, date, thickness) and exact
+    duplicates dropped, so importing the same file twice is harmless.
+    """
+    store_path = Path(store_path)
+    store_path.mkdir(parents=True, exist_ok=True)
+    existing, tables = np.empty(0, dtype=READING_DTYPE), None
+    if append and (store_path / READINGS_FILE).exists():
+        existing = np.load(store_path / READINGS_FILE)
+        with open(store_path / STRINGS_FILE, encoding='utf-8') as f:
+            tables = json.load(f)
+    strings = _Strings(tables)
+    chunks = [existing]
+    for path in inputs:
+        chunks.extend(iter_records(path, strings, defaults, chunk_rows))
+    readings = np.concatenate(chunks)
+    readings = readings[np.lexsort([readings[field] for field in reversed(READING_DTYPE.names)])]
+    if readings.shape[0]:
+        readings = readings[np.concatenate([[True], readings[1:] != readings[:-1]])]
+
+    # Strings first: they only grow, so a reader never sees ids without names.
+    _replace(store_path / STRINGS_FILE, lambda f: f.write(json.dumps(strings.names).encode('utf-8')))
+    _replace(store_path / READINGS_FILE, lambda f: np.save(f, readings))
+    return readings.shape[0], readings.shape[0] - existing.shape[0]
+
+
+def export(store, path, readings=None):
+    """Write readings as a corrosion_engine.py history CSV."""
+    readings = store.readings if readings is None else readings
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['vessel', 'component', 'cml', 'date', 'thickness'])
+        columns = [store.names(field, readings[field]).tolist() for field in STRING_FIELDS]
+        dates = np.datetime_as_string(store.dates(readings)).tolist()
+        thickness = [f"{t:.4f}" for t in readings['thickness'].tolist()]
+        writer.writerows(zip(*columns, ['' if d == 'NaT' else d for d in dates], thickness))
+    return readings.shape[0]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compact memory-mapped store for fleet thickness readings.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_ = commands.add_parser('build', help="Create a store from readings CSVs, or add to one")
+    build_.add_argument('store', help="Store directory")
+    build_.add_argument('inputs', nargs='+', help="CSV files with vessel, component, cml, date, thickness columns")
+    build_.add_argument('--append', action='store_true', help="Keep the store's existing readings")
+    build_.add_argument('--vessel', help="Vessel for files without a vessel column")
+    build_.add_argument('--component', help="Component for files without a component column")
+    build_.add_argument('--date', help="Survey date for files without a date column")
+    build_.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"Rows parsed per chunk (default: {DEFAULT_CHUNK_ROWS})")
+
+    info = commands.add_parser('info', help="Summarize a store")
+    info.add_argument('store', help="Store directory")
+
+    export_ = commands.add_parser('export', help="Write a store (or one vessel) as a history CSV")
+    export_.add_argument('store', help="Store directory")
+    export_.add_argument('-o', '--output', default='history.csv', help="Output CSV (default: history.csv)")
+    export_.add_argument('--vessel', help="Only this vessel's readings")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+
+    if args.command == 'build':
+        defaults = {field: getattr(args, field) for field in ('vessel', 'component', 'date')
+                    if getattr(args, field) is not None}
+        try:
+            total, added = build(args.store, args.inputs, defaults, append=args.append, chunk_rows=args.chunk_rows)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"{added:+,} readings, {total:,} in store in {time.perf_counter() - started:.2f}s -> {args.store}")
+        return 0
+
+    store = ReadingsStore(args.store)
+    if args.command == 'info':
+        readings = store.readings
+        dates = store.dates()
+        dates = dates[~np.isnat(dates)]
+        print(f"{args.store}: {len(store):,} readings, {store.runs().size:,} CMLs, "
+              f"{store.strings['vessel'].size:,} vessels, {readings.nbytes / 2**20:.1f} MiB")
+        if dates.size:
+            print(f"Survey dates {dates.min()} to {dates.max()}, {np.unique(dates).size} distinct")
+        print(f"Opened and scanned in {time.perf_counter() - started:.3f}s")
+        return 0
+
+    readings = store.select(vessel=args.vessel) if args.vessel else None
+    written = export(store, args.output, readings)
+    print(f"{written:,} readings in {time.perf_counter() - started:.2f}s -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Local full-text index over extracted inspection reports.
+
+Usage:
+    python scripts/report_index.py index REPORTS_DIR extracted/ --db reports.db
+    python scripts/report_index.py query 54-11-004 nozzle --db reports.db
+    python scripts/report_index.py query '"West Head" AND CML' --raw --db reports.db
+
+Pages are stored in a SQLite FTS5 table keyed by file and page. Indexing is
+incremental: a file whose size and mtime match the stored row is skipped, and
+a changed file has its pages replaced in a single transaction. FTS5 cannot
+index document_id, so page_documents maps each document to its page rowids
+and pages are deleted by rowid rather than by scanning the whole table. PDFs are read
+through extract.iter_pages and the shared extraction cache, so files already
+extracted by extract.py are indexed without re-running PyPDF2. Text outputs
+(.txt, .log) are split on the "[Page N]" markers written by --targeted, or
+indexed as one page.
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+DEFAULT_DB = "reports.db"
+TEXT_SUFFIXES = {'.txt', '.log'}
+
+_PAGE_MARKER = re.compile(r'^\[Page (\d+)\]$', re.MULTILINE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    page_count INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5(
+    text,
+    document_id UNINDEXED,
+    page UNINDEXED,
+    tokenize = "unicode61 tokenchars '-'"
+);
+CREATE TABLE IF NOT EXISTS page_documents (
+    page_rowid INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS page_documents_by_document ON page_documents (document_id);
+"""
+
+
+def connect(db_path):
+    conn = sqlite3.connect(db_path)
+    mapped = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'page_documents'").fetchone()
+    try:
+        conn.executescript(SCHEMA)
+    except sqlite3.OperationalError as e:
+        conn.close()
+        raise RuntimeError(f"SQLite build without FTS5 support: {e}") from e
+    if not mapped:
+        # An index built before page_documents existed: map its pages once.
+        with conn:
+            conn.execute("INSERT INTO page_documents (page_rowid, document_id) SELECT rowid, document_id FROM pages")
+    return conn
+
+
+def delete_pages(conn, document_ids):
+    """Delete the pages of documents by rowid, found through page_documents."""
+    for document_id in document_ids:
+        rowids = conn.execute("SELECT page_rowid FROM page_documents WHERE document_id = ?",
+                              (document_id,)).fetchall()
+        conn.executemany("DELETE FROM pages WHERE rowid = ?", rowids)
+        conn.execute("DELETE FROM page_documents WHERE document_id = ?", (document_id,))
+
+
+def iter_text_pages(path):
+    """Yield (page_number, text) from an extracted text file."""
+    text = Path(path).read_text(encoding='utf-8', errors='replace')
+    markers = list(_PAGE_MARKER.finditer(text))
+    if not markers:
+        yield 1, text
+        return
+    for marker, following in zip(markers, markers[1:] + [None]):
+        end = following.start() if following else len(text)
+        yield int(marker.group(1)), text[marker.end():end]
+
+
+def iter_document_pages(path, cache=None):
+    if Path(path).suffix.lower() == '.pdf':
+        from extract import iter_pages
+        return iter_pages(path, cache=cache)
+    return iter_text_pages(path)
+
+
+def index_file(conn, path, cache=None, force=False, pages=None):
+    """
+    Index one file if it is new or changed. Returns the number of pages written, or None if skipped.
+    pages, an iterable of (page_number, text) already extracted from the file, replaces reading it.
+    """
+    path = str(Path(path).resolve())
+    stat = os.stat(path)
+    row = conn.execute("SELECT id, size, mtime FROM documents WHERE path = ?", (path,)).fetchone()
+    if row and not force and row[1] == stat.st_size and row[2] == stat.st_mtime:
+        return None
+
+    if pages is None:
+        pages = iter_document_pages(path, cache)
+    count = 0
+    with conn:
+        if row:
+            document_id = row[0]
+            delete_pages(conn, [document_id])
+        else:
+            document_id = conn.execute(
+                "INSERT INTO documents (path, size, mtime, page_count, indexed_at) VALUES (?, 0, 0, 0, 0)",
+                (path,)).lastrowid
+        for page_number, text in pages:
+            rowid = conn.execute("INSERT INTO pages (text, document_id, page) VALUES (?, ?, ?)",
+                                 (text, document_id, page_number)).lastrowid
+            conn.execute("INSERT INTO page_documents (page_rowid, document_id) VALUES (?, ?)", (rowid, document_id))
+            count += 1
+        conn.execute("UPDATE documents SET size = ?, mtime = ?, page_count = ?, indexed_at = ? WHERE id = ?",
+                     (stat.st_size, stat.st_mtime, count, time.time(), document_id))
+    return count
+
+
+def prune(conn):
+    """Drop documents whose files no longer exist. Returns how many were removed."""
+    missing = [doc_id for doc_id, path in conn.execute("SELECT id, path FROM documents")
+               if not os.path.exists(path)]
+    with conn:
+        delete_pages(conn, missing)
+        conn.executemany("DELETE FROM documents WHERE id = ?", [(doc_id,) for doc_id in missing])
+    return len(missing)
+
+
+def update_index(db_path, paths, cache=None, force=False, pages=None):
+    """
+    Index paths incrementally, printing one line per changed file. Returns (indexed, skipped, failed).
+    pages maps a path to its already extracted (page_number, text) pairs; other paths are read.
+    """
+    conn = connect(db_path)
+    indexed = skipped = failed = 0
+    try:
+        for path in paths:
+            try:
+                count = index_file(conn, path, cache=cache, force=force, pages=(pages or {}).get(path))
+            except Exception as e:
+                print(f"Error indexing {path}: {type(e).__name__}: {e}")
+                failed += 1
+                continue
+            if count is None:
+                skipped += 1
+            else:
+                indexed += 1
+                print(f"Indexed: {path} ({count} pages)")
+    finally:
+        conn.close()
+    return indexed, skipped, failed
+
+
+def to_match_expression(terms):
+    """Quote each term so tags like 54-11-004 and readings like 0.516 are matched literally."""
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def search(db_path, expression, limit=20):
+    """Return (path, page, snippet) rows for an FTS5 match expression, best match first."""
+    conn = connect(db_path)
+    try:
+        return conn.execute(
+            """
+            SELECT documents.path, pages.page, snippet(pages, 0, '[', ']', '...', 12)
+            FROM pages JOIN documents ON documents.id = pages.document_id
+            WHERE pages MATCH ?
+            ORDER BY rank
+            LIMIT ?
+            """, (expression, limit)).fetchall()
+    finally:
+        conn.close()
+
+
+def find_inputs(inputs):
+    found = []
+    for item in inputs:
+        path = Path(item)
+        candidates = sorted(path.rglob('*')) if path.is_dir() else [path]
+        found.extend(p for p in candidates if p.is_file() and p.suffix.lower() in TEXT_SUFFIXES | {'.pdf'})
+    return found
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Full-text index over extracted inspection reports.")
+    parser.add_argument('--db', default=DEFAULT_DB, help=f"Index database (default: {DEFAULT_DB})")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    index = commands.add_parser('index', help="Add new or changed PDFs / extracted text to the index")
+    index.add_argument('inputs', nargs='+', help="PDF or text files, or directories")
+    index.add_argument('--force', action='store_true', help="Re-index files even if unchanged")
+    index.add_argument('--prune', action='store_true', help="Remove files that no longer exist")
+    index.add_argument('--cache-dir', help="Extraction cache to read PDF pages from (default: extract.py's)")
+    index.add_argument('--no-cache', action='store_true', help="Extract PDF pages without the extraction cache")
+
+    query = commands.add_parser('query', help="Search indexed pages")
+    query.add_argument('terms', nargs='+', help="Terms that must all appear on the page")
+    query.add_argument('--raw', action='store_true', help="Treat the terms as an FTS5 match expression")
+    query.add_argument('-n', '--limit', type=int, default=20, help="Maximum results (default: 20)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command == 'index':
+        cache = None
+        if not args.no_cache:
+            from extract import DEFAULT_CACHE_DIR, EXTRACTOR_VERSION
+            from extraction_cache import ExtractionCache
+            cache = ExtractionCache(args.cache_dir or DEFAULT_CACHE_DIR, EXTRACTOR_VERSION)
+        started = time.perf_counter()
+        indexed, skipped, failed = update_index(args.db, find_inputs(args.inputs), cache=cache, force=args.force)
+        removed = 0
+        if args.prune:
+            conn = connect(args.db)
+            try:
+                removed = prune(conn)
+            finally:
+                conn.close()
+        print(f"{indexed} indexed, {skipped} unchanged, {failed} failed, {removed} pruned "
+              f"in {time.perf_counter() - started:.1f}s -> {args.db}")
+        return 0 if failed == 0 else 1
+
+    expression = ' '.join(args.terms) if args.raw else to_match_expression(args.terms)
+    started = time.perf_counter()
+    try:
+        rows = search(args.db, expression, args.limit)
+    except sqlite3.OperationalError as e:
+        print(f"Invalid query {expression!r}: {e}")
+        return 1
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for path, page, snippet in rows:
+        print(f"{path}:{page}: {' '.join(snippet.split())}")
+    print(f"{len(rows)} result(s) in {elapsed_ms:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
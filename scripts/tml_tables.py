@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Recognize CML/TML thickness reading tables in extracted report text.
+
+Usage:
+    python scripts/tml_tables.py extracted/ reports/*.pdf -o readings.csv
+    python scripts/tml_tables.py extracted/ -o readings.csv --npy readings_npy/ --parquet readings.parquet
+
+Inputs may be extracted text (.txt, .log, .md) or PDFs, which are run through
+extract.iter_pages. Every input is read one line or one page at a time and
+rows are written as soon as they are recognized, so a whole fleet's reports
+are processed in a single streaming pass.
+
+Two table shapes are recognized:
+  - whitespace tables from PDF text, headed by a line starting with "CML" or
+    "TML" whose columns include "tml-N", "t act", "t prev", "t nom" or angles
+    such as "90°" (e.g. "CML Comp ID Location Service tml-1 ... t act");
+  - markdown pipe tables whose header has a CML/TML/Noz. column and at least
+    one thickness column.
+
+When a table only has individual readings, current thickness is the minimum
+reading, matching how t act is reported.
+"""
+
+import argparse
+import csv
+import re
+import shutil
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+
+COLUMNS = ['source', 'page', 'cml', 'component', 'location', 'nominal', 'previous', 'current']
+NUMERIC_COLUMNS = ['page', 'nominal', 'previous', 'current']
+TEXT_SUFFIXES = {'.txt', '.log', '.md'}
+PARQUET_BATCH_ROWS = 10000
+NPY_CHUNK_ROWS = 100000
+
+_PAGE_MARKER = re.compile(r'^\[Page (\d+)\]$')
+_HEADER = re.compile(r'^\s*(?:CML|TML)\b.*?(?:\btml-\d|\bt\s*act\b|\bt\s*prev\b|\bt\s*nom\b|°)', re.IGNORECASE)
+_HEADER_TOKENS = re.compile(r'tml-\d+|t\s*(?:act|prev|nom|min)\b|\d+°(?:\s*or\s*Single)?', re.IGNORECASE)
+_ROW = re.compile(r'^\s*(N?\d{1,4}[A-Z]?)\s+(.*?)\s*((?:(?<![^\s])(?:\d*\.\d+|N/A)\s*)*)$', re.IGNORECASE)
+_NUMBER = re.compile(r'^\d*\.\d+$')
+_COMPONENT = re.compile(
+    r'^((?:(?:Vessel|Bttm|Bottom|Top|North|South|East|West|Upper|Lower|Left|Right)\s+)?'
+    r'(?:Shell|Head|Boot|Cone|Nozzle|Manway))\b\s*(.*)$', re.IGNORECASE)
+
+_PIPE_ROLES = [
+    ('cml', re.compile(r'^(?:cml|tml|noz\.?|nozzle)(?:\s*(?:#|no\.?|id))?$', re.IGNORECASE)),
+    ('component', re.compile(r'^(?:component|comp\.?(?:\s*id)?)$', re.IGNORECASE)),
+    ('location', re.compile(r'^(?:location|desc\.?|description|service)$', re.IGNORECASE)),
+    ('nominal', re.compile(r'^(?:nominal|t\s*nom|nom\.?)(?:\s*\(in\.?\))?$', re.IGNORECASE)),
+    ('previous', re.compile(r'^(?:previous|prev\.?|t\s*prev)(?:\s*\(in\.?\))?$', re.IGNORECASE)),
+    ('current', re.compile(r'^(?:current|actual|t\s*act|thickness)(?:\s*\(in\.?\))?$', re.IGNORECASE)),
+    ('reading', re.compile(r'^(?:tml-\d+|\d+°.*)$', re.IGNORECASE)),
+]
+
+
+def _number(text):
+    text = text.strip()
+    return float(text) if _NUMBER.match(text) else None
+
+
+def split_component(text):
+    """Split row text into (component, location), e.g. "Bttm Head" or "East Head 12 O'Clock"."""
+    match = _COMPONENT.match(text.strip())
+    if match:
+        return match.group(1), match.group(2).strip()
+    return '', text.strip()
+
+
+def _row(source, page, cml, component, location, nominal=None, previous=None, current=None, readings=()):
+    readings = [r for r in readings if r is not None]
+    if current is None and readings:
+        current = min(readings)
+    if current is None:
+        return None
+    if not component and cml.upper().startswith('N'):
+        component = 'Nozzle'
+    return {'source': source, 'page': page, 'cml': cml, 'component': component, 'location': location,
+            'nominal': nominal, 'previous': previous, 'current': current}
+
+
+class _WhitespaceTable:
+    """Rows following a PDF-text header, with numeric columns mapped by header position."""
+
+    def __init__(self, header):
+        roles = [{'tact': 'current', 'tprev': 'previous', 'tnom': 'nominal', 'tmin': None}
+                 .get(token.lower().replace(' ', ''), 'reading') for token in _HEADER_TOKENS.findall(header)]
+        # Columns before and after the individual readings, e.g. "t nom tml-1 ... tml-4 t act".
+        self.prefix = []
+        while roles and roles[0] != 'reading':
+            self.prefix.append(roles.pop(0))
+        self.suffix = []
+        while roles and roles[-1] != 'reading':
+            self.suffix.insert(0, roles.pop())
+
+    def parse(self, line, source, page):
+        match = _ROW.match(line)
+        if not match or not match.group(2) or _NUMBER.match(match.group(2)):
+            return False, None
+        cml, text, numbers = match.groups()
+        values = [_number(v) for v in numbers.split()]
+        # Blank readings collapse in extracted text, so fill the outer columns first.
+        fields = {}
+        suffix = self.suffix[-len(values):] if values else []
+        for role, value in zip(suffix, values[len(values) - len(suffix):]):
+            if role:
+                fields[role] = value
+        values = values[:len(values) - len(suffix)]
+        prefix = self.prefix[:len(values)]
+        for role, value in zip(prefix, values):
+            if role:
+                fields[role] = value
+        fields['readings'] = values[len(prefix):]
+        component, location = split_component(text)
+        return True, _row(source, page, cml, component, location, **fields)
+
+
+class _PipeTable:
+    """Markdown table rows, mapped by header cell names."""
+
+    def __init__(self, cells):
+        self.roles = []
+        for cell in cells:
+            role = next((name for name, pattern in _PIPE_ROLES if pattern.match(cell.strip())), None)
+            self.roles.append(role)
+
+    @staticmethod
+    def cells(line):
+        stripped = line.strip()
+        if not (stripped.startswith('|') and stripped.endswith('|')):
+            return None
+        return [cell.strip() for cell in stripped[1:-1].split('|')]
+
+    def is_tml_table(self):
+        roles = set(self.roles)
+        return 'cml' in roles and bool(roles & {'current', 'previous', 'nominal', 'reading'})
+
+    def parse(self, line, source, page):
+        cells = self.cells(line)
+        if cells is None:
+            return False, None
+        if all(set(cell) <= set('-: ') for cell in cells):
+            return True, None  # separator row
+        fields = {'readings': [], 'component': '', 'location': ''}
+        cml = ''
+        for role, cell in zip(self.roles, cells):
+            if role == 'cml':
+                cml = cell
+            elif role in ('component', 'location'):
+                fields[role] = f"{fields[role]} {cell}".strip()
+            elif role == 'reading':
+                fields['readings'].append(_number(cell))
+            elif role:
+                fields[role] = _number(cell)
+        if not cml:
+            return True, None
+        if not fields['component']:
+            fields['component'], fields['location'] = split_component(fields['location'])
+        return True, _row(source, page, cml, **fields)
+
+
+def parse_lines(lines, source='', page=None):
+    """
+    Yield reading rows (dicts keyed by COLUMNS) from an iterable of text lines.
+
+    "[Page N]" marker lines written by extract.py --targeted update the page
+    number; otherwise the page argument is used.
+    """
+    table = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        marker = _PAGE_MARKER.match(line.strip())
+        if marker:
+            page = int(marker.group(1))
+            table = None
+            continue
+        if table is not None:
+            in_table, row = table.parse(line, source, page)
+            if in_table:
+                if row is not None:
+                    yield row
+                continue
+            table = None
+        cells = _PipeTable.cells(line)
+        if cells is not None:
+            candidate = _PipeTable(cells)
+            if candidate.is_tml_table():
+                table = candidate
+        elif _HEADER.match(line):
+            table = _WhitespaceTable(line)
+
+
+def iter_readings(path):
+    """Stream rows from one input file, reading text line by line and PDFs page by page."""
+    path = Path(path)
+    if path.suffix.lower() == '.pdf':
+        from extract import iter_pages
+        for page_number, text in iter_pages(path):
+            yield from parse_lines(text.splitlines(), source=path.name, page=page_number)
+    else:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            yield from parse_lines(f, source=path.name)
+
+
+def find_inputs(inputs):
+    found = []
+    for item in inputs:
+        path = Path(item)
+        candidates = sorted(path.rglob('*')) if path.is_dir() else [path]
+        found.extend(p for p in candidates
+                     if p.is_file() and p.suffix.lower() in TEXT_SUFFIXES | {'.pdf'})
+    return found
+
+
+class ColumnarWriter:
+    """
+    Fan rows out to CSV (streamed), per-column .npy files and Parquet row groups.
+
+    .npy columns are saved as parts of NPY_CHUNK_ROWS rows and copied into one
+    array per column on close, so memory is bounded by a chunk, not the run.
+    """
+
+    def __init__(self, csv_path, npy_dir=None, parquet_path=None):
+        self.csv_file = open(csv_path, 'w', newline='', encoding='utf-8')
+        self.csv = csv.DictWriter(self.csv_file, fieldnames=COLUMNS)
+        self.csv.writeheader()
+        self.npy_dir = Path(npy_dir) if npy_dir else None
+        self.numeric = {name: array('d') for name in NUMERIC_COLUMNS} if self.npy_dir else None
+        self.text = {name: [] for name in COLUMNS if name not in NUMERIC_COLUMNS} if self.npy_dir else None
+        self.npy_parts_dir = None
+        self.npy_parts = 0
+        self.parquet_path = parquet_path
+        self.parquet_writer = None
+        self.batch = []
+        self.rows = 0
+
+    def write(self, row):
+        self.csv.writerow(row)
+        self.rows += 1
+        if self.numeric is not None:
+            for name in NUMERIC_COLUMNS:
+                value = row[name]
+                self.numeric[name].append(float('nan') if value is None else value)
+            for name in self.text:
+                self.text[name].append(row[name])
+            if len(self.text['source']) >= NPY_CHUNK_ROWS:
+                self._flush_npy()
+        if self.parquet_path:
+            self.batch.append(row)
+            if len(self.batch) >= PARQUET_BATCH_ROWS:
+                self._flush_parquet()
+
+    def _flush_parquet(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if not self.batch:
+            return
+        table = pa.Table.from_pylist(self.batch, schema=pa.schema(
+            [(name, pa.float64() if name in NUMERIC_COLUMNS else pa.string()) for name in COLUMNS]))
+        if self.parquet_writer is None:
+            self.parquet_writer = pq.ParquetWriter(self.parquet_path, table.schema)
+        self.parquet_writer.write_table(table)
+        self.batch = []
+
+    def _flush_npy(self):
+        import numpy as np
+        if not self.text['source']:
+            return
+        if self.npy_parts_dir is None:
+            self.npy_dir.mkdir(parents=True, exist_ok=True)
+            self.npy_parts_dir = Path(tempfile.mkdtemp(prefix='.parts-', dir=self.npy_dir))
+        for name, values in self.numeric.items():
+            np.save(self.npy_parts_dir / f"{name}.{self.npy_parts}.npy", np.frombuffer(values, dtype=np.float64))
+            self.numeric[name] = array('d')
+        for name, values in self.text.items():
+            np.save(self.npy_parts_dir / f"{name}.{self.npy_parts}.npy", np.array(values, dtype=str))
+            self.text[name] = []
+        self.npy_parts += 1
+
+    def _join_npy(self):
+        """Copy each column's parts, one at a time, into a memory-mapped .npy of the full length."""
+        import numpy as np
+        self.npy_dir.mkdir(parents=True, exist_ok=True)
+        for name in COLUMNS:
+            path = self.npy_dir / f"{name}.npy"
+            if not self.npy_parts:
+                np.save(path, np.empty(0, dtype=np.float64 if name in NUMERIC_COLUMNS else str))
+                continue
+            parts = [np.load(self.npy_parts_dir / f"{name}.{i}.npy", mmap_mode='r') for i in range(self.npy_parts)]
+            out = np.lib.format.open_memmap(path, mode='w+', dtype=np.result_type(*parts),
+                                            shape=(sum(len(part) for part in parts),))
+            start = 0
+            for part in parts:
+                out[start:start + len(part)] = part
+                start += len(part)
+            out.flush()
+            del out, parts
+
+    def close(self):
+        self.csv_file.close()
+        if self.parquet_path:
+            self._flush_parquet()
+            if self.parquet_writer is not None:
+                self.parquet_writer.close()
+        if self.npy_dir is not None:
+            self._flush_npy()
+            try:
+                self._join_npy()
+            finally:
+                if self.npy_parts_dir is not None:
+                    shutil.rmtree(self.npy_parts_dir, ignore_errors=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Extract CML/TML thickness tables into columnar files.")
+    parser.add_argument('inputs', nargs='+', help="Extracted text files, PDFs or directories")
+    parser.add_argument('-o', '--output', default='tml_readings.csv', help="CSV output (default: tml_readings.csv)")
+    parser.add_argument('--npy', metavar='DIR', help=f"Also write one .npy array per column into DIR, "
+                                                     f"buffered {NPY_CHUNK_ROWS:,} rows at a time (needs numpy)")
+    parser.add_argument('--parquet', metavar='FILE', help="Also write a Parquet file (needs pyarrow)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = find_inputs(args.inputs)
+    if not paths:
+        print("No input files found.")
+        return 1
+
+    writer = ColumnarWriter(args.output, npy_dir=args.npy, parquet_path=args.parquet)
+    sources = 0
+    try:
+        for path in paths:
+            found = 0
+            try:
+                for row in iter_readings(path):
+                    writer.write(row)
+                    found += 1
+            except Exception as e:
+                print(f"Error on {path}: {e}")
+                continue
+            if found:
+                sources += 1
+                print(f"{path}: {found} readings")
+    finally:
+        writer.close()
+
+    print(f"{writer.rows} readings from {sources} of {len(paths)} file(s) -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())